@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VehiclesappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vehiclesapp'
+
+    def ready(self):
+        from . import signals  # noqa: F401
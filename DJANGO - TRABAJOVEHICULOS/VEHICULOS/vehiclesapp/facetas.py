@@ -0,0 +1,92 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+
+from .models import conteofaceta, vehiculo
+
+FACETAS = ('color', 'marca', 'decada')
+# Valores por UPDATE ... CASE; cada uno usa 5 parámetros y SQLite admite 999.
+VALORES_POR_SENTENCIA = 150
+
+
+def decada(modelo):
+    """Década de un modelo; la única definición, la usan los ajustes y la reconstrucción."""
+    return str(modelo // 10 * 10)
+
+
+# (faceta, campo de vehiculo, valor de la faceta a partir del campo)
+AGRUPACIONES = (('color', 'color', str), ('marca', 'marca', str), ('decada', 'modelo', decada))
+
+
+def valores_facetas(datos):
+    """Valor de cada faceta para un vehiculo o un dict con marca, color y modelo."""
+    if isinstance(datos, vehiculo):
+        datos = {'marca': datos.marca, 'color': datos.color, 'modelo': datos.modelo}
+    return {'color': datos['color'], 'marca': datos['marca'], 'decada': decada(datos['modelo'])}
+
+
+def ajustar_facetas(anteriores, nuevos):
+    """Aplica la diferencia entre dos juegos de valores (None = no existía / ya no existe).
+
+    Cuesta a lo sumo un INSERT (valores nuevos) y un UPDATE por guardado, más la
+    lectura de los valores previos que hace la señal pre_save.
+    """
+    aplicar_cambios([(anteriores, nuevos)])
+
+
+def aplicar_cambios(cambios):
+    """Aplica varias diferencias (anteriores, nuevos) juntas.
+
+    Las diferencias se suman antes de escribir: un INSERT para los valores que
+    aún no tienen fila y un UPDATE ... CASE por cada VALORES_POR_SENTENCIA
+    valores que cambian, sin importar cuántos vehículos trae el lote.
+    """
+    deltas = Counter()
+    for anteriores, nuevos in cambios:
+        anteriores = anteriores or {}
+        nuevos = nuevos or {}
+        for faceta in FACETAS:
+            antes, despues = anteriores.get(faceta), nuevos.get(faceta)
+            if antes == despues:
+                continue
+            if antes is not None:
+                deltas[faceta, antes] -= 1
+            if despues is not None:
+                deltas[faceta, despues] += 1
+    cambios = [(faceta, valor, delta) for (faceta, valor), delta in deltas.items() if delta]
+    faltantes = [conteofaceta(faceta=faceta, valor=valor) for faceta, valor, delta in cambios if delta > 0]
+    if faltantes:
+        conteofaceta.objects.bulk_create(faltantes, ignore_conflicts=True)
+    for inicio in range(0, len(cambios), VALORES_POR_SENTENCIA):
+        bloque = cambios[inicio:inicio + VALORES_POR_SENTENCIA]
+        filtro = Q()
+        for faceta, valor, _ in bloque:
+            filtro |= Q(faceta=faceta, valor=valor)
+        conteofaceta.objects.filter(filtro).update(total=F('total') + Case(
+            *(When(faceta=faceta, valor=valor, then=Value(delta)) for faceta, valor, delta in bloque),
+            default=Value(0),
+        ))
+
+
+@transaction.atomic
+def reconstruir_facetas():
+    """Recalcula todos los conteos con un GROUP BY por faceta; para reparar la tabla o tras cargas por SQL."""
+    totales = Counter()
+    for faceta, campo, valor in AGRUPACIONES:
+        # La década se agrupa por modelo y se calcula con decada(): la división
+        # entera de SQL redondea los negativos distinto que la de Python.
+        for grupo in vehiculo.objects.values(campo).annotate(total=Count('id')).order_by():
+            totales[faceta, valor(grupo[campo])] += grupo['total']
+    filas = [conteofaceta(faceta=faceta, valor=valor, total=total) for (faceta, valor), total in totales.items()]
+    conteofaceta.objects.all().delete()
+    conteofaceta.objects.bulk_create(filas, batch_size=500)
+    return len(filas)
+
+
+def conteos():
+    """{faceta: [(valor, total), ...]} de la tabla precalculada, sin tocar vehiculo."""
+    resultado = {'color': [], 'marca': [], 'decada': []}
+    for faceta, valor, total in conteofaceta.objects.filter(total__gt=0).order_by('faceta', '-total', 'valor').values_list('faceta', 'valor', 'total'):
+        resultado[faceta].append((valor, total))
+    return resultado
@@ -0,0 +1,80 @@
+import csv
+
+from django.db import transaction
+
+from .facetas import aplicar_cambios, valores_facetas
+from .models import normalizar_placa, vehiculo
+
+COLORES = {nombre: codigo for codigo, nombre in vehiculo.COLORLIST}
+CAMPOS_ACTUALIZABLES = ['marca', 'color', 'modelo']
+LARGO_MARCA = vehiculo._meta.get_field('marca').max_length
+# Placas por sentencia IN; SQLite admite como máximo 999 parámetros.
+TAMANO_BLOQUE = 500
+
+
+class FilaInvalida(ValueError):
+    pass
+
+
+def convertir_fila(fila):
+    """Una fila del CSV (placa, marca, color, modelo) como vehiculo sin guardar."""
+    placa = normalizar_placa(fila.get('placa'))
+    if not placa:
+        raise FilaInvalida(f"placa inválida: {fila.get('placa')!r}")
+    color = (fila.get('color') or '').strip().upper()
+    color = COLORES.get(color, color)
+    if color not in dict(vehiculo.COLORLIST):
+        raise FilaInvalida(f'color inválido: {color!r}')
+    try:
+        modelo = int(fila.get('modelo') or '')
+    except ValueError:
+        raise FilaInvalida(f"modelo inválido: {fila.get('modelo')!r}")
+    marca = (fila.get('marca') or '').strip().upper()
+    if len(marca) > LARGO_MARCA:
+        raise FilaInvalida(f'marca de más de {LARGO_MARCA} caracteres: {marca!r}')
+    return vehiculo(placa=placa, marca=marca, color=color, modelo=modelo)
+
+
+@transaction.atomic
+def guardar_lote(lote):
+    # bulk_create no emite señales: las facetas se ajustan con lo que había
+    # antes del lote, en la misma transacción.
+    placas = list(lote)
+    anteriores = {}
+    for inicio in range(0, len(placas), TAMANO_BLOQUE):
+        filas = vehiculo.objects.filter(placa__in=placas[inicio:inicio + TAMANO_BLOQUE]).values('placa', *CAMPOS_ACTUALIZABLES)
+        anteriores.update((datos['placa'], valores_facetas(datos)) for datos in filas)
+    # Una sola sentencia INSERT ... ON CONFLICT (placa) DO UPDATE por lote.
+    vehiculo.objects.bulk_create(
+        list(lote.values()),
+        update_conflicts=True,
+        unique_fields=['placa'],
+        update_fields=CAMPOS_ACTUALIZABLES,
+    )
+    aplicar_cambios([(anteriores.get(placa), valores_facetas(registro)) for placa, registro in lote.items()])
+
+
+def importar_vehiculos(archivo, tamano_lote=1000, delimitador=','):
+    """Lee el CSV fila a fila y hace upsert por lotes.
+
+    Devuelve (filas válidas, lista de (línea, error)). En memoria solo se
+    mantiene el lote actual; una placa repetida dentro del lote se queda con la
+    última fila, porque un mismo INSERT no puede actualizar dos veces la misma fila.
+    """
+    validas = 0
+    errores = []
+    lote = {}
+    for numero, fila in enumerate(csv.DictReader(archivo, delimiter=delimitador), start=2):
+        try:
+            registro = convertir_fila({(k or '').strip().lower(): v for k, v in fila.items()})
+        except FilaInvalida as e:
+            errores.append((numero, str(e)))
+            continue
+        lote[registro.placa] = registro
+        validas += 1
+        if len(lote) >= tamano_lote:
+            guardar_lote(lote)
+            lote = {}
+    if lote:
+        guardar_lote(lote)
+    return validas, errores
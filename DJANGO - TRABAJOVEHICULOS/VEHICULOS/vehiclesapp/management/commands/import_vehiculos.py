@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from vehiclesapp.importacion import importar_vehiculos
+
+
+class Command(BaseCommand):
+    help = 'Importa o actualiza vehículos desde un CSV con columnas placa, marca, color y modelo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--delimiter', default=',')
+        parser.add_argument('--encoding', default='utf-8-sig')
+
+    def handle(self, *args, **options):
+        try:
+            archivo = open(options['archivo'], newline='', encoding=options['encoding'])
+        except OSError as e:
+            raise CommandError(f'No se pudo abrir el archivo: {e}')
+        with archivo:
+            validas, errores = importar_vehiculos(archivo, options['batch_size'], options['delimiter'])
+        for linea, error in errores[:20]:
+            self.stderr.write(f'Línea {linea}: {error}')
+        if len(errores) > 20:
+            self.stderr.write(f'... y {len(errores) - 20} errores más.')
+        self.stdout.write(self.style.SUCCESS(f'{validas} vehículos importados, {len(errores)} filas con errores.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from vehiclesapp.facetas import reconstruir_facetas
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los conteos de facetas (color, marca, década) desde la tabla de vehículos.'
+
+    def handle(self, *args, **options):
+        total = reconstruir_facetas()
+        self.stdout.write(self.style.SUCCESS(f'{total} conteos de facetas recalculados.'))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehiclesapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='conteofaceta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('faceta', models.CharField(choices=[('color', 'Color'), ('marca', 'Marca'), ('decada', 'Década')], max_length=10)),
+                ('valor', models.CharField(max_length=10)),
+                ('total', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['marca', 'color', 'modelo', 'placa'], name='vehiculo_marca_color_modelo'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['marca', 'modelo', 'placa'], name='vehiculo_marca_modelo'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['color', 'modelo', 'placa'], name='vehiculo_color_modelo'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['modelo', 'placa'], name='vehiculo_modelo_placa'),
+        ),
+        migrations.AddConstraint(
+            model_name='conteofaceta',
+            constraint=models.UniqueConstraint(fields=('faceta', 'valor'), name='conteofaceta_unica'),
+        ),
+    ]
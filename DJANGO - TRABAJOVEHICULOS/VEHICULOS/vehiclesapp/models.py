@@ -1,14 +1,68 @@
+import re
+
 from django.db import models
 
 # Create your models here.
 
+_NO_ALFANUMERICO = re.compile(r'[^A-Z0-9]')
+
+
+def normalizar_placa(placa):
+    """'abc-123 ' -> 'ABC123'. Devuelve '' si la placa no es válida."""
+    placa = _NO_ALFANUMERICO.sub('', (placa or '').upper())
+    return placa if 0 < len(placa) <= 6 else ''
+
+
 class vehiculo(models.Model):
     COLORLIST=(
         ('1','ROJO'),
         ('2','AZUL'),
         ('3','VERDE'),
     )
-    placa=models.CharField(max_length=6)
+    # Guardada normalizada (ver normalizar_placa); unique crea el índice de búsqueda.
+    placa=models.CharField(max_length=6, unique=True)
     marca=models.CharField(max_length=10)
     color=models.CharField('color',max_length=1,choices=COLORLIST)
-    modelo=models.IntegerField()
\ No newline at end of file
+    modelo=models.IntegerField()
+
+    class Meta:
+        # El buscador ordena por (modelo, placa); cada combinación de filtros por
+        # igualdad (marca, color) tiene un índice que termina en ese orden, así
+        # que la página se lee del índice sin ordenar resultados.
+        indexes = [
+            models.Index(fields=['marca', 'color', 'modelo', 'placa'], name='vehiculo_marca_color_modelo'),
+            models.Index(fields=['marca', 'modelo', 'placa'], name='vehiculo_marca_modelo'),
+            models.Index(fields=['color', 'modelo', 'placa'], name='vehiculo_color_modelo'),
+            models.Index(fields=['modelo', 'placa'], name='vehiculo_modelo_placa'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.placa = normalizar_placa(self.placa) or self.placa
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.placa
+
+
+class conteofaceta(models.Model):
+    """Conteo precalculado por faceta (color, marca, decada) y valor.
+
+    Lo mantienen las señales de vehiculo y, en la importación por lotes,
+    facetas.aplicar_cambios(); facetas.reconstruir_facetas() lo recalcula entero.
+    """
+    FACETAS=(
+        ('color','Color'),
+        ('marca','Marca'),
+        ('decada','Década'),
+    )
+    faceta=models.CharField(max_length=10, choices=FACETAS)
+    valor=models.CharField(max_length=10)
+    total=models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['faceta', 'valor'], name='conteofaceta_unica'),
+        ]
+
+    def __str__(self):
+        return f'{self.faceta}={self.valor}: {self.total}'
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .facetas import ajustar_facetas, valores_facetas
+from .models import vehiculo
+
+
+@receiver(pre_save, sender=vehiculo)
+def recordar_facetas(sender, instance, raw=False, **kwargs):
+    # Valores guardados antes del cambio, para restarlos en post_save.
+    previo = None
+    if not raw and instance.pk:
+        previo = vehiculo.objects.filter(pk=instance.pk).values('marca', 'color', 'modelo').first()
+    instance._facetas_previas = valores_facetas(previo) if previo else None
+
+
+@receiver(post_save, sender=vehiculo)
+def actualizar_facetas(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ajustar_facetas(getattr(instance, '_facetas_previas', None), valores_facetas(instance))
+
+
+@receiver(post_delete, sender=vehiculo)
+def descontar_facetas(sender, instance, **kwargs):
+    ajustar_facetas(valores_facetas(instance), None)
@@ -1,3 +1,163 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .facetas import reconstruir_facetas
+from .importacion import importar_vehiculos
+from .models import conteofaceta, normalizar_placa, vehiculo
 
 # Create your tests here.
+
+CSV = """placa,marca,color,modelo
+abc-123,Mazda,ROJO,2018
+XYZ 789,Renault,2,2020
+ABC123,Mazda,3,2019
+,Kia,1,2021
+QWE456,Kia,MORADO,2021
+"""
+
+
+class ImportarVehiculosTests(TestCase):
+    def test_normalizar_placa(self):
+        self.assertEqual(normalizar_placa(' abc-123 '), 'ABC123')
+        self.assertEqual(normalizar_placa('ABCDEFG'), '')
+        self.assertEqual(normalizar_placa(None), '')
+
+    def test_upsert_por_lotes(self):
+        guardadas, errores = importar_vehiculos(io.StringIO(CSV), tamano_lote=2)
+        self.assertEqual(guardadas, 3)
+        self.assertEqual([linea for linea, _ in errores], [5, 6])
+        self.assertEqual(vehiculo.objects.count(), 2)
+        # La última fila de una placa gana.
+        self.assertEqual(vehiculo.objects.get(placa='ABC123').modelo, 2019)
+
+        importar_vehiculos(io.StringIO('placa,marca,color,modelo\nxyz789,Renault,VERDE,2022\n'))
+        actualizado = vehiculo.objects.get(placa='XYZ789')
+        self.assertEqual((actualizado.color, actualizado.modelo), ('3', 2022))
+        self.assertEqual(vehiculo.objects.count(), 2)
+
+    def test_marca_demasiado_larga(self):
+        guardadas, errores = importar_vehiculos(io.StringIO('placa,marca,color,modelo\nabc123,Mercedes-Benz,ROJO,2018\n'))
+        self.assertEqual(guardadas, 0)
+        self.assertEqual(errores[0][0], 2)
+        self.assertIn('MERCEDES-BENZ', errores[0][1])
+        self.assertFalse(vehiculo.objects.exists())
+
+    def test_comando(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as archivo:
+            archivo.write(CSV)
+        self.addCleanup(os.remove, archivo.name)
+        salida, errores = io.StringIO(), io.StringIO()
+        call_command('import_vehiculos', archivo.name, '--batch-size', '10', stdout=salida, stderr=errores)
+        self.assertIn('3 vehículos importados, 2 filas con errores', salida.getvalue())
+        self.assertIn('Línea 6', errores.getvalue())
+
+
+class BuscarPlacasTests(TestCase):
+    def setUp(self):
+        vehiculo.objects.create(placa='abc-123', marca='MAZDA', color='1', modelo=2018)
+        vehiculo.objects.create(placa='XYZ789', marca='RENAULT', color='2', modelo=2020)
+
+    def test_buscar_placa(self):
+        with self.assertNumQueries(1):
+            respuesta = self.client.get(reverse('buscar_placa', args=['abc123']))
+        self.assertEqual(respuesta.json(), {'placa': 'ABC123', 'marca': 'MAZDA', 'color': '1', 'modelo': 2018})
+        self.assertEqual(self.client.get(reverse('buscar_placa', args=['NOPE00'])).status_code, 404)
+
+    def test_buscar_placas_por_lote(self):
+        respuesta = self.client.post(
+            reverse('buscar_placas'), json.dumps({'placas': ['abc 123', 'xyz789', 'zzz999']}),
+            content_type='application/json',
+        )
+        resultados = respuesta.json()['resultados']
+        self.assertEqual(resultados['ABC123']['marca'], 'MAZDA')
+        self.assertEqual(resultados['XYZ789']['modelo'], 2020)
+        self.assertIsNone(resultados['ZZZ999'])
+
+        respuesta = self.client.get(reverse('buscar_placas'), {'placas': 'abc123,XYZ789'})
+        self.assertEqual(sorted(respuesta.json()['resultados']), ['ABC123', 'XYZ789'])
+
+    def test_limite_de_lote(self):
+        placas = [f'A{i:05d}' for i in range(1001)]
+        respuesta = self.client.post(reverse('buscar_placas'), json.dumps({'placas': placas}), content_type='application/json')
+        self.assertEqual(respuesta.status_code, 400)
+        respuesta = self.client.post(reverse('buscar_placas'), 'no-json', content_type='application/json')
+        self.assertEqual(respuesta.status_code, 400)
+
+    def test_post_exige_csrf(self):
+        cliente = Client(enforce_csrf_checks=True)
+        respuesta = cliente.post(reverse('buscar_placas'), json.dumps({'placas': ['abc123']}), content_type='application/json')
+        self.assertEqual(respuesta.status_code, 403)
+        self.assertEqual(cliente.get(reverse('buscar_placas'), {'placas': 'abc123'}).status_code, 200)
+
+
+class FacetasTests(TestCase):
+    def conteos_actuales(self):
+        return {(f.faceta, f.valor): f.total for f in conteofaceta.objects.filter(total__gt=0)}
+
+    def test_conteos_incrementales_igualan_reconstruccion(self):
+        auto = vehiculo.objects.create(placa='AAA111', marca='MAZDA', color='1', modelo=2018)
+        vehiculo.objects.create(placa='BBB222', marca='KIA', color='1', modelo=2005)
+        vehiculo.objects.create(placa='CCC333', marca='KIA', color='2', modelo=2019)
+        auto.color = '3'
+        auto.modelo = 2001
+        auto.save()
+        vehiculo.objects.get(placa='CCC333').delete()
+        incrementales = self.conteos_actuales()
+        self.assertEqual(incrementales, {
+            ('color', '3'): 1, ('color', '1'): 1,
+            ('marca', 'MAZDA'): 1, ('marca', 'KIA'): 1,
+            ('decada', '2000'): 2,
+        })
+        reconstruir_facetas()
+        self.assertEqual(self.conteos_actuales(), incrementales)
+
+    def test_decada_de_modelos_negativos(self):
+        vehiculo.objects.create(placa='NEG001', marca='KIA', color='1', modelo=-5)
+        vehiculo.objects.create(placa='NEG002', marca='KIA', color='1', modelo=3)
+        incrementales = self.conteos_actuales()
+        self.assertEqual((incrementales[('decada', '-10')], incrementales[('decada', '0')]), (1, 1))
+        reconstruir_facetas()
+        self.assertEqual(self.conteos_actuales(), incrementales)
+
+    def test_guardado_cambia_todas_las_facetas_en_pocas_sentencias(self):
+        auto = vehiculo.objects.create(placa='AAA111', marca='MAZDA', color='1', modelo=2018)
+        auto.marca, auto.color, auto.modelo = 'KIA', '2', 1999
+        # Lectura previa, UPDATE del vehículo, INSERT de valores nuevos y un UPDATE de conteos.
+        with self.assertNumQueries(4):
+            auto.save()
+        self.assertEqual(self.conteos_actuales(), {('marca', 'KIA'): 1, ('color', '2'): 1, ('decada', '1990'): 1})
+
+    def test_importacion_ajusta_facetas(self):
+        vehiculo.objects.create(placa='ABC123', marca='KIA', color='2', modelo=2005)
+        importar_vehiculos(io.StringIO(CSV), tamano_lote=2)
+        incrementales = self.conteos_actuales()
+        self.assertEqual(incrementales[('decada', '2010')], 1)
+        self.assertEqual(incrementales[('marca', 'MAZDA')], 1)
+        self.assertNotIn(('marca', 'KIA'), incrementales)
+        reconstruir_facetas()
+        self.assertEqual(self.conteos_actuales(), incrementales)
+
+    def test_buscar_vehiculos(self):
+        vehiculo.objects.bulk_create([
+            vehiculo(placa=f'K{i:05d}', marca='KIA', color='1' if i % 2 else '2', modelo=2000 + i % 20)
+            for i in range(120)
+        ])
+        vehiculo.objects.create(placa='M00001', marca='MAZDA', color='1', modelo=2015)
+        reconstruir_facetas()
+        # Filtro, página y facetas: sin COUNT ni GROUP BY sobre vehiculo.
+        with self.assertNumQueries(2):
+            datos = self.client.get(reverse('buscar_vehiculos'), {'marca': 'kia', 'color': '1', 'modelo_min': 2000, 'modelo_max': 2019}).json()
+        self.assertEqual(len(datos['resultados']), 50)
+        self.assertTrue(all(r['marca'] == 'KIA' and r['color'] == '1' and 2000 <= r['modelo'] <= 2019 for r in datos['resultados']))
+        siguiente = self.client.get(reverse('buscar_vehiculos'), {'marca': 'KIA', 'color': '1', 'modelo_min': 2000, 'modelo_max': 2019, 'despues': datos['siguiente']}).json()
+        self.assertEqual(len(siguiente['resultados']), 10)
+        self.assertIsNone(siguiente['siguiente'])
+        self.assertIn({'valor': '1', 'nombre': 'ROJO', 'total': 61}, datos['facetas']['color'])
+        self.assertEqual(datos['facetas']['decada'], [{'valor': '2000', 'total': 60}, {'valor': '2010', 'total': 61}])
+        self.assertEqual(self.client.get(reverse('buscar_vehiculos'), {'modelo_min': 'x'}).status_code, 400)
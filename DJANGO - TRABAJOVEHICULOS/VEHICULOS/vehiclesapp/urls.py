@@ -0,0 +1,9 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('buscar/', views.buscar_vehiculos, name='buscar_vehiculos'),
+    path('placas/', views.buscar_placas, name='buscar_placas'),
+    path('placas/<str:placa>/', views.buscar_placa, name='buscar_placa'),
+]
@@ -1,3 +1,112 @@
-from django.shortcuts import render
+import json
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from .facetas import conteos
+from .models import normalizar_placa, vehiculo
 
 # Create your views here.
+
+MAX_PLACAS_POR_CONSULTA = 1000
+# Placas por sentencia IN; SQLite admite como máximo 999 parámetros.
+TAMANO_BLOQUE = 500
+CAMPOS = ('placa', 'marca', 'color', 'modelo')
+
+
+def buscar_placa(request, placa):
+    datos = vehiculo.objects.filter(placa=normalizar_placa(placa)).values(*CAMPOS).first()
+    if datos is None:
+        return JsonResponse({'error': 'Vehículo no encontrado.'}, status=404)
+    return JsonResponse(datos)
+
+
+@require_http_methods(['GET', 'POST'])
+def buscar_placas(request):
+    """Consulta por lotes: ?placas=ABC123,XYZ789 o POST {"placas": [...]}.
+
+    Responde {"resultados": {placa: vehículo o null}} con las placas normalizadas.
+    """
+    if request.method == 'POST':
+        try:
+            placas = json.loads(request.body or b'{}').get('placas')
+        except (ValueError, AttributeError):
+            return JsonResponse({'error': 'JSON inválido.'}, status=400)
+        if not isinstance(placas, list):
+            return JsonResponse({'error': 'Se esperaba una lista "placas".'}, status=400)
+    else:
+        placas = request.GET.get('placas', '').split(',')
+    normalizadas = list(dict.fromkeys(normalizar_placa(str(placa)) for placa in placas if placa))
+    normalizadas = [placa for placa in normalizadas if placa]
+    if len(normalizadas) > MAX_PLACAS_POR_CONSULTA:
+        return JsonResponse({'error': f'Máximo {MAX_PLACAS_POR_CONSULTA} placas por consulta.'}, status=400)
+
+    resultados = dict.fromkeys(normalizadas)
+    for inicio in range(0, len(normalizadas), TAMANO_BLOQUE):
+        bloque = normalizadas[inicio:inicio + TAMANO_BLOQUE]
+        for datos in vehiculo.objects.filter(placa__in=bloque).values(*CAMPOS):
+            resultados[datos['placa']] = datos
+    return JsonResponse({'resultados': resultados})
+
+
+TAMANO_PAGINA = 50
+
+
+def _entero(valor):
+    try:
+        return int(valor) if valor not in (None, '') else None
+    except ValueError:
+        raise ValueError(f'Número inválido: {valor!r}')
+
+
+def buscar_vehiculos(request):
+    """Filtra por marca, color (uno o varios) y rango de modelo.
+
+    ?marca=MAZDA&color=1&modelo_min=2010&modelo_max=2019&despues=2015-ABC123
+    Ordena por (modelo, placa) y pagina con `despues` (el `siguiente` de la
+    respuesta anterior). Los conteos de facetas salen de la tabla precalculada,
+    así que ninguna petición hace COUNT ni GROUP BY sobre vehiculo.
+    """
+    vehiculos = vehiculo.objects.all()
+    marca = request.GET.get('marca', '').strip().upper()
+    if marca:
+        vehiculos = vehiculos.filter(marca=marca)
+    colores = [color for color in request.GET.getlist('color') if color]
+    if len(colores) == 1:
+        vehiculos = vehiculos.filter(color=colores[0])
+    elif colores:
+        vehiculos = vehiculos.filter(color__in=colores)
+    try:
+        modelo_min = _entero(request.GET.get('modelo_min'))
+        modelo_max = _entero(request.GET.get('modelo_max'))
+        despues = request.GET.get('despues')
+        if despues:
+            modelo_despues, _, placa_despues = despues.partition('-')
+            modelo_despues = _entero(modelo_despues)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    if modelo_min is not None:
+        vehiculos = vehiculos.filter(modelo__gte=modelo_min)
+    if modelo_max is not None:
+        vehiculos = vehiculos.filter(modelo__lte=modelo_max)
+    if despues and modelo_despues is not None:
+        # (modelo, placa) > (modelo_despues, placa_despues), con el límite inferior
+        # de modelo explícito para que el índice empiece a leer ahí.
+        vehiculos = vehiculos.filter(modelo__gte=modelo_despues).exclude(modelo=modelo_despues, placa__lte=placa_despues)
+
+    filas = list(vehiculos.order_by('modelo', 'placa').values(*CAMPOS)[:TAMANO_PAGINA + 1])
+    siguiente = None
+    if len(filas) > TAMANO_PAGINA:
+        ultima = filas[TAMANO_PAGINA - 1]
+        siguiente = f"{ultima['modelo']}-{ultima['placa']}"
+    nombres_color = dict(vehiculo.COLORLIST)
+    facetas = conteos()
+    return JsonResponse({
+        'resultados': filas[:TAMANO_PAGINA],
+        'siguiente': siguiente,
+        'facetas': {
+            'color': [{'valor': valor, 'nombre': nombres_color.get(valor, valor), 'total': total} for valor, total in facetas['color']],
+            'marca': [{'valor': valor, 'total': total} for valor, total in facetas['marca']],
+            'decada': [{'valor': valor, 'total': total} for valor, total in sorted(facetas['decada'])],
+        },
+    })
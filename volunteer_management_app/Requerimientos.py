@@ -1,82 +1,564 @@
-PRODUCTOS = {}
+import datetime
+import json
+import os
+import threading
+from array import array
+from itertools import count
+
+DESCUENTO_CARNE = 10  # porcentaje
+RUTA_DIARIO = "pedidos.jsonl"
+RUTA_TOTALES = "totales_diarios.json"
+
+# NumPy solo lo usa la facturación por lotes; se importa dentro de esa función
+# para que la caja interactiva no lo cargue.
+
+
+class ErrorPedido(Exception):
+    pass
+
+
+def a_centavos(precio):
+    return int(round(float(precio) * 100))
+
+
+def formatear(centavos):
+    return f"${centavos / 100:.2f}"
+
+
+def aplicar_descuento(total, tiene_carne):
+    """Total en centavos con el descuento de carné, redondeado al centavo."""
+    if tiene_carne:
+        descuento = (total * DESCUENTO_CARNE + 50) // 100
+        return total - descuento
+    return total
+
+
+class Pedido:
+    """Un pedido abierto. El total se ajusta en cada cambio; nunca se vuelve a sumar.
+
+    El precio de cada producto queda fijado al agregarlo, así un cambio de
+    precio en el menú no descuadra los pedidos que ya lo incluyen.
+    """
+    __slots__ = ('numero', 'items', 'precios', 'total', 'cerrado', 'lock')
+
+    def __init__(self, numero):
+        self.numero = numero
+        self.items = {}
+        self.precios = {}
+        self.total = 0
+        self.cerrado = False
+        self.lock = threading.Lock()
+
+
+class ServicioPedidos:
+    """Menú y pedidos compartidos entre hilos.
+
+    El candado del servicio solo protege el menú y el registro de pedidos; cada
+    pedido tiene el suyo, así que pedidos distintos no compiten entre sí.
+    Importes en centavos enteros. Con `lote`, cada pedido facturado se agrega a
+    esa MatrizPedidos para la conciliación de cierre.
+    """
+
+    def __init__(self, lote=None):
+        self.lote = lote
+        self._productos = {}
+        self._pedidos = {}
+        self._numeros = count(1)
+        self._lock = threading.Lock()
+
+    def agregar_producto(self, nombre, precio):
+        with self._lock:
+            self._productos[nombre] = a_centavos(precio)
+
+    def menu(self):
+        with self._lock:
+            return dict(self._productos)
+
+    def continuar_desde(self, ultimo_numero):
+        """Numera los pedidos nuevos después de `ultimo_numero` (tras recuperar el diario)."""
+        with self._lock:
+            self._numeros = count(ultimo_numero + 1)
+
+    def abrir_pedido(self):
+        with self._lock:
+            pedido = Pedido(next(self._numeros))
+            self._pedidos[pedido.numero] = pedido
+        return pedido.numero
+
+    def _pedido(self, numero):
+        pedido = self._pedidos.get(numero)
+        if pedido is None:
+            raise ErrorPedido(f"El pedido {numero} no existe o ya fue facturado.")
+        return pedido
+
+    @staticmethod
+    def _abierto(pedido):
+        # Otro hilo pudo facturarlo entre la búsqueda y tomar su candado.
+        if pedido.cerrado:
+            raise ErrorPedido(f"El pedido {pedido.numero} ya fue facturado.")
+
+    def agregar(self, numero, producto, cantidad):
+        if cantidad <= 0:
+            raise ErrorPedido("La cantidad debe ser mayor que cero.")
+        precio = self._productos.get(producto)
+        if precio is None:
+            raise ErrorPedido("Producto no existe. Agreguelo primero al menú.")
+        pedido = self._pedido(numero)
+        with pedido.lock:
+            self._abierto(pedido)
+            precio = pedido.precios.setdefault(producto, precio)
+            pedido.items[producto] = pedido.items.get(producto, 0) + cantidad
+            pedido.total += precio * cantidad
+            return pedido.total
+
+    def quitar(self, numero, producto, cantidad):
+        """Quita hasta `cantidad` unidades; devuelve cuántas quedan en el pedido."""
+        if cantidad <= 0:
+            raise ErrorPedido("La cantidad debe ser mayor que cero.")
+        pedido = self._pedido(numero)
+        with pedido.lock:
+            self._abierto(pedido)
+            actual = pedido.items.get(producto)
+            if actual is None:
+                raise ErrorPedido("Producto no se encuentra en el pedido.")
+            quitado = min(cantidad, actual)
+            if quitado == actual:
+                del pedido.items[producto]
+                precio = pedido.precios.pop(producto)
+            else:
+                pedido.items[producto] = actual - quitado
+                precio = pedido.precios[producto]
+            pedido.total -= precio * quitado
+            return actual - quitado
+
+    def total(self, numero):
+        pedido = self._pedido(numero)
+        with pedido.lock:
+            return pedido.total
+
+    def facturar(self, numero, tiene_carne):
+        """Cierra el pedido y devuelve su factura; un pedido se factura una sola vez."""
+        with self._lock:
+            pedido = self._pedidos.pop(numero, None)
+        if pedido is None:
+            raise ErrorPedido(f"El pedido {numero} no existe o ya fue facturado.")
+        with pedido.lock:
+            pedido.cerrado = True
+            lineas = [
+                (producto, cantidad, pedido.precios[producto] * cantidad)
+                for producto, cantidad in pedido.items.items()
+            ]
+            total = pedido.total
+        if self.lote is not None:
+            self.lote.agregar(pedido.items, tiene_carne, pedido.precios)
+        return {
+            'numero': numero,
+            'lineas': lineas,
+            'total': total,
+            'tiene_carne': tiene_carne,
+            'total_final': aplicar_descuento(total, tiene_carne),
+        }
+
+
+class DiarioPedidos:
+    """Diario de pedidos facturados: una línea JSON por pedido, solo se agrega.
+
+    Commit en grupo: el hilo que encuentra el archivo libre escribe todas las
+    líneas pendientes y hace un único fsync; los que llegan mientras tanto
+    esperan y salen con el siguiente lote. Con muchas cajas a la vez, un fsync
+    cubre decenas de pedidos.
+    """
+
+    def __init__(self, ruta=RUTA_DIARIO):
+        self.ruta = ruta
+        self._cond = threading.Condition()
+        self._pendientes = []
+        self._asignados = 0
+        self._escritos = 0
+        self._escribiendo = False
+        self.fsyncs = 0
+        self._cortar_en = None
+        _reparar_cola(ruta)
+        self._archivo = open(ruta, "ab")
+
+    def agregar(self, registro, esperar=True):
+        """Agrega un registro; con `esperar` vuelve cuando ya está en disco."""
+        linea = (json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+        with self._cond:
+            self._pendientes.append(linea)
+            self._asignados += 1
+            propio = self._asignados
+            while esperar and self._escritos < propio:
+                if self._escribiendo:
+                    self._cond.wait()
+                else:
+                    self._escribir_lote()
+        return propio
+
+    def sincronizar(self):
+        """Lleva a disco lo agregado con esperar=False."""
+        with self._cond:
+            while self._escritos < self._asignados:
+                if self._escribiendo:
+                    self._cond.wait()
+                else:
+                    self._escribir_lote()
+
+    def _escribir_lote(self):
+        # Se llama con el candado tomado; se suelta durante la escritura.
+        lote, self._pendientes = self._pendientes, []
+        hasta = self._asignados
+        self._escribiendo = True
+        self._cond.release()
+        try:
+            if self._cortar_en is not None:
+                self._descartar_desde(self._cortar_en)
+            self._cortar_en = self._archivo.tell()
+            self._archivo.write(b"".join(lote))
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self._cortar_en = None
+        except BaseException:
+            # Lo que alcanzó a escribirse dejaría una línea rota delante del reintento.
+            if self._cortar_en is not None:
+                try:
+                    self._descartar_desde(self._cortar_en)
+                except OSError:
+                    pass
+            self._cond.acquire()
+            self._pendientes[:0] = lote
+            self._escribiendo = False
+            self._cond.notify_all()
+            raise
+        self._cond.acquire()
+        self._escribiendo = False
+        self._escritos = hasta
+        self.fsyncs += 1
+        self._cond.notify_all()
+
+    def _descartar_desde(self, inicio):
+        try:
+            self._archivo.close()
+        except OSError:
+            pass
+        os.truncate(self.ruta, inicio)
+        self._archivo = open(self.ruta, "ab")
+        self._cortar_en = None
+
+    def compactar(self, ruta_totales=RUTA_TOTALES, hoy=None):
+        """Pasa los días anteriores a `hoy` a totales diarios y los quita del diario.
+
+        Los totales se escriben (y sincronizan) antes de reescribir el diario,
+        junto con los números que esta pasada sumó; si se corta entre ambos
+        pasos, esos pedidos no se vuelven a sumar. Un registro de un día que ya
+        figura en los totales (agregado justo después de una compactación de
+        medianoche) se suma a ese día. Se decide por día y no por número: un
+        pedido abierto antes de medianoche y facturado después tiene un número
+        menor que los del día anterior. `ultimo_numero` solo retoma la numeración.
+        Devuelve los días compactados.
+        """
+        hoy = (hoy or datetime.date.today()).isoformat()
+        with self._cond:
+            while self._escribiendo:
+                self._cond.wait()
+            if self._pendientes:
+                self._escribir_lote()
+            totales = leer_totales(ruta_totales)
+            viejos, vigentes = [], []
+            for registro in leer_diario(self.ruta):
+                (viejos if registro["fecha"] < hoy else vigentes).append(registro)
+            if not viejos:
+                return []
+            ya_sumados = set(totales.get("compactados", []))
+            nuevos = [r for r in viejos if r["numero"] not in ya_sumados]
+            acumular_totales(totales["dias"], nuevos)
+            totales["compactados"] = [r["numero"] for r in viejos]
+            totales["ultimo_numero"] = max([totales["ultimo_numero"]] + [r["numero"] for r in viejos])
+            _reemplazar(ruta_totales, json.dumps(totales, ensure_ascii=False, indent=1).encode())
+            self._archivo.close()
+            _reemplazar(self.ruta, b"".join(
+                (json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n").encode() for r in vigentes
+            ))
+            self._archivo = open(self.ruta, "ab")
+            return sorted({r["fecha"] for r in viejos})
+
+    def cerrar(self):
+        self.sincronizar()
+        self._archivo.close()
+
+
+def _reemplazar(ruta, contenido):
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(contenido)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def _reparar_cola(ruta):
+    """Recorta una última línea a medio escribir (corte de luz durante un lote)."""
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "rb+") as f:
+        valido = 0
+        for linea in f:
+            if not linea.endswith(b"\n"):
+                break
+            try:
+                json.loads(linea)
+            except ValueError:
+                break
+            valido += len(linea)
+        f.truncate(valido)
+
+
+def leer_diario(ruta=RUTA_DIARIO):
+    """Registros completos del diario, en orden; se detiene en una cola dañada."""
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "rb") as f:
+        for linea in f:
+            if not linea.endswith(b"\n"):
+                return
+            try:
+                yield json.loads(linea)
+            except ValueError:
+                return
+
+
+def leer_totales(ruta=RUTA_TOTALES):
+    if not os.path.exists(ruta):
+        return {"ultimo_numero": 0, "dias": {}}
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def acumular_totales(dias, registros):
+    for registro in registros:
+        dia = dias.setdefault(registro["fecha"], {"pedidos": 0, "total": 0, "total_final": 0, "productos": {}})
+        dia["pedidos"] += 1
+        dia["total"] += registro["total"]
+        dia["total_final"] += registro["total_final"]
+        for producto, cantidad, subtotal in registro["lineas"]:
+            acumulado = dia["productos"].setdefault(producto, [0, 0])
+            acumulado[0] += cantidad
+            acumulado[1] += subtotal
+    return dias
+
+
+def registro_factura(factura, momento=None):
+    momento = momento or datetime.datetime.now()
+    return {
+        "numero": factura["numero"],
+        "fecha": momento.date().isoformat(),
+        "hora": momento.strftime("%H:%M:%S"),
+        "lineas": [list(linea) for linea in factura["lineas"]],
+        "total": factura["total"],
+        "tiene_carne": factura["tiene_carne"],
+        "total_final": factura["total_final"],
+    }
+
+
+def recuperar(servicio, ruta_diario=RUTA_DIARIO, ruta_totales=RUTA_TOTALES):
+    """Reproduce el diario al arrancar: retoma la numeración y devuelve los totales
+    por día de lo que aún no se compactó."""
+    ultimo = leer_totales(ruta_totales)["ultimo_numero"]
+    registros = list(leer_diario(ruta_diario))
+    if registros:
+        ultimo = max(ultimo, max(registro["numero"] for registro in registros))
+    servicio.continuar_desde(ultimo)
+    return acumular_totales({}, registros)
+
+
+class MatrizPedidos:
+    """Pedidos facturados como matriz dispersa CSR: una fila por pedido, una
+    columna por producto.
+
+    Se llena pedido a pedido durante el día (el servicio la alimenta al
+    facturar), así la conciliación de cierre no vuelve a recorrer diccionarios:
+    facturar_lote trabaja directamente sobre estos arreglos. Cada entrada guarda
+    el precio unitario con que se facturó, como Pedido.precios: un cambio de
+    precio en el menú no altera lo ya vendido.
+    """
+
+    def __init__(self):
+        self.nombres = []
+        self.indice = {}
+        self.columnas = array("q")
+        self.cantidades = array("q")
+        self.precios = array("q")
+        self.indptr = array("q", [0])
+        self.carne = array("b")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde(cls, pedidos, productos):
+        """Matriz de ({producto: cantidad}, tiene_carne) con los precios del menú `productos`."""
+        pedidos = list(pedidos)
+        faltantes = sorted({producto for items, _ in pedidos for producto in items if producto not in productos})
+        if faltantes:
+            raise ErrorPedido(f"Producto no existe: {', '.join(faltantes)}")
+        matriz = cls()
+        for items, tiene_carne in pedidos:
+            matriz.agregar(items, tiene_carne, productos)
+        return matriz
+
+    def __len__(self):
+        return len(self.carne)
+
+    def agregar(self, items, tiene_carne, precios):
+        """Agrega un pedido; `precios` da el precio unitario en centavos de cada producto."""
+        with self._lock:
+            for producto, cantidad in items.items():
+                columna = self.indice.get(producto)
+                if columna is None:
+                    columna = self.indice[producto] = len(self.nombres)
+                    self.nombres.append(producto)
+                self.columnas.append(columna)
+                self.cantidades.append(cantidad)
+                self.precios.append(precios[producto])
+            self.indptr.append(len(self.columnas))
+            self.carne.append(tiene_carne)
+
+
+def facturar_lote(pedidos, productos=None):
+    """Factura muchos pedidos en una sola pasada vectorizada (conciliación de cierre).
+
+    `pedidos` es una MatrizPedidos, que ya trae el precio de cada línea, o un
+    iterable de ({producto: cantidad}, tiene_carne) que se cobra con el menú
+    `productos` en centavos (servicio.menu()). Totales, descuento de carné e
+    ingresos por producto salen de sumas enteras sobre los arreglos, sin
+    redondeos.
+    """
+    import numpy as np
+
+    matriz = pedidos if isinstance(pedidos, MatrizPedidos) else MatrizPedidos.desde(pedidos, productos)
+    with matriz._lock:
+        nombres = list(matriz.nombres)
+        columnas = np.array(matriz.columnas, dtype=np.intp)
+        cantidades = np.array(matriz.cantidades, dtype=np.int64)
+        precios = np.array(matriz.precios, dtype=np.int64)
+        indptr = np.array(matriz.indptr, dtype=np.intp)
+        carne = np.array(matriz.carne, dtype=bool)
+
+    # Los pedidos son filas contiguas: el total de cada uno es una resta de sumas acumuladas.
+    importes = cantidades * precios
+    acumulado = np.zeros(len(columnas) + 1, dtype=np.int64)
+    np.cumsum(importes, out=acumulado[1:])
+    totales = acumulado[indptr[1:]] - acumulado[indptr[:-1]]
+    descuentos = np.where(carne, (totales * DESCUENTO_CARNE + 50) // 100, 0)
+    # bincount suma en float64, exacto para enteros por debajo de 2**53 centavos.
+    unidades = np.bincount(columnas, weights=cantidades, minlength=len(nombres)).astype(np.int64)
+    ingresos = np.bincount(columnas, weights=importes, minlength=len(nombres)).astype(np.int64)
+    return {
+        'totales': totales,
+        'descuentos': descuentos,
+        'totales_finales': totales - descuentos,
+        'total': int(totales.sum()),
+        'total_final': int((totales - descuentos).sum()),
+        'unidades': {nombre: int(n) for nombre, n in zip(nombres, unidades) if n},
+        'ingresos': {nombre: int(ingreso) for nombre, ingreso in zip(nombres, ingresos) if ingreso},
+    }
+
+
+def pedidos_del_diario(ruta=RUTA_DIARIO):
+    """Matriz de los pedidos del diario, para conciliar tras un reinicio.
+
+    El precio unitario de cada línea sale de su subtotal, no del menú actual.
+    """
+    matriz = MatrizPedidos()
+    for registro in leer_diario(ruta):
+        matriz.agregar(
+            {producto: cantidad for producto, cantidad, _ in registro["lineas"]},
+            registro["tiene_carne"],
+            {producto: subtotal // cantidad for producto, cantidad, subtotal in registro["lineas"]},
+        )
+    return matriz
+
+
+servicio = ServicioPedidos()
+_diario = None
+_diario_lock = threading.Lock()
+
+
+def obtener_diario():
+    global _diario
+    with _diario_lock:
+        if _diario is None:
+            _diario = DiarioPedidos(RUTA_DIARIO)
+        return _diario
+
 
 def agregar_producto():
     nombre = input("Ingrese nombre del nuevo producto: ")
     precio = float(input("Ingrese precio del producto: "))
-    PRODUCTOS[nombre] = precio
+    servicio.agregar_producto(nombre, precio)
     print(f"Producto {nombre} agregado con precio ${precio}")
 
 def MostrarMenu():
     print("\n--- Menú de Productos ---")
-    if not PRODUCTOS:
+    productos = servicio.menu()
+    if not productos:
         print("No hay productos en el menú. Agregue algunos primero.")
     else:
-        for item, price in PRODUCTOS.items():
-            print(f"{item}: ${price}")
+        for item, price in productos.items():
+            print(f"{item}: {formatear(price)}")
 
 
 def AgregarProducto(orden, producto, cantidad):
-    if producto in PRODUCTOS:
-        orden[producto] = orden.get(producto, 0) + cantidad
+    try:
+        servicio.agregar(orden, producto, cantidad)
         print(f"Agregado {cantidad} x {producto}")
-    else:
-        print("Producto no existe. Agreguelo primero al menú.")
+    except ErrorPedido as e:
+        print(e)
 
 
 def QuitarProducto(orden, producto, cantidad):
-    if producto in orden:
-        if orden[producto] <= cantidad:
-            orden.pop(producto)
-            print(f"{producto} removido del pedido.")
-        else:
-            orden[producto] -= cantidad
-            print(f"Removido {cantidad} x {producto} del pedido.")
+    try:
+        quedan = servicio.quitar(orden, producto, cantidad)
+    except ErrorPedido as e:
+        print(e)
+        return
+    if not quedan:
+        print(f"{producto} removido del pedido.")
     else:
-        print("Producto no se encuentra en el pedido.")
+        print(f"Removido {cantidad} x {producto} del pedido.")
 
 
 def CalcularTotal(orden):
-    total = sum(PRODUCTOS[producto] * cantidad for producto, cantidad in orden.items())
-    return total
-
-
-def aplicar_descuento(total, tiene_carne):
-    if tiene_carne:
-        descuento = total * 0.1
-        return total - descuento
-    return total
+    return servicio.total(orden)
 
 
 def facturar(orden, tiene_carne):
-    total = CalcularTotal(orden)
-    total_final = aplicar_descuento(total, tiene_carne)
+    factura = servicio.facturar(orden, tiene_carne)
     print("\n--- Factura ---")
-    for producto, cantidad in orden.items():
-        print(f"{producto} x {cantidad} = ${PRODUCTOS[producto] * cantidad}")
+    for producto, cantidad, subtotal in factura['lineas']:
+        print(f"{producto} x {cantidad} = {formatear(subtotal)}")
     if tiene_carne:
-        print("Descuento aplicado: 10%")
-    print(f"Total a pagar: ${total_final}")
+        print(f"Descuento aplicado: {DESCUENTO_CARNE}%")
+    print(f"Total a pagar: {formatear(factura['total_final'])}")
+    return factura
 
 
-def guardar_pedido(orden):
+def guardar_pedido(factura, diario=None):
     try:
-        with open("pedido.txt", "w") as f:
-            for producto, cantidad in orden.items():
-                f.write(f"{producto}: {cantidad}\n")
+        (diario or obtener_diario()).agregar(registro_factura(factura))
         print("Pedido guardado exitosamente.")
-    except:
+    except OSError:
         print("Error al guardar el pedido")
 
 
 def main():
-    orden = {}
+    recuperar(servicio)
+    orden = servicio.abrir_pedido()
     pasos = 0
     print("Bienvenido a Cafetería Campus - Sistema de Pedidos")
-    
+
     while pasos < 4:
         MostrarMenu()
         accion = input("\nElija una acción (agregar_producto, agregar, eliminar, facturar, salir): ").strip().lower()
-        
+
         if accion == "agregar_producto":
             agregar_producto()
         elif accion == "agregar":
@@ -89,20 +571,17 @@ def main():
             QuitarProducto(orden, producto, cantidad)
         elif accion == "facturar":
             tiene_carne = input("¿Posee carné válido para descuento? (s/n): ").strip().lower() == "s"
-            facturar(orden, tiene_carne)
-            guardar_pedido(orden)
+            guardar_pedido(facturar(orden, tiene_carne))
             break
         elif accion == "salir":
             print("Saliendo del sistema.")
             break
         else:
             print("Acción no válida. Intente de nuevo.")
-            
+
         pasos += 1
     else:
-            print("Máximo de pasos alcanzado. Facturando automáticamente...")
-    tiene_carne = False
-    facturar(orden, tiene_carne)
-    guardar_pedido(orden)
+        print("Máximo de pasos alcanzado. Facturando automáticamente...")
+        guardar_pedido(facturar(orden, False))
 if __name__ == "__main__":
     main()
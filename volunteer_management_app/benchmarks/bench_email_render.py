@@ -0,0 +1,100 @@
+"""Throughput of personalized notification rendering.
+
+Compares looking the templates up for every message (render_to_string), the
+compiled-once loop used by volunteers.emails, and the same loop split across a
+process pool. No database or SMTP server is needed.
+
+    python benchmarks/bench_email_render.py --messages 10000 --processes 4
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+
+def fake_recipients(count):
+    return [
+        SimpleNamespace(username=f'vol{i}', email=f'vol{i}@example.com', get_full_name=lambda i=i: f'Voluntario {i}')
+        for i in range(count)
+    ]
+
+
+def fake_notification():
+    activity = SimpleNamespace(
+        title='Jornada de Limpieza Comunitaria',
+        date=datetime.datetime(2025, 7, 15, 9, 0, tzinfo=datetime.timezone.utc),
+        location='Parque de Nariño, Ciudad Pasto',
+    )
+    return SimpleNamespace(message='Recuerda traer guantes y agua.\nNos vemos allí.', activity=activity)
+
+
+def render_to_string_each(notification, recipients):
+    from django.core.mail import EmailMultiAlternatives
+    from django.template.loader import render_to_string
+    from volunteers.emails import FROM_EMAIL, NOTIFICATION_HTML_TEMPLATE, NOTIFICATION_TEXT_TEMPLATE, notification_context
+
+    subject = f'Notificación para la actividad: {notification.activity.title}'
+    for volunteer in recipients:
+        context = notification_context(notification, volunteer)
+        message = EmailMultiAlternatives(subject, render_to_string(NOTIFICATION_TEXT_TEMPLATE, context), FROM_EMAIL, [volunteer.email])
+        message.attach_alternative(render_to_string(NOTIFICATION_HTML_TEMPLATE, context), 'text/html')
+        yield message
+
+
+def compiled_loop(notification, recipients):
+    from volunteers.emails import iter_notification_messages
+    return iter_notification_messages(notification, recipients)
+
+
+def _render_chunk(bounds):
+    start, stop = bounds
+    recipients = fake_recipients(stop)[start:stop]
+    return sum(1 for message in compiled_loop(fake_notification(), recipients) if message.message())
+
+
+def process_pool(count, processes):
+    chunk = -(-count // processes)
+    bounds = [(start, min(start + chunk, count)) for start in range(0, count, chunk)]
+    with ProcessPoolExecutor(processes) as pool:
+        return sum(pool.map(_render_chunk, bounds))
+
+
+def timed(label, count, func):
+    started = time.perf_counter()
+    rendered = func()
+    elapsed = time.perf_counter() - started
+    print(f'{label:>18}: {rendered} messages in {elapsed:.2f}s ({rendered / elapsed:,.0f} msg/s)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=10000)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    notification, recipients = fake_notification(), fake_recipients(args.messages)
+    # message() builds the full MIME payload, as sending would.
+    timed('render_to_string', args.messages,
+          lambda: sum(1 for m in render_to_string_each(notification, recipients) if m.message()))
+    timed('compiled loop', args.messages,
+          lambda: sum(1 for m in compiled_loop(notification, recipients) if m.message()))
+    timed(f'pool x{args.processes}', args.messages, lambda: process_pool(args.messages, args.processes))
+
+
+def setup():
+    import django
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "volunteer_management_app.settings")
+    django.setup()
+
+
+if __name__ == '__main__':
+    setup()
+    main()
+else:
+    # Pool workers started with 'spawn' import this module fresh.
+    if 'DJANGO_SETTINGS_MODULE' not in os.environ:
+        setup()
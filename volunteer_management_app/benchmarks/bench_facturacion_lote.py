@@ -0,0 +1,71 @@
+"""End-of-day reconciliation: billing each order with dict lookups vs facturar_lote.
+
+The per-order variant is what re-running CalcularTotal/aplicar_descuento on
+every order costs: one dict lookup and multiply per line, then the discount.
+For the batch variant the orders are already in a MatrizPedidos (the service
+fills it as orders are billed during the day, so that cost is reported
+separately as "fill"); facturar_lote then computes every total, discount and
+per-product revenue with integer array sums.
+
+    python benchmarks/bench_facturacion_lote.py --orders 200000 --products 60
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Requerimientos import MatrizPedidos, aplicar_descuento, facturar_lote  # noqa: E402
+
+
+def per_order(pedidos, productos):
+    totales = []
+    ingresos = dict.fromkeys(productos, 0)
+    for items, tiene_carne in pedidos:
+        total = 0
+        for producto, cantidad in items.items():
+            importe = productos[producto] * cantidad
+            ingresos[producto] += importe
+            total += importe
+        totales.append(aplicar_descuento(total, tiene_carne))
+    return totales, ingresos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=200000)
+    parser.add_argument('--products', type=int, default=60)
+    parser.add_argument('--max-lines', type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    productos = {f'producto{i}': rng.randint(50, 1500) for i in range(args.products)}
+    nombres = list(productos)
+    pedidos = [
+        ({producto: rng.randint(1, 4) for producto in rng.sample(nombres, rng.randint(1, args.max_lines))},
+         rng.random() < 0.3)
+        for _ in range(args.orders)
+    ]
+
+    started = time.perf_counter()
+    totales, ingresos = per_order(pedidos, productos)
+    loop_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matriz = MatrizPedidos.desde(pedidos, productos)
+    fill_time = time.perf_counter() - started
+
+    facturar_lote(pedidos[:1], productos)  # keep the NumPy import out of the timing
+    started = time.perf_counter()
+    lote = facturar_lote(matriz)
+    batch_time = time.perf_counter() - started
+
+    same = lote['totales_finales'].tolist() == totales and lote['ingresos'] == {k: v for k, v in ingresos.items() if v}
+    print(f'orders={args.orders} per-order={loop_time * 1000:.0f}ms batch={batch_time * 1000:.1f}ms '
+          f'(fill during the day {fill_time * 1000:.0f}ms) speedup={loop_time / batch_time:.1f}x identical={same}')
+
+
+if __name__ == '__main__':
+    main()
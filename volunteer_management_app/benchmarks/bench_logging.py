@@ -0,0 +1,103 @@
+"""Per-request logging overhead: eager f-strings to a synchronous handler vs
+lazy %-style arguments through BackgroundQueueHandler.
+
+Each simulated request makes the calls a view makes: a DEBUG line (disabled at
+the configured INFO level) and, every --warn-every requests, an enabled WARNING.
+The time reported is what the request thread pays; for the queued variant the
+time the listener needs to drain the backlog is printed separately.
+
+    python benchmarks/bench_logging.py --requests 200000 --warn-every 10 --sink-latency-us 200
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+
+def make_request(index):
+    user = SimpleNamespace(username=f'vol{index % 1000}', role='volunteer')
+    return SimpleNamespace(user=user, method='GET')
+
+
+def eager_view(logger, request, warn):
+    logger.debug(f"send_notification accessed by user: {request.user.username} with role: {getattr(request.user, 'role', None)} and method: {request.method}")
+    if warn:
+        logger.warning(f"Access denied to send_notification for user: {request.user.username} with role: {request.user.role}")
+
+
+def lazy_view(logger, request, warn):
+    logger.debug('send_notification accessed user=%s role=%s method=%s', request.user.username, getattr(request.user, 'role', None), request.method)
+    if warn:
+        logger.warning('Access denied view=send_notification user=%s role=%s', request.user.username, request.user.role)
+
+
+class SlowSink(logging.Handler):
+    """Wraps a handler and adds a fixed delay per record, like a busy console or pipe."""
+
+    def __init__(self, handler, latency):
+        super().__init__()
+        self.handler = handler
+        self.latency = latency
+
+    def emit(self, record):
+        self.handler.handle(record)
+        time.sleep(self.latency)
+
+
+def build_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def run(label, view, logger, requests, warn_every):
+    started = time.perf_counter()
+    for index, request in enumerate(requests):
+        view(logger, request, index % warn_every == 0)
+    elapsed = time.perf_counter() - started
+    print(f'{label:>22}: {elapsed / len(requests) * 1e6:6.2f} µs/request ({elapsed:.2f}s)')
+    return elapsed
+
+
+def main():
+    from volunteers.log_handlers import BackgroundQueueHandler
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--warn-every', type=int, default=10)
+    parser.add_argument('--target', choices=['file', 'stderr'], default='file')
+    parser.add_argument('--sink-latency-us', type=float, default=0, help='Extra delay per written record.')
+    args = parser.parse_args()
+
+    formatter = logging.Formatter('ts=%(asctime)s level=%(levelname)s logger=%(name)s %(message)s')
+    with tempfile.TemporaryDirectory() as tmp:
+        def target(name):
+            handler = logging.StreamHandler(sys.stderr) if args.target == 'stderr' else logging.FileHandler(os.path.join(tmp, name))
+            handler.setFormatter(formatter)
+            if args.sink_latency_us:
+                return SlowSink(handler, args.sink_latency_us / 1e6)
+            return handler
+
+        requests = [make_request(index) for index in range(args.requests)]
+
+        sync_handler = target('sync.log')
+        run('f-string + sync', eager_view, build_logger('bench.sync.eager', sync_handler), requests, args.warn_every)
+        run('lazy + sync', lazy_view, build_logger('bench.sync.lazy', sync_handler), requests, args.warn_every)
+
+        queued = BackgroundQueueHandler([target('queued.log')], queue_size=args.requests)
+        run('lazy + queue', lazy_view, build_logger('bench.queue', queued), requests, args.warn_every)
+        started = time.perf_counter()
+        queued.stop()
+        print(f'{"listener drain":>22}: {time.perf_counter() - started:.2f}s (off the request thread)')
+        if queued.dropped:
+            print(f'{"dropped":>22}: {queued.dropped}')
+
+
+if __name__ == '__main__':
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    main()
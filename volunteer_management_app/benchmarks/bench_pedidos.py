@@ -0,0 +1,118 @@
+"""Order throughput of the cafeteria order service (Requerimientos.ServicioPedidos).
+
+Each worker thread opens orders, adds --items lines (removing one now and
+then, as a cashier does), reads the running total and bills the order. The
+report is orders per second for each thread count, plus a check that every
+incremental total matches a full re-sum of its invoice lines.
+
+With --journal each billed order is made durable before the cashier moves on:
+"fsync" appends and fsyncs once per order, "group" goes through DiarioPedidos,
+which shares one fsync among all orders that arrive while the previous batch
+is being written.
+
+    python benchmarks/bench_pedidos.py --orders 50000 --items 8 --threads 1,4,16
+    python benchmarks/bench_pedidos.py --orders 5000 --threads 1,16,64 --journal fsync,group
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Requerimientos import DiarioPedidos, ServicioPedidos, aplicar_descuento, registro_factura  # noqa: E402
+
+PRODUCTOS = {f'producto{i}': round(0.5 + i * 0.35, 2) for i in range(40)}
+
+
+class FsyncPerOrder:
+    """Baseline journal: one write and one fsync per order."""
+
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+        self._lock = threading.Lock()
+        self.fsyncs = 0
+
+    def agregar(self, registro):
+        line = (json.dumps(registro, separators=(',', ':')) + '\n').encode()
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+
+    def cerrar(self):
+        self._file.close()
+
+
+def worker(servicio, orders, items, seed, facturas, journal):
+    rng = random.Random(seed)
+    nombres = list(PRODUCTOS)
+    for _ in range(orders):
+        numero = servicio.abrir_pedido()
+        elegidos = [rng.choice(nombres) for _ in range(items)]
+        for producto in elegidos:
+            servicio.agregar(numero, producto, rng.randint(1, 3))
+        if rng.random() < 0.2:
+            servicio.quitar(numero, elegidos[0], 1)
+        servicio.total(numero)
+        factura = servicio.facturar(numero, rng.random() < 0.3)
+        if journal is not None:
+            journal.agregar(registro_factura(factura))
+        facturas.append(factura)
+
+
+def run(threads, orders, items, journal=None):
+    servicio = ServicioPedidos()
+    for nombre, precio in PRODUCTOS.items():
+        servicio.agregar_producto(nombre, precio)
+    facturas = []
+    per_thread = orders // threads
+    pool = [
+        threading.Thread(target=worker, args=(servicio, per_thread, items, seed, facturas, journal))
+        for seed in range(threads)
+    ]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    mismatches = sum(
+        1 for factura in facturas
+        if factura['total'] != sum(subtotal for _, _, subtotal in factura['lineas'])
+        or factura['total_final'] != aplicar_descuento(factura['total'], factura['tiene_carne'])
+    )
+    return len(facturas), elapsed, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=50000)
+    parser.add_argument('--items', type=int, default=8)
+    parser.add_argument('--threads', default='1,4,16', help='comma-separated thread counts')
+    parser.add_argument('--journal', default='', help='comma-separated journal modes: fsync, group')
+    args = parser.parse_args()
+
+    modes = [mode for mode in args.journal.split(',') if mode] or [None]
+    for mode in modes:
+        for threads in (int(value) for value in args.threads.split(',')):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'pedidos.jsonl')
+                journal = {None: lambda: None, 'fsync': lambda: FsyncPerOrder(path),
+                           'group': lambda: DiarioPedidos(path)}[mode]()
+                billed, elapsed, mismatches = run(threads, args.orders, args.items, journal)
+                fsyncs = ''
+                if journal is not None:
+                    journal.cerrar()
+                    fsyncs = f' fsyncs={journal.fsyncs}'
+            print(f'journal={mode or "none":>5} threads={threads:>3}: orders={billed} '
+                  f'{billed / elapsed:,.0f} orders/s{fsyncs} total_mismatches={mismatches}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Segment evaluation for large volunteer populations.
+
+Builds a volunteers.segments.SegmentIndex from synthetic data (no database)
+and times expressions against it, next to the same filter written as a Python
+loop over per-volunteer records.
+
+    python benchmarks/bench_segments.py --volunteers 100000
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import time
+
+INTERESTS = ['ambiente', 'educación', 'salud', 'reciclaje', 'deporte', 'cultura', 'animales', 'tecnología']
+EXPRESSIONS = [
+    'interest:ambiente AND attended:90 AND NOT upcoming',
+    '(interest:salud OR interest:educacion) AND NOT attended:365',
+    'NOT upcoming',
+]
+
+
+def synthetic(count, now, seed=1):
+    rng = random.Random(seed)
+    volunteers = [(pk, ', '.join(rng.sample(INTERESTS, rng.randint(0, 3)))) for pk in range(1, count + 1)]
+    last_attended = {
+        pk: int(now.timestamp()) - rng.randint(0, 720) * 86400
+        for pk in range(1, count + 1) if rng.random() < 0.6
+    }
+    upcoming_ids = [pk for pk in range(1, count + 1) if rng.random() < 0.2]
+    return volunteers, last_attended, upcoming_ids
+
+
+def python_filter(volunteers, last_attended, upcoming_ids, now):
+    from volunteers.segments import interest_words
+    upcoming, cutoff = set(upcoming_ids), int(now.timestamp()) - 90 * 86400
+    return [
+        pk for pk, text in volunteers
+        if 'ambiente' in interest_words(text) and last_attended.get(pk, 0) >= cutoff and pk not in upcoming
+    ]
+
+
+def timed(repeat, func):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000, result
+
+
+def main():
+    from volunteers.segments import SegmentIndex, parse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--volunteers', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    data = synthetic(args.volunteers, now)
+    build_ms, index = timed(1, lambda: SegmentIndex(*data, now))
+    print(f'index build: {build_ms:.0f}ms for {index.size} volunteers')
+
+    loop_ms, expected = timed(args.repeat, lambda: python_filter(*data, now))
+    print(f'{"python loop":>60}: {loop_ms:7.1f}ms  {len(expected)} volunteers')
+    for expression in EXPRESSIONS:
+        tree = parse(expression)
+        index.evaluate(tree)  # first use turns the terms into bitsets
+        ms, ids = timed(args.repeat, lambda: index.volunteer_ids(index.evaluate(tree)))
+        print(f'{expression:>60}: {ms:7.1f}ms  {len(ids)} volunteers')
+        if expression == EXPRESSIONS[0]:
+            assert ids == expected
+
+
+if __name__ == '__main__':
+    import django
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "volunteer_management_app.settings")
+    django.setup()
+    main()
@@ -0,0 +1,102 @@
+"""Startup cost of a web worker, measured with ``python -X importtime``.
+
+Boots Django in a fresh interpreter, imports the WSGI application and the URL
+configuration (which imports every view module), and reports the slowest
+imports, the total import time and the child's peak RSS. Exits with status 1
+if a module listed in --forbid was loaded, or if the total is over --max-ms.
+
+    python scripts/check_import_time.py --top 15
+    python scripts/check_import_time.py --record startup.jsonl   # track over time
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Heavy optional libraries that must only be imported on first use.
+DEFAULT_FORBIDDEN = ['reportlab', 'numpy']
+
+BOOT = (
+    "import os, django\n"
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'volunteer_management_app.settings')\n"
+    "from django.core.wsgi import get_wsgi_application\n"
+    "get_wsgi_application()\n"
+    "from django.conf import settings\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver(settings.ROOT_URLCONF).url_patterns\n"
+)
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure():
+    """Return ({module: (self_us, cumulative_us)}, peak_rss_kb) for one cold boot."""
+    before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT],
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'Boot failed:\n{result.stderr[-2000:]}')
+    peak_rss = max(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss, before)
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules, peak_rss
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--forbid', nargs='*', default=DEFAULT_FORBIDDEN)
+    parser.add_argument('--max-ms', type=float, default=None)
+    parser.add_argument('--record', help='Append the result as one JSON line to this file.')
+    args = parser.parse_args()
+
+    modules, peak_rss = measure()
+    total_us = sum(self_us for self_us, _ in modules.values())
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    print(f'{"self ms":>8} {"cumul ms":>9}  module')
+    for name, (self_us, cumulative_us) in slowest:
+        print(f'{self_us / 1000:8.1f} {cumulative_us / 1000:9.1f}  {name}')
+    print(f'\n{len(modules)} modules, {total_us / 1000:.1f} ms import time, peak RSS {peak_rss / 1024:.1f} MiB')
+
+    if args.record:
+        with open(args.record, 'a') as fh:
+            fh.write(json.dumps({
+                'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                'commit': _git_commit(),
+                'modules': len(modules),
+                'import_ms': round(total_us / 1000, 1),
+                'peak_rss_kb': peak_rss,
+            }) + '\n')
+
+    failed = False
+    loaded = sorted(name for name in modules if name.split('.')[0] in set(args.forbid))
+    if loaded:
+        print(f'FAIL: imported at startup: {", ".join(loaded[:10])}')
+        failed = True
+    if args.max_ms is not None and total_us / 1000 > args.max_ms:
+        print(f'FAIL: import time over budget of {args.max_ms} ms')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
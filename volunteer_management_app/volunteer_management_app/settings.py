@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -57,6 +58,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'volunteers.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -137,6 +139,128 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Login throttling (see volunteers.throttle). Use 'cache' with a shared cache
+# backend such as Redis or Memcached when running several worker processes.
+LOGIN_THROTTLE = {
+    'BACKEND': 'local',
+    'IP_RATE': (30, 2.0),
+    'USERNAME_RATE': (10, 30.0),
+}
+
+# Waitlist promotion (see volunteers.waitlist): freed seats are filled by a
+# `promote_waitlist` job, delayed this long to coalesce bursts of cancellations.
+WAITLIST_ASYNC = True
+WAITLIST_COALESCE_SECONDS = 0.5
+
+# Activities created without an end time last this long; enrollment rejects
+# overlapping activities (see volunteers.schedule).
+ACTIVITY_DEFAULT_DURATION_HOURS = 2
+
+# Notification segments (see volunteers.segments) are evaluated against a
+# per-process index of volunteer attributes rebuilt after this many seconds.
+SEGMENT_INDEX_TTL = 300
+
+# Reminder windows used by `manage.py send_activity_reminders`.
+ACTIVITY_REMINDER_WINDOWS = ['48h', '2h']
+
+# Background jobs (see volunteers.jobs); run workers with `manage.py runworker`.
+JOBS_MAX_ATTEMPTS = 5
+JOBS_BACKOFF_SECONDS = 10
+JOBS_MAX_BACKOFF_SECONDS = 3600
+JOBS_LOCK_TIMEOUT_SECONDS = 600
+
+# Activities older than this are moved to the archive tables by
+# `manage.py archive_activities` (see volunteers.archive).
+ARCHIVE_RETENTION_DAYS = 365
+
+# Audit events (see volunteers.audit) are buffered per process and written in
+# batches of AUDIT_FLUSH_SIZE, or after AUDIT_FLUSH_SECONDS at the end of a request.
+AUDIT_FLUSH_SIZE = 200
+AUDIT_FLUSH_SECONDS = 5.0
+AUDIT_BUFFER_CAPACITY = 10000
+
+# QR check-in (see volunteers.checkin): kiosk scans are committed by a
+# background thread in batches of CHECKIN_BATCH_SIZE or every CHECKIN_FLUSH_SECONDS.
+CHECKIN_ASYNC = True
+CHECKIN_BATCH_SIZE = 200
+CHECKIN_FLUSH_SECONDS = 0.2
+
+# Request profiling (see volunteers.profiling). When enabled, SAMPLE_RATE of
+# requests, and admin requests sending the HEADER, are profiled into DIR;
+# summarize with `manage.py profile_summary`.
+PROFILING = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 0.0,
+    'HEADER': 'X-Profile',
+    'DIR': BASE_DIR / 'profiles',
+    'INTERVAL': 0.005,
+}
+
+# Logging: views log lazily ('%s' arguments, key=value style) and the
+# handlers below write from a background thread (see volunteers.log_handlers),
+# so a request only pays for putting enabled records on a queue.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'kv': {
+            'format': 'ts=%(asctime)s level=%(levelname)s logger=%(name)s %(message)s',
+        },
+    },
+    'filters': {
+        'require_debug_false': {
+            '()': 'django.utils.log.RequireDebugFalse',
+        },
+        'require_debug_true': {
+            '()': 'django.utils.log.RequireDebugTrue',
+        },
+    },
+    'handlers': {
+        # Application records, unfiltered: warnings and errors reach stderr
+        # with or without DEBUG, as they did through Python's last resort.
+        # VOLUNTEERS_LOG_CONSOLE_LEVEL=INFO shows the key=value INFO lines too.
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'kv',
+            'level': os.environ.get('VOLUNTEERS_LOG_CONSOLE_LEVEL', 'WARNING'),
+        },
+        # Django's defaults for the django logger: the console while DEBUG,
+        # errors mailed to ADMINS otherwise.
+        'django_console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'kv',
+            'filters': ['require_debug_true'],
+        },
+        'mail_admins': {
+            'level': 'ERROR',
+            'filters': ['require_debug_false'],
+            'class': 'django.utils.log.AdminEmailHandler',
+        },
+        'queue': {
+            '()': 'volunteers.log_handlers.BackgroundQueueHandler',
+            'handlers': ['cfg://handlers.console'],
+        },
+        'queue_django': {
+            '()': 'volunteers.log_handlers.BackgroundQueueHandler',
+            'handlers': ['cfg://handlers.django_console', 'cfg://handlers.mail_admins'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['queue_django'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'volunteers': {
+            'level': os.environ.get('VOLUNTEERS_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
 # Custom User Model
 AUTH_USER_MODEL = 'volunteers.CustomUser'
 
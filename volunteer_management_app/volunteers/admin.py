@@ -1,7 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.html import format_html
-from .models import CustomUser, Activity, Assignment, Attendance, Notification
+from .models import CustomUser, Activity, Assignment, Attendance, AuditEvent, Notification
+from .paginators import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    # Skip the unfiltered COUNT(*) Django runs next to every filtered changelist.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
@@ -10,6 +19,8 @@ class CustomUserAdmin(UserAdmin):
     )
     list_display = ('username', 'email', 'role', 'profile_image_display')
     list_filter = ('role',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def profile_image_display(self, obj):
         if obj.profile_image:
@@ -17,7 +28,69 @@ class CustomUserAdmin(UserAdmin):
         return '(Sin Imagen)'
     profile_image_display.short_description = 'Imagen de Perfil'
 
-admin.site.register(Activity)
-admin.site.register(Assignment)
-admin.site.register(Attendance)
-admin.site.register(Notification)
+
+@admin.register(Activity)
+class ActivityAdmin(LargeTableAdmin):
+    list_display = ('title', 'date', 'location', 'required_volunteers', 'created_by')
+    list_select_related = ('created_by',)
+    list_filter = ('date',)
+    search_fields = ('^title',)
+    autocomplete_fields = ('created_by',)
+    raw_id_fields = ('series',)
+    ordering = ('-date',)
+
+
+@admin.register(Assignment)
+class AssignmentAdmin(LargeTableAdmin):
+    list_display = ('id', 'volunteer', 'activity', 'status', 'assigned_at')
+    list_select_related = ('volunteer', 'activity')
+    list_filter = ('status',)
+    search_fields = ('^volunteer__username', '^activity__title')
+    autocomplete_fields = ('volunteer', 'activity')
+    ordering = ('-id',)
+
+
+@admin.register(Attendance)
+class AttendanceAdmin(LargeTableAdmin):
+    list_display = ('id', 'volunteer', 'activity', 'attended', 'hours', 'recorded_at')
+    list_select_related = ('assignment__volunteer', 'assignment__activity')
+    list_filter = ('attended',)
+    search_fields = ('^assignment__volunteer__username', '^assignment__activity__title')
+    raw_id_fields = ('assignment',)
+    ordering = ('-id',)
+
+    @admin.display(description='Voluntario', ordering='assignment__volunteer__username')
+    def volunteer(self, obj):
+        return obj.assignment.volunteer
+
+    @admin.display(description='Actividad', ordering='assignment__activity__title')
+    def activity(self, obj):
+        return obj.assignment.activity
+
+
+@admin.register(Notification)
+class NotificationAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'activity', 'created_at')
+    list_select_related = ('activity',)
+    search_fields = ('^activity__title',)
+    autocomplete_fields = ('activity',)
+    raw_id_fields = ('recipients',)
+    ordering = ('-id',)
+
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(LargeTableAdmin):
+    list_display = ('occurred_at', 'kind', 'volunteer_id', 'activity_id', 'object_id')
+    list_filter = ('kind',)
+    search_fields = ('=volunteer_id',)
+    ordering = ('-occurred_at',)
+
+    # The audit trail is append-only.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,144 @@
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db.models import BigIntegerField, FloatField, Func
+from django.db.models.functions import Cast
+
+from .models import ArchivedAttendance, Attendance
+
+# NumPy is imported inside the functions that need it so that importing this
+# module (the signal handlers do) does not pull it into every process.
+
+HOURS_VERSION_KEY = 'volunteers:hours-analytics:version'
+HOURS_CACHE_TIMEOUT = 15 * 60
+
+HoursColumns = namedtuple('HoursColumns', ['hours', 'recorded_at', 'activity_date', 'location', 'locations', 'volunteer_id'])
+HOURS_ROW_DTYPE = [
+    ('hours', 'f8'), ('recorded_at', 'i8'), ('activity_date', 'i8'), ('location', 'O'), ('volunteer_id', 'i8'),
+]
+
+
+class EpochSeconds(Func):
+    """Whole seconds since 1970-01-01 UTC, computed by the database.
+
+    Rows then arrive as plain integers instead of datetimes parsed one by one.
+    """
+    output_field = BigIntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Django stores SQLite datetimes as UTC text. The '%' is escaped for the
+        # template and again for the cursor's parameter substitution.
+        return self.as_sql(compiler, connection, template="CAST(strftime('%%%%s', %(expressions)s) AS INTEGER)", **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='CAST(FLOOR(EXTRACT(EPOCH FROM %(expressions)s)) AS BIGINT)', **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        # Django runs MySQL sessions in UTC when USE_TZ is on.
+        return self.as_sql(compiler, connection, template='FLOOR(UNIX_TIMESTAMP(%(expressions)s))', **extra_context)
+
+
+def invalidate_hours_cache():
+    """Make cached reports stale.
+
+    The Activity and Attendance signal handlers call this. Any write that skips
+    them (bulk_create, QuerySet.update(), raw SQL) must call it too; see
+    attendance_sync.apply_attendance and archive.archive_batch.
+    """
+    try:
+        cache.incr(HOURS_VERSION_KEY)
+    except ValueError:
+        cache.set(HOURS_VERSION_KEY, 1, None)
+
+
+def _cache_version():
+    return cache.get_or_set(HOURS_VERSION_KEY, 1, None)
+
+
+def load_hours_columns(start=None, end=None, time_field='activity'):
+    """Fetch attended hours as NumPy columns with one query per tier."""
+    import numpy as np
+
+    lookup = 'assignment__activity__date' if time_field == 'activity' else 'recorded_at'
+    tiers = []
+    # Archived activities keep the same shape, so both tiers load the same columns.
+    for model in (Attendance, ArchivedAttendance):
+        queryset = model.objects.filter(attended=True)
+        if start is not None:
+            queryset = queryset.filter(**{f'{lookup}__gte': start})
+        if end is not None:
+            queryset = queryset.filter(**{f'{lookup}__lt': end})
+        # Hours and timestamps are converted in SQL, so the rows stream straight
+        # into a typed array without a Decimal or datetime per value.
+        rows = queryset.values_list(
+            Cast('hours', FloatField()), EpochSeconds('recorded_at'), EpochSeconds('assignment__activity__date'),
+            'assignment__activity__location', 'assignment__volunteer_id',
+        ).iterator(chunk_size=10000)
+        tiers.append(np.fromiter(rows, dtype=HOURS_ROW_DTYPE))
+
+    rows = np.concatenate(tiers)
+    locations, location_codes = np.unique(rows['location'], return_inverse=True)
+    return HoursColumns(
+        hours=rows['hours'],
+        recorded_at=rows['recorded_at'].astype('datetime64[s]'),
+        activity_date=rows['activity_date'].astype('datetime64[s]'),
+        location=location_codes.astype(np.int64),
+        locations=locations,
+        volunteer_id=rows['volunteer_id'],
+    )
+
+
+def _bucket_keys(timestamps, period):
+    import numpy as np
+
+    if period == 'month':
+        return timestamps.astype('datetime64[M]')
+    days = timestamps.astype('datetime64[D]').astype(np.int64)
+    # 1970-01-01 was a Thursday; shift so that weeks start on Monday.
+    return (days - (days + 3) % 7).astype('datetime64[D]')
+
+
+def bucket_hours(columns, period='month', group_by=None, time_field='activity', limit=20):
+    """Sum hours per time bucket, optionally split by location or volunteer."""
+    import numpy as np
+
+    timestamps = columns.activity_date if time_field == 'activity' else columns.recorded_at
+    buckets, bucket_codes = np.unique(_bucket_keys(timestamps, period), return_inverse=True)
+    result = {'buckets': [str(bucket) for bucket in buckets]}
+
+    if group_by is None:
+        totals = np.bincount(bucket_codes, weights=columns.hours, minlength=len(buckets))
+        result['hours'] = np.round(totals, 2).tolist()
+        return result
+
+    if group_by == 'location':
+        group_codes, labels = columns.location, columns.locations
+    else:
+        labels, group_codes = np.unique(columns.volunteer_id, return_inverse=True)
+    matrix = np.bincount(
+        bucket_codes * len(labels) + group_codes,
+        weights=columns.hours,
+        minlength=len(buckets) * len(labels),
+    ).reshape(len(buckets), len(labels))
+
+    top = np.argsort(-matrix.sum(axis=0), kind='stable')[:limit]
+    result['series'] = [
+        {'key': labels[index].item() if hasattr(labels[index], 'item') else labels[index],
+         'hours': np.round(matrix[:, index], 2).tolist()}
+        for index in top
+    ]
+    return result
+
+
+def hours_report(period='month', group_by=None, time_field='activity', start=None, end=None, limit=20):
+    """Cached entry point; any attendance change bumps the cache version."""
+    key = 'volunteers:hours-analytics:{}:{}:{}:{}:{}:{}:{}'.format(
+        _cache_version(), period, group_by, time_field,
+        start.isoformat() if start else '', end.isoformat() if end else '', limit,
+    )
+    result = cache.get(key)
+    if result is None:
+        columns = load_hours_columns(start=start, end=end, time_field=time_field)
+        result = bucket_hours(columns, period=period, group_by=group_by, time_field=time_field, limit=limit)
+        cache.set(key, result, HOURS_CACHE_TIMEOUT)
+    return result
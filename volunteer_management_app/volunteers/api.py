@@ -0,0 +1,286 @@
+import base64
+import datetime
+import hashlib
+import json
+from functools import wraps
+
+from django.db.models import Count, F, Max, Q
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.text import compress_string
+from django.views.decorators.http import condition, require_GET, require_POST
+
+from .attendance_sync import SyncError, sync_attendance
+from .models import Activity, Assignment, Notification
+
+API_VERSION = 'v1'
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Public field name -> ORM lookup. Sparse field selection picks from these.
+ACTIVITY_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'date': 'date',
+    'location': 'location',
+    'required_volunteers': 'required_volunteers',
+    'profile_needed': 'profile_needed',
+    'updated_at': 'updated_at',
+}
+ASSIGNMENT_FIELDS = {
+    'id': 'id',
+    'activity_id': 'activity_id',
+    'activity_title': 'activity__title',
+    'activity_date': 'activity__date',
+    'status': 'status',
+    'assigned_at': 'assigned_at',
+    'updated_at': 'updated_at',
+}
+NOTIFICATION_FIELDS = {
+    'id': 'id',
+    'activity_id': 'activity_id',
+    'activity_title': 'activity__title',
+    'message': 'message',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def api_login_required(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Autenticación requerida.'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _accepts_gzip(request):
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
+def _gzip(request, response):
+    # Compressed here rather than with gzip_page, which would weaken the ETag.
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if _accepts_gzip(request) and len(response.content) >= 200:
+        response.content = compress_string(response.content)
+        response['Content-Encoding'] = 'gzip'
+        response['Content-Length'] = str(len(response.content))
+    return response
+
+
+def encode_cursor(values):
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime.datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ApiError('Cursor inválido.')
+    if not isinstance(values, list):
+        raise ApiError('Cursor inválido.')
+    return values
+
+
+def _selected_fields(request, available):
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(available)
+    fields = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise ApiError(f'Campos desconocidos: {", ".join(unknown)}.')
+    return fields
+
+
+def _page_size(request):
+    try:
+        return max(1, min(int(request.GET.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE))
+    except ValueError:
+        raise ApiError('Parámetro limit inválido.')
+
+
+def _serialize_page(request, queryset, available, cursor_fields):
+    """Keyset-paginate `queryset` (already ordered by `cursor_fields`) into a JSON payload."""
+    fields = _selected_fields(request, available)
+    size = _page_size(request)
+    lookups = dict(available)
+    for name in cursor_fields:
+        lookups.setdefault(name, name)
+    selected = set(fields) | set(cursor_fields)
+    plain = [name for name in selected if lookups[name] == name]
+    renamed = {name: F(lookups[name]) for name in selected if lookups[name] != name}
+    rows = list(queryset.values(*plain, **renamed)[:size + 1])
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor([rows[-1][name] for name in cursor_fields])
+    return {
+        'version': API_VERSION,
+        'results': [{name: row[name] for name in fields} for row in rows],
+        'next_cursor': next_cursor,
+    }
+
+
+def _list_fingerprint(request, queryset, related=()):
+    # Shared by the ETag and Last-Modified callbacks: one aggregate query per request.
+    # `related` names the updated_at of joined rows whose fields are in the payload.
+    if not hasattr(request, '_api_fingerprint'):
+        maxima = {f'last_{index}': Max(field) for index, field in enumerate(['updated_at', *related])}
+        summary = queryset.order_by().aggregate(total=Count('id'), **maxima)
+        stamps = [summary[name] for name in maxima if summary[name] is not None]
+        request._api_fingerprint = (max(stamps) if stamps else None, summary['total'])
+    return request._api_fingerprint
+
+
+def _etag(request, queryset, related=()):
+    last, total = _list_fingerprint(request, queryset, related)
+    digest = hashlib.sha1(
+        '|'.join([
+            API_VERSION,
+            request.get_full_path(),
+            last.isoformat() if last else '',
+            str(total),
+            'gzip' if _accepts_gzip(request) else 'identity',
+        ]).encode()
+    ).hexdigest()
+    return digest
+
+
+def _last_modified(request, queryset, related=()):
+    return _list_fingerprint(request, queryset, related)[0]
+
+
+# Activities ----------------------------------------------------------------
+
+def _activity_queryset(request):
+    queryset = Activity.objects.all()
+    if request.GET.get('scope') != 'all':
+        queryset = queryset.filter(date__gte=timezone.now().replace(second=0, microsecond=0))
+    return queryset
+
+
+@require_GET
+@condition(
+    etag_func=lambda request: _etag(request, _activity_queryset(request)),
+    last_modified_func=lambda request: _last_modified(request, _activity_queryset(request)),
+)
+def activity_list(request):
+    queryset = _activity_queryset(request).order_by('date', 'id')
+    try:
+        cursor = request.GET.get('cursor')
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2:
+                raise ApiError('Cursor inválido.')
+            date, last_id = values
+            date = parse_datetime(date) if isinstance(date, str) else None
+            if date is None or not isinstance(last_id, int):
+                raise ApiError('Cursor inválido.')
+            queryset = queryset.filter(Q(date__gt=date) | Q(date=date, id__gt=last_id))
+        payload = _serialize_page(request, queryset, ACTIVITY_FIELDS, ['date', 'id'])
+    except ApiError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+    response = JsonResponse(payload)
+    patch_cache_control(response, public=True, max_age=60)
+    return _gzip(request, response)
+
+
+# Per-volunteer resources ---------------------------------------------------
+
+def _id_cursor_page(request, queryset, available):
+    queryset = queryset.order_by('-id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != 1 or not isinstance(values[0], int):
+            raise ApiError('Cursor inválido.')
+        queryset = queryset.filter(id__lt=values[0])
+    return _serialize_page(request, queryset, available, ['id'])
+
+
+def _private_json(request, payload):
+    response = JsonResponse(payload)
+    patch_cache_control(response, private=True, no_cache=True)
+    return _gzip(request, response)
+
+
+# Both lists embed the activity's title and date.
+LIST_RELATED = ('activity__updated_at',)
+
+
+def _assignment_queryset(request):
+    return Assignment.objects.filter(volunteer=request.user)
+
+
+def _notification_queryset(request):
+    return Notification.objects.filter(recipients=request.user)
+
+
+@require_GET
+@api_login_required
+@condition(
+    etag_func=lambda request: _etag(request, _assignment_queryset(request), LIST_RELATED),
+    last_modified_func=lambda request: _last_modified(request, _assignment_queryset(request), LIST_RELATED),
+)
+def my_assignments(request):
+    try:
+        payload = _id_cursor_page(request, _assignment_queryset(request), ASSIGNMENT_FIELDS)
+    except ApiError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+    return _private_json(request, payload)
+
+
+@require_GET
+@api_login_required
+@condition(
+    etag_func=lambda request: _etag(request, _notification_queryset(request), LIST_RELATED),
+    last_modified_func=lambda request: _last_modified(request, _notification_queryset(request), LIST_RELATED),
+)
+def my_notifications(request):
+    try:
+        payload = _id_cursor_page(request, _notification_queryset(request), NOTIFICATION_FIELDS)
+    except ApiError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+    return _private_json(request, payload)
+
+
+# Offline check-in devices ----------------------------------------------------
+
+@require_POST
+@api_login_required
+def attendance_sync(request, activity_id):
+    """POST {"token": ..., "records": [{"uuid", "assignment_id", "attended", "hours", "captured_at"}]}.
+
+    Only the coordinator who created the activity may sync it, as with
+    record_attendance. See volunteers.attendance_sync for the semantics.
+    """
+    activity = Activity.objects.filter(pk=activity_id).only('id', 'created_by_id').first()
+    if activity is None:
+        return JsonResponse({'error': 'Actividad no encontrada.'}, status=404)
+    if request.user.role.lower() != 'admin' or activity.created_by_id != request.user.pk:
+        return JsonResponse({'error': 'No autorizado.'}, status=403)
+    try:
+        body = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'JSON inválido.'}, status=400)
+    if not isinstance(body, dict):
+        return JsonResponse({'error': 'JSON inválido.'}, status=400)
+    try:
+        result = sync_attendance(activity.pk, body.get('token'), body.get('records', []))
+    except SyncError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return _private_json(request, {'version': API_VERSION, **result})
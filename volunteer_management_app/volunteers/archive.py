@@ -0,0 +1,75 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .analytics import invalidate_hours_cache
+from .models import (
+    Activity, ActivityStats, ArchivedActivity, ArchivedActivityStats, ArchivedAssignment, ArchivedAttendance,
+    Assignment, Attendance,
+)
+from .stats import STATS_FIELDS, refresh_activity_stats
+
+logger = logging.getLogger(__name__)
+
+
+def archive_cutoff(days=None, now=None):
+    if days is None:
+        days = getattr(settings, 'ARCHIVE_RETENTION_DAYS', 365)
+    return (now or timezone.now()) - datetime.timedelta(days=days)
+
+
+@transaction.atomic
+def archive_batch(activity_ids):
+    """Copy the activities, their assignments and attendance to the archive, then delete them.
+
+    Notifications, waitlist entries and reminder deliveries go with the
+    cascade; the archive keeps what the hours ledger, history and activity
+    report need. Stats are refreshed first so the copy is final.
+    """
+    activities = list(Activity.objects.select_for_update().filter(id__in=activity_ids))
+    ArchivedActivity.objects.bulk_create([
+        ArchivedActivity(
+            id=activity.id, title=activity.title, description=activity.description, date=activity.date,
+            end_date=activity.end_date, location=activity.location, required_volunteers=activity.required_volunteers,
+            profile_needed=activity.profile_needed, created_by_id=activity.created_by_id,
+            series_id=activity.series_id,
+        ) for activity in activities
+    ], ignore_conflicts=True)
+    ArchivedAssignment.objects.bulk_create([
+        ArchivedAssignment(id=row[0], volunteer_id=row[1], activity_id=row[2], assigned_at=row[3], status=row[4])
+        for row in Assignment.objects.filter(activity_id__in=activity_ids)
+        .values_list('id', 'volunteer_id', 'activity_id', 'assigned_at', 'status')
+    ], ignore_conflicts=True, batch_size=1000)
+    ArchivedAttendance.objects.bulk_create([
+        ArchivedAttendance(id=row[0], assignment_id=row[1], attended=row[2], hours=row[3], recorded_at=row[4])
+        for row in Attendance.objects.filter(assignment__activity_id__in=activity_ids)
+        .values_list('id', 'assignment_id', 'attended', 'hours', 'recorded_at')
+    ], ignore_conflicts=True, batch_size=1000)
+    refresh_activity_stats(activity_ids)
+    ArchivedActivityStats.objects.bulk_create([
+        ArchivedActivityStats(activity_id=row['activity_id'], **{field: row[field] for field in STATS_FIELDS})
+        for row in ActivityStats.objects.filter(activity_id__in=activity_ids).values('activity_id', *STATS_FIELDS)
+    ], ignore_conflicts=True, batch_size=1000)
+    Activity.objects.filter(id__in=[activity.id for activity in activities]).delete()
+    return len(activities)
+
+
+def archive_activities(cutoff=None, batch_size=200, limit=None):
+    """Archive activities dated before `cutoff`, oldest first, one transaction per batch."""
+    cutoff = cutoff or archive_cutoff()
+    archived = 0
+    while limit is None or archived < limit:
+        size = batch_size if limit is None else min(batch_size, limit - archived)
+        ids = list(
+            Activity.objects.filter(date__lt=cutoff).order_by('date', 'id').values_list('id', flat=True)[:size]
+        )
+        if not ids:
+            break
+        archived += archive_batch(ids)
+        logger.info('Archived %d activities older than %s', archived, cutoff)
+    if archived:
+        invalidate_hours_cache()
+    return archived
@@ -0,0 +1,202 @@
+"""Batch attendance sync for offline check-in devices.
+
+A tablet at a field event keeps a queue of attendance records, each tagged
+with a client UUID, and posts the whole queue when it has connectivity. The
+server applies it in one transaction as an upsert on Attendance.assignment and
+answers with the roster rows that changed since the device's previous sync
+token, so a 500-record sync costs a handful of queries instead of 500 form
+posts to record_attendance.
+"""
+import datetime
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.core import signing
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import audit
+from .analytics import invalidate_hours_cache
+from .models import Assignment, Attendance, AuditEvent
+from .stats import refresh_activity_stats
+
+MAX_SYNC_RECORDS = 1000
+TOKEN_SALT = 'volunteers.attendance-sync'
+# Rows stamped just before a token was issued may commit just after it; the
+# next delta starts this much earlier so they are not missed (clients dedupe
+# by assignment id).
+TOKEN_OVERLAP = datetime.timedelta(seconds=5)
+MAX_HOURS = Decimal('99.99')
+SYNC_UPDATE_FIELDS = ['attended', 'hours', 'client_uuid', 'updated_at']
+
+
+class SyncError(Exception):
+    pass
+
+
+def make_token(activity_id, now):
+    return signing.dumps({'activity': activity_id, 'since': now.isoformat()}, salt=TOKEN_SALT)
+
+
+def read_token(token, activity_id):
+    """Datetime the token was issued at, or None for a first sync."""
+    if not token:
+        return None
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT)
+    except signing.BadSignature:
+        raise SyncError('Token de sincronización inválido.')
+    since = parse_datetime(data.get('since') or '')
+    if data.get('activity') != activity_id or since is None:
+        raise SyncError('Token de sincronización inválido.')
+    return since
+
+
+def parse_record(raw):
+    """Validate one queued record; returns a dict or raises SyncError."""
+    if not isinstance(raw, dict):
+        raise SyncError('Registro inválido.')
+    try:
+        client_uuid = uuid.UUID(str(raw.get('uuid')))
+    except ValueError:
+        raise SyncError('UUID inválido.')
+    assignment_id = raw.get('assignment_id')
+    if not isinstance(assignment_id, int) or isinstance(assignment_id, bool):
+        raise SyncError('assignment_id inválido.')
+    try:
+        hours = Decimal(str(raw.get('hours', '0')))
+    except InvalidOperation:
+        raise SyncError('Horas inválidas.')
+    if not hours.is_finite() or hours < 0 or hours > MAX_HOURS:
+        raise SyncError('Horas inválidas.')
+    captured_at = None
+    if raw.get('captured_at'):
+        captured_at = parse_datetime(str(raw['captured_at']))
+        if captured_at is None:
+            raise SyncError('captured_at inválido.')
+        if timezone.is_naive(captured_at):
+            captured_at = timezone.make_aware(captured_at)
+    return {
+        'uuid': client_uuid,
+        'assignment_id': assignment_id,
+        'attended': bool(raw.get('attended')),
+        'hours': hours.quantize(Decimal('0.01')),
+        'captured_at': captured_at,
+    }
+
+
+def apply_attendance(activity_id, records, update_fields=SYNC_UPDATE_FIELDS):
+    """Upsert already parsed records for one activity in a single transaction.
+
+    Per record the outcome is one of: applied; duplicate (the stored row already
+    came from this UUID); conflict (the stored row changed after the record was
+    captured, so the server copy wins); or an error (assignment not in this
+    activity, or cancelled). Returns a dict of those lists. `update_fields` are
+    the columns overwritten on an existing row; QR check-in leaves out `hours`
+    so a scan never clears recorded hours.
+    """
+    result = {'applied': [], 'duplicates': [], 'conflicts': [], 'errors': []}
+    # Later entries for the same assignment supersede earlier ones in the queue.
+    latest = {}
+    for record in records:
+        latest[record['assignment_id']] = record
+    if not latest:
+        return result
+
+    with transaction.atomic():
+        assignments = {
+            assignment.id: assignment
+            for assignment in Assignment.objects.filter(activity_id=activity_id, id__in=latest)
+            .select_related('attendance')
+        }
+        rows = []
+        for assignment_id, record in latest.items():
+            key = str(record['uuid'])
+            assignment = assignments.get(assignment_id)
+            if assignment is None:
+                result['errors'].append({'uuid': key, 'error': 'La inscripción no pertenece a esta actividad.'})
+                continue
+            if assignment.status == 'cancelled':
+                result['errors'].append({'uuid': key, 'error': 'La inscripción está cancelada.'})
+                continue
+            existing = getattr(assignment, 'attendance', None)
+            if existing is not None:
+                if existing.client_uuid == record['uuid']:
+                    result['duplicates'].append(key)
+                    continue
+                if record['captured_at'] and existing.updated_at > record['captured_at']:
+                    result['conflicts'].append({'uuid': key, 'assignment_id': assignment_id})
+                    continue
+            rows.append(Attendance(
+                assignment_id=assignment_id,
+                attended=record['attended'],
+                hours=record['hours'],
+                client_uuid=record['uuid'],
+            ))
+            result['applied'].append(key)
+            audit.record(
+                AuditEvent.ATTENDANCE_CHANGED if existing is not None else AuditEvent.ATTENDANCE_RECORDED,
+                volunteer_id=assignment.volunteer_id, activity_id=activity_id,
+                attended=record['attended'], hours=str(record['hours']), client_uuid=key,
+            )
+        if rows:
+            Attendance.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['assignment'],
+                update_fields=update_fields,
+                batch_size=500,
+            )
+            # bulk_create skips the post_save handlers that keep these current.
+            refresh_activity_stats([activity_id])
+            invalidate_hours_cache()
+    return result
+
+
+def roster_delta(activity_id, since=None):
+    """Roster rows of the activity changed since `since` (all rows when None)."""
+    assignments = Assignment.objects.filter(activity_id=activity_id)
+    if since is not None:
+        since -= TOKEN_OVERLAP
+        assignments = assignments.filter(Q(updated_at__gte=since) | Q(attendance__updated_at__gte=since))
+    return [
+        {
+            'assignment_id': row['id'],
+            'volunteer_id': row['volunteer_id'],
+            'first_name': row['volunteer__first_name'],
+            'last_name': row['volunteer__last_name'],
+            'status': row['status'],
+            'attended': row['attendance__attended'],
+            'hours': str(row['attendance__hours']) if row['attendance__hours'] is not None else None,
+            'client_uuid': str(row['attendance__client_uuid']) if row['attendance__client_uuid'] else None,
+        }
+        for row in assignments.order_by('id').values(
+            'id', 'volunteer_id', 'volunteer__first_name', 'volunteer__last_name', 'status',
+            'attendance__attended', 'attendance__hours', 'attendance__client_uuid',
+        )
+    ]
+
+
+def sync_attendance(activity_id, token, raw_records):
+    """Parse, apply and build the response for one device sync."""
+    since = read_token(token, activity_id)
+    if not isinstance(raw_records, list):
+        raise SyncError('records debe ser una lista.')
+    if len(raw_records) > MAX_SYNC_RECORDS:
+        raise SyncError(f'Máximo {MAX_SYNC_RECORDS} registros por sincronización.')
+    records, errors = [], []
+    for raw in raw_records:
+        try:
+            records.append(parse_record(raw))
+        except SyncError as e:
+            errors.append({'uuid': str(raw.get('uuid', '')) if isinstance(raw, dict) else '', 'error': str(e)})
+    # Issued before reading the roster, so nothing committed later is skipped.
+    now = timezone.now()
+    result = apply_attendance(activity_id, records)
+    result['errors'] = errors + result['errors']
+    result['roster'] = roster_delta(activity_id, since)
+    result['full'] = since is None
+    result['token'] = make_token(activity_id, now)
+    return result
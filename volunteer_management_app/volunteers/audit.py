@@ -0,0 +1,151 @@
+"""Buffered audit trail.
+
+``record()`` queues an ``AuditEvent`` in a per-process ring buffer once the
+surrounding transaction commits. The buffer is written with one ``bulk_create``
+when it reaches AUDIT_FLUSH_SIZE events, at the end of a request once
+AUDIT_FLUSH_SECONDS have passed since the last write, and at interpreter exit.
+If the database is unavailable the events stay buffered; past
+AUDIT_BUFFER_CAPACITY the oldest are dropped and counted.
+
+Buffered events belong to the database they were recorded against. If the
+default alias points elsewhere when they are written (the test runner swaps in
+a test database and restores the real one before exit), they are discarded
+rather than written to the wrong place.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections, transaction
+from django.utils import timezone
+
+from .models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _database_name():
+    return connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+
+
+class AuditBuffer:
+    def __init__(self, flush_size=200, flush_seconds=5.0, capacity=10000, clock=time.monotonic):
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.clock = clock
+        self.dropped = 0
+        self._events = deque(maxlen=capacity)
+        self._database = None
+        self._lock = threading.Lock()
+        self._last_flush = clock()
+
+    def __len__(self):
+        return len(self._events)
+
+    def append(self, event):
+        database = _database_name()
+        with self._lock:
+            if self._events and self._database != database:
+                self._discard(database)
+            self._database = database
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            due = len(self._events) >= self.flush_size
+        if due:
+            self.flush()
+
+    def flush_if_due(self):
+        if self._events and self.clock() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def _discard(self, database):
+        # Called with the lock held.
+        logger.warning('Discarding %d audit events recorded against database %s, now %s',
+                       len(self._events), self._database, database)
+        self.dropped += len(self._events)
+        self._events.clear()
+
+    def flush(self):
+        database = _database_name()
+        with self._lock:
+            if self._events and self._database != database:
+                self._discard(database)
+            batch = list(self._events)
+            self._events.clear()
+            self._last_flush = self.clock()
+        if not batch:
+            return 0
+        try:
+            AuditEvent.objects.bulk_create(batch, batch_size=500)
+        except Exception:
+            logger.exception('Could not write %d audit events; keeping them buffered', len(batch))
+            with self._lock:
+                # Newer events go behind the failed batch; the ring drops the oldest on overflow.
+                pending = batch + list(self._events)
+                self.dropped += max(0, len(pending) - self._events.maxlen)
+                self._events.clear()
+                self._events.extend(pending)
+            return 0
+        return len(batch)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = AuditBuffer(
+                flush_size=getattr(settings, 'AUDIT_FLUSH_SIZE', 200),
+                flush_seconds=getattr(settings, 'AUDIT_FLUSH_SECONDS', 5.0),
+                capacity=getattr(settings, 'AUDIT_BUFFER_CAPACITY', 10000),
+            )
+        return _buffer
+
+
+def reset_buffer():
+    global _buffer
+    with _buffer_lock:
+        _buffer = None
+
+
+@atexit.register
+def _flush_at_exit():
+    if _buffer is not None:
+        close_old_connections()
+        _buffer.flush()
+
+
+def record(kind, volunteer_id=None, activity_id=None, object_id=None, **data):
+    """Queue an audit event; it is buffered only if the current transaction commits."""
+    now = timezone.now()
+    event = AuditEvent(
+        occurred_at=now,
+        month=now.year * 100 + now.month,
+        kind=kind,
+        volunteer_id=volunteer_id,
+        activity_id=activity_id,
+        object_id=object_id,
+        data=data,
+    )
+    transaction.on_commit(lambda: get_buffer().append(event))
+
+
+def flush():
+    return get_buffer().flush()
+
+
+def volunteer_events(volunteer_id, start=None, end=None):
+    """What happened to a volunteer, newest first; a date range also prunes by month."""
+    events = AuditEvent.objects.filter(volunteer_id=volunteer_id)
+    if start is not None:
+        events = events.filter(month__gte=start.year * 100 + start.month, occurred_at__gte=start)
+    if end is not None:
+        events = events.filter(month__lte=end.year * 100 + end.month, occurred_at__lt=end)
+    return events.order_by('-occurred_at', '-id')
@@ -0,0 +1,73 @@
+import io
+
+from . import jobs
+from .ledger import annotate_hours
+from .models import CertificateFile, CustomUser, Job
+
+MIN_CERTIFICATE_HOURS = 2
+
+# ReportLab is imported where a PDF is drawn: it is the heaviest import in the
+# project and most processes (web workers serving stored PDFs, commands) never need it.
+
+
+def render_certificate_pdf(volunteer, total_hours):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+
+    p.setFont("Helvetica-Bold", 20)
+    p.drawCentredString(width / 2.0, height - 100, "Certificado de Voluntariado")
+
+    p.setFont("Helvetica", 14)
+    p.drawCentredString(width / 2.0, height - 150, f"Este certificado se otorga a {volunteer.get_full_name() or volunteer.username}")
+
+    p.setFont("Helvetica", 12)
+    p.drawCentredString(width / 2.0, height - 180, f"Por haber completado {total_hours} horas de voluntariado.")
+
+    p.setFont("Helvetica-Oblique", 10)
+    p.drawCentredString(width / 2.0, height - 210, "Gracias por tu valiosa contribución y compromiso.")
+
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def stored_certificate(volunteer, total_hours):
+    """The pre-rendered PDF if it was rendered for the current hours, else None."""
+    stored = CertificateFile.objects.filter(volunteer=volunteer, total_hours=total_hours).only('pdf').first()
+    return bytes(stored.pdf) if stored else None
+
+
+def store_certificate(volunteer, total_hours):
+    pdf = render_certificate_pdf(volunteer, total_hours)
+    CertificateFile.objects.update_or_create(volunteer=volunteer, defaults={'total_hours': total_hours, 'pdf': pdf})
+    return pdf
+
+
+def eligible_volunteers(min_hours=MIN_CERTIFICATE_HOURS):
+    """Volunteers with at least `min_hours`, annotated with total and attended (certified) hours."""
+    volunteers = (
+        annotate_hours(CustomUser.objects.filter(role__iexact='volunteer'))
+        .filter(total_hours__gte=min_hours)
+        .order_by('-total_hours')
+    )
+    return annotate_hours(volunteers, name='certified_hours', attended_only=True)
+
+
+def queue_stale_certificates(volunteers):
+    """Queue render jobs for volunteers whose stored PDF is missing or stale; returns how many."""
+    rendered = dict(CertificateFile.objects.values_list('volunteer_id', 'total_hours'))
+    queued = set(
+        Job.objects.filter(task='render_certificate', status__in=['pending', 'running'])
+        .values_list('payload__volunteer_id', flat=True)
+    )
+    stale = [
+        v.id for v in volunteers
+        if v.id not in queued and rendered.get(v.id) != (v.certified_hours or 0)
+    ]
+    if stale:
+        jobs.enqueue_many('render_certificate', [{'volunteer_id': volunteer_id} for volunteer_id in stale])
+    return len(stale)
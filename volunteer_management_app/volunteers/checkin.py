@@ -0,0 +1,204 @@
+"""QR check-in at the door.
+
+Each assignment gets a signed token carrying its activity and assignment ids;
+the kiosk checks the signature with django.core.signing, so a scan is answered
+without reading the database. Accepted scans go into a per-process queue that
+a background thread commits in batches through attendance_sync.apply_attendance
+(the same upsert the offline devices use), every CHECKIN_FLUSH_SECONDS or as
+soon as CHECKIN_BATCH_SIZE scans are waiting.
+
+The queue lives in memory: scans not yet committed when the process dies are
+lost and the volunteer has to scan again.
+"""
+import atexit
+import datetime
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .attendance_sync import apply_attendance
+
+logger = logging.getLogger(__name__)
+
+CHECKIN_SALT = 'volunteers.checkin'
+KIOSK_SALT = 'volunteers.checkin-kiosk'
+KIOSK_MAX_AGE = datetime.timedelta(hours=12)
+# Scans never overwrite hours recorded by a coordinator.
+CHECKIN_UPDATE_FIELDS = ['attended', 'client_uuid', 'updated_at']
+_UUID_NAMESPACE = uuid.UUID('4b0f2a52-6f0e-4c84-9d5b-0b8e1f6e2a11')
+
+
+class CheckinError(Exception):
+    pass
+
+
+def checkin_token(assignment):
+    return signing.Signer(salt=CHECKIN_SALT).sign(f'{assignment.activity_id}.{assignment.pk}')
+
+
+def read_checkin_token(token):
+    """(activity_id, assignment_id) from a scanned token; no database access."""
+    try:
+        value = signing.Signer(salt=CHECKIN_SALT).unsign(token.strip())
+        activity_id, assignment_id = (int(part) for part in value.split('.'))
+    except (signing.BadSignature, ValueError):
+        raise CheckinError('Código QR inválido.')
+    return activity_id, assignment_id
+
+
+def kiosk_token(activity_id, user_id):
+    """Authorises one kiosk page to post scans for one activity."""
+    return signing.TimestampSigner(salt=KIOSK_SALT).sign(f'{activity_id}.{user_id}')
+
+
+def read_kiosk_token(token, activity_id):
+    try:
+        value = signing.TimestampSigner(salt=KIOSK_SALT).unsign(token or '', max_age=KIOSK_MAX_AGE)
+        kiosk_activity_id, _ = (int(part) for part in value.split('.'))
+    except (signing.BadSignature, ValueError):
+        raise CheckinError('Sesión de kiosco inválida o vencida.')
+    if kiosk_activity_id != activity_id:
+        raise CheckinError('Sesión de kiosco inválida o vencida.')
+
+
+def checkin_uuid(assignment_id):
+    # Stable per assignment, so re-scans are recognised as duplicates by the upsert.
+    return uuid.uuid5(_UUID_NAMESPACE, f'checkin:{assignment_id}')
+
+
+class CheckinQueue:
+    """Scans waiting to be committed, grouped by activity."""
+
+    def __init__(self, batch_size=200, flush_seconds=0.2, asynchronous=True, max_seen=100000):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.asynchronous = asynchronous
+        self.max_seen = max_seen
+        self._pending = defaultdict(dict)
+        self._size = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return self._size
+
+    def submit(self, activity_id, assignment_id, scanned_at=None):
+        """Queue a scan; returns 'queued', or 'duplicate' if this process already has it."""
+        key = (activity_id, assignment_id)
+        with self._lock:
+            if key in self._seen:
+                return 'duplicate'
+            if len(self._seen) >= self.max_seen:
+                self._seen.clear()
+            self._seen.add(key)
+            self._pending[activity_id][assignment_id] = scanned_at or timezone.now()
+            self._size += 1
+            full = self._size >= self.batch_size
+            if self.asynchronous and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name='checkin-flush', daemon=True)
+                self._thread.start()
+        if not self.asynchronous:
+            self.flush()
+        elif full:
+            self._wakeup.set()
+        return 'queued'
+
+    def _drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(dict)
+            self._size = 0
+            self._wakeup.clear()
+        return pending
+
+    def flush(self):
+        """Commit everything queued; returns how many scans were written."""
+        written = 0
+        for activity_id, scans in self._drain().items():
+            records = [
+                {
+                    'uuid': checkin_uuid(assignment_id),
+                    'assignment_id': assignment_id,
+                    'attended': True,
+                    'hours': Decimal('0'),
+                    'captured_at': scanned_at,
+                }
+                for assignment_id, scanned_at in scans.items()
+            ]
+            try:
+                result = apply_attendance(activity_id, records, update_fields=CHECKIN_UPDATE_FIELDS)
+            except Exception:
+                logger.exception('Check-in batch failed activity=%s scans=%d; requeued', activity_id, len(scans))
+                with self._lock:
+                    for assignment_id, scanned_at in scans.items():
+                        self._pending[activity_id].setdefault(assignment_id, scanned_at)
+                    self._size = sum(len(batch) for batch in self._pending.values())
+                continue
+            written += len(result['applied'])
+            if result['errors']:
+                rejected = {error['uuid'] for error in result['errors']}
+                with self._lock:
+                    # Let a rejected volunteer scan again once the coordinator fixes the roster.
+                    self._seen.difference_update(
+                        (activity_id, record['assignment_id']) for record in records if str(record['uuid']) in rejected
+                    )
+                for error in result['errors']:
+                    logger.warning('Check-in rejected activity=%s uuid=%s error=%s', activity_id, error['uuid'], error['error'])
+        return written
+
+    def _run(self):
+        while True:
+            # Wakes early when a batch fills up, otherwise commits on the interval.
+            self._wakeup.wait(self.flush_seconds)
+            if not self._size:
+                continue
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = CheckinQueue(
+                batch_size=getattr(settings, 'CHECKIN_BATCH_SIZE', 200),
+                flush_seconds=getattr(settings, 'CHECKIN_FLUSH_SECONDS', 0.2),
+                asynchronous=getattr(settings, 'CHECKIN_ASYNC', True),
+            )
+            atexit.register(_flush_at_exit)
+        return _queue
+
+
+def reset_queue():
+    global _queue
+    with _queue_lock:
+        _queue = None
+
+
+def _flush_at_exit():
+    if _queue is not None:
+        close_old_connections()
+        _queue.flush()
+
+
+def scan(token, kiosk_activity_id):
+    """Verify a scanned token for the kiosk's activity and queue the check-in."""
+    activity_id, assignment_id = read_checkin_token(token)
+    if activity_id != kiosk_activity_id:
+        raise CheckinError('Este código es de otra actividad.')
+    return assignment_id, get_queue().submit(activity_id, assignment_id)
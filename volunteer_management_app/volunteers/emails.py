@@ -0,0 +1,83 @@
+from itertools import islice
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+
+from .models import Notification
+
+FROM_EMAIL = 'noreply@example.com'
+NOTIFICATION_TEXT_TEMPLATE = 'volunteers/email/notification.txt'
+NOTIFICATION_HTML_TEMPLATE = 'volunteers/email/notification.html'
+
+
+def notification_context(notification, volunteer):
+    return {
+        'name': volunteer.get_full_name() or volunteer.username,
+        'message': notification.message,
+        'activity': notification.activity,
+    }
+
+
+def iter_notification_messages(notification, recipients, connection=None):
+    """Yield one personalized text+HTML message per recipient.
+
+    Both templates are loaded (and compiled) once; the loop only renders.
+    Messages are produced lazily so memory does not grow with the recipient count.
+    """
+    text_template = get_template(NOTIFICATION_TEXT_TEMPLATE)
+    html_template = get_template(NOTIFICATION_HTML_TEMPLATE)
+    subject = f'Notificación para la actividad: {notification.activity.title}'
+    for volunteer in recipients:
+        if not volunteer.email:
+            continue
+        context = notification_context(notification, volunteer)
+        message = EmailMultiAlternatives(
+            subject, text_template.render(context), FROM_EMAIL, [volunteer.email], connection=connection,
+        )
+        message.attach_alternative(html_template.render(context), 'text/html')
+        yield message
+
+
+def send_in_batches(messages, connection=None, batch_size=100):
+    """Send an iterable of messages over one connection, `batch_size` at a time."""
+    connection = connection or get_connection()
+    sent = 0
+    connection.open()
+    try:
+        while True:
+            batch = list(islice(messages, batch_size))
+            if not batch:
+                break
+            sent += connection.send_messages(batch) or 0
+    finally:
+        connection.close()
+    return sent
+
+
+def send_notification(notification, batch_size=100):
+    """Email the notification's recipients in pk order, `batch_size` at a time.
+
+    Progress is saved after every batch, so a retried job skips recipients who
+    were already mailed; only the batch in flight when it failed goes out again.
+    """
+    recipients = (
+        notification.recipients.exclude(email='')
+        .filter(pk__gt=notification.emailed_through)
+        .only('username', 'first_name', 'last_name', 'email')
+        .order_by('pk')
+        .iterator(chunk_size=1000)
+    )
+    connection = get_connection()
+    sent = 0
+    connection.open()
+    try:
+        while True:
+            batch = list(islice(recipients, batch_size))
+            if not batch:
+                break
+            sent += connection.send_messages(list(iter_notification_messages(notification, batch, connection))) or 0
+            notification.emailed_through = batch[-1].pk
+            Notification.objects.filter(pk=notification.pk).update(emailed_through=notification.emailed_through)
+    finally:
+        connection.close()
+    return sent
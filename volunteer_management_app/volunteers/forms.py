@@ -1,6 +1,10 @@
+import datetime
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
-from .models import CustomUser, Activity, Notification
+from .models import CustomUser, Activity, ActivitySeries, Notification
+from .segments import SegmentError, parse as parse_segment
+from .widgets import AutocompleteSelect
 
 class CustomUserCreationForm(UserCreationForm):
     class Meta:
@@ -28,19 +32,79 @@ class CustomUserCreationForm(UserCreationForm):
 class ActivityForm(forms.ModelForm):
     class Meta:
         model = Activity
-        fields = ['title', 'description', 'date', 'location', 'required_volunteers', 'profile_needed']
+        fields = ['title', 'description', 'date', 'end_date', 'location', 'required_volunteers', 'profile_needed']
         widgets = {
             'date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+            'end_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+        }
+        help_texts = {
+            'end_date': 'Si se deja vacío, la actividad dura el tiempo predeterminado.',
         }
         labels = {
             'title': 'Título',
             'description': 'Descripción',
             'date': 'Fecha',
+            'end_date': 'Fin',
             'location': 'Ubicación',
             'required_volunteers': 'Voluntarios requeridos',
             'profile_needed': 'Perfil necesario',
         }
 
+    def clean(self):
+        cleaned_data = super().clean()
+        date, end_date = cleaned_data.get('date'), cleaned_data.get('end_date')
+        if date and end_date and end_date <= date:
+            self.add_error('end_date', 'El fin debe ser posterior al inicio.')
+        return cleaned_data
+
+class ActivitySeriesForm(forms.ModelForm):
+    WEEKDAY_CHOICES = [
+        ('0', 'Lunes'), ('1', 'Martes'), ('2', 'Miércoles'), ('3', 'Jueves'),
+        ('4', 'Viernes'), ('5', 'Sábado'), ('6', 'Domingo'),
+    ]
+    weekdays = forms.MultipleChoiceField(choices=WEEKDAY_CHOICES, required=False, widget=forms.CheckboxSelectMultiple, label='Días de la semana')
+    exceptions = forms.CharField(required=False, label='Fechas excluidas', help_text='Fechas AAAA-MM-DD separadas por comas.')
+
+    class Meta:
+        model = ActivitySeries
+        fields = ['title', 'description', 'start', 'location', 'required_volunteers', 'profile_needed', 'frequency', 'interval', 'weekdays', 'until', 'exceptions']
+        widgets = {
+            'start': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
+            'until': forms.DateInput(attrs={'type': 'date'}),
+        }
+        labels = {
+            'title': 'Título',
+            'description': 'Descripción',
+            'start': 'Primera fecha',
+            'location': 'Ubicación',
+            'required_volunteers': 'Voluntarios requeridos',
+            'profile_needed': 'Perfil necesario',
+            'frequency': 'Frecuencia',
+            'interval': 'Intervalo',
+            'until': 'Hasta',
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial['weekdays'] = [day for day in self.instance.weekdays.split(',') if day]
+            self.initial['exceptions'] = ', '.join(self.instance.exceptions)
+
+    def clean_weekdays(self):
+        return ','.join(sorted(self.cleaned_data['weekdays']))
+
+    def clean_exceptions(self):
+        dates = []
+        for value in self.cleaned_data['exceptions'].split(','):
+            value = value.strip()
+            if not value:
+                continue
+            try:
+                dates.append(datetime.date.fromisoformat(value).isoformat())
+            except ValueError:
+                raise forms.ValidationError(f'Fecha inválida: {value}')
+        return dates
+
 class CustomAuthenticationForm(AuthenticationForm):
     def clean_username(self):
         username = self.cleaned_data.get('username')
@@ -49,9 +113,33 @@ class CustomAuthenticationForm(AuthenticationForm):
         return username
 
 class NotificationForm(forms.ModelForm):
+    segment = forms.CharField(
+        required=False,
+        label='Segmento',
+        help_text='Opcional. Sin segmento se notifica a los inscritos en la actividad. '
+                  'Ejemplo: interest:ambiente AND attended:90 AND NOT upcoming',
+    )
+
     class Meta:
         model = Notification
         fields = ['activity', 'message']
         widgets = {
+            'activity': AutocompleteSelect('activity_lookup', placeholder='Buscar actividad por título…'),
             'message': forms.Textarea(attrs={'rows': 4}),
         }
+
+    def clean_segment(self):
+        segment = self.cleaned_data['segment'].strip()
+        if segment:
+            try:
+                parse_segment(segment)
+            except SegmentError as e:
+                raise forms.ValidationError(str(e))
+        return segment
+
+class VolunteerPickerForm(forms.Form):
+    volunteer_id = forms.ModelChoiceField(
+        queryset=CustomUser.objects.filter(role__iexact='volunteer'),
+        widget=AutocompleteSelect('volunteer_lookup', placeholder='Buscar voluntario por usuario…'),
+        label='Voluntario',
+    )
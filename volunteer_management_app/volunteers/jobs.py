@@ -0,0 +1,163 @@
+"""Small database-backed job queue.
+
+Views call ``enqueue()``; ``manage.py runworker`` claims and runs jobs. Claiming
+uses ``SELECT ... FOR UPDATE SKIP LOCKED`` where the backend supports it and an
+atomic conditional UPDATE otherwise (SQLite), so any number of workers can poll
+the same table without running a job twice.
+"""
+import datetime
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(name):
+    """Register a function as the handler for jobs named `name`."""
+    def decorator(func):
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def registered_tasks():
+    # Handlers live in volunteers.tasks; importing it fills the registry.
+    from . import tasks  # noqa: F401
+    return dict(_registry)
+
+
+def enqueue(task_name, payload=None, run_at=None, max_attempts=None):
+    """Create a job. Inside a transaction the job becomes visible only on commit."""
+    return Job.objects.create(
+        task=task_name,
+        payload=payload or {},
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or getattr(settings, 'JOBS_MAX_ATTEMPTS', 5),
+    )
+
+
+def enqueue_many(task_name, payloads):
+    now = timezone.now()
+    max_attempts = getattr(settings, 'JOBS_MAX_ATTEMPTS', 5)
+    return Job.objects.bulk_create(
+        [Job(task=task_name, payload=payload, run_at=now, max_attempts=max_attempts) for payload in payloads],
+        batch_size=500,
+    )
+
+
+def default_worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+def _due():
+    return Job.objects.filter(status='pending', run_at__lte=timezone.now()).order_by('run_at', 'id')
+
+
+def claim_job(worker_id):
+    """Atomically take the next due job, or return None."""
+    now = timezone.now()
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = _due().select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = 'running'
+            job.locked_by = worker_id
+            job.locked_at = now
+            job.attempts += 1
+            job.save(update_fields=['status', 'locked_by', 'locked_at', 'attempts', 'updated_at'])
+            return job
+
+    for job_id in _due().values_list('id', flat=True)[:10]:
+        claimed = Job.objects.filter(id=job_id, status='pending').update(
+            status='running', locked_by=worker_id, locked_at=now,
+            attempts=F('attempts') + 1, updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def backoff_delay(attempts):
+    base = getattr(settings, 'JOBS_BACKOFF_SECONDS', 10)
+    delay = min(base * 2 ** (attempts - 1), getattr(settings, 'JOBS_MAX_BACKOFF_SECONDS', 3600))
+    return datetime.timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def run_job(job):
+    """Run a claimed job and record the outcome: done, retried later, or dead."""
+    handler = registered_tasks().get(job.task)
+    try:
+        if handler is None:
+            raise LookupError(f'Tarea desconocida: {job.task}')
+        handler(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = 'dead'
+            logger.error('Job %s (%s) dead after %d attempts', job.pk, job.task, job.attempts)
+        else:
+            job.status = 'pending'
+            job.run_at = timezone.now() + backoff_delay(job.attempts)
+            logger.warning('Job %s (%s) failed, retry %d at %s', job.pk, job.task, job.attempts, job.run_at)
+        job.last_error = error
+        job.locked_by = ''
+        job.locked_at = None
+        job.save(update_fields=['status', 'run_at', 'last_error', 'locked_by', 'locked_at', 'updated_at'])
+        return False
+    job.status = 'done'
+    job.locked_by = ''
+    job.locked_at = None
+    job.save(update_fields=['status', 'locked_by', 'locked_at', 'updated_at'])
+    return True
+
+
+def requeue_stale_jobs():
+    """Return jobs whose worker died mid-run to the queue.
+
+    A job that already used its last attempt goes to dead instead, so one that
+    keeps killing its worker stops cycling.
+    """
+    timeout = datetime.timedelta(seconds=getattr(settings, 'JOBS_LOCK_TIMEOUT_SECONDS', 600))
+    now = timezone.now()
+    stale = Job.objects.filter(status='running', locked_at__lt=now - timeout)
+    dead = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='dead', locked_by='', locked_at=None, updated_at=now,
+        last_error='El worker se detuvo durante el último intento.',
+    )
+    if dead:
+        logger.error('%d stale job(s) dead after their last attempt', dead)
+    return dead + stale.update(
+        status='pending', locked_by='', locked_at=None, run_at=now, updated_at=now,
+    )
+
+
+def retry_job(job_id):
+    return Job.objects.filter(id=job_id, status='dead').update(
+        status='pending', attempts=0, run_at=timezone.now(), updated_at=timezone.now(),
+    )
+
+
+def run_pending_jobs(worker_id='inline', limit=None):
+    """Drain due jobs in the current thread; returns how many ran."""
+    ran = 0
+    while limit is None or ran < limit:
+        job = claim_job(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        ran += 1
+    return ran
@@ -0,0 +1,67 @@
+"""Volunteer hours read across the live and archive tiers.
+
+Anything that totals or lists attendance should go through here rather than
+query ``Attendance`` directly, or archived activities silently drop out.
+"""
+from decimal import Decimal
+
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import ArchivedAttendance, Attendance
+
+TIERS = (Attendance, ArchivedAttendance)
+HOURS_FIELD = DecimalField(max_digits=8, decimal_places=2)
+
+
+def _attendance(model, attended_only):
+    queryset = model.objects.all()
+    if attended_only:
+        queryset = queryset.filter(attended=True)
+    return queryset
+
+
+def volunteer_total_hours(volunteer, attended_only=True):
+    total = Decimal('0')
+    for model in TIERS:
+        total += (
+            _attendance(model, attended_only)
+            .filter(assignment__volunteer=volunteer)
+            .aggregate(total=Sum('hours'))['total'] or 0
+        )
+    return total
+
+
+def _hours_subquery(model, attended_only):
+    totals = (
+        _attendance(model, attended_only)
+        .filter(assignment__volunteer=OuterRef('pk'))
+        .order_by()
+        .values('assignment__volunteer')
+        .annotate(total=Sum('hours'))
+        .values('total')
+    )
+    return Coalesce(Subquery(totals, output_field=HOURS_FIELD), Value(Decimal('0')), output_field=HOURS_FIELD)
+
+
+def annotate_hours(volunteers, name='total_hours', attended_only=False):
+    """Annotate a CustomUser queryset with hours summed over both tiers.
+
+    Correlated subqueries keep the total filterable and sortable in SQL and avoid
+    the row fan-out of joining both attendance tables at once.
+    """
+    live, archived = (_hours_subquery(model, attended_only) for model in TIERS)
+    return volunteers.annotate(**{name: ExpressionWrapper(live + archived, output_field=HOURS_FIELD)})
+
+
+def attendance_history():
+    """Attendance rows of both tiers as dicts, newest first."""
+    def rows(model):
+        return model.objects.values(
+            'recorded_at', 'attended', 'hours',
+            volunteer_id=F('assignment__volunteer_id'),
+            first_name=F('assignment__volunteer__first_name'),
+            last_name=F('assignment__volunteer__last_name'),
+            activity_title=F('assignment__activity__title'),
+        )
+    return rows(Attendance).union(rows(ArchivedAttendance), all=True).order_by('-recorded_at')
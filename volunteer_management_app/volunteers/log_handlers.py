@@ -0,0 +1,81 @@
+"""Logging handler that moves log I/O off the request thread.
+
+Configured from settings.LOGGING::
+
+    'queue': {
+        '()': 'volunteers.log_handlers.BackgroundQueueHandler',
+        'handlers': ['cfg://handlers.console'],
+    }
+
+Records are queued by the calling thread and written by a QueueListener thread
+to the target handlers. Target handlers must be configured under names that
+sort before the queue handler's name, since dictConfig sets handlers up in
+alphabetical order. When the queue is full, records are dropped and counted
+instead of blocking the request.
+
+The listener thread starts with the first record, not when settings are
+loaded, and again in a forked child: threads do not survive fork(), so a
+pre-fork server (gunicorn --preload) gets one listener per worker.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class BackgroundQueueHandler(QueueHandler):
+    def __init__(self, handlers, queue_size=10000):
+        # Indexing, not iteration, makes dictConfig resolve 'cfg://' references.
+        targets = [handlers[i] for i in range(len(handlers))]
+        for target in targets:
+            if not isinstance(target, logging.Handler):
+                raise ValueError(f'Target handler not configured yet: {target!r}')
+        super().__init__(queue.Queue(queue_size))
+        self.targets = targets
+        self.queue_size = queue_size
+        self.dropped = 0
+        self.listener = None
+        self._pid = None
+        self._stopped = False
+        self._start_lock = threading.Lock()
+
+    def _start_listener(self):
+        with self._start_lock:
+            if self._stopped or self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked: the parent's listener thread is gone and may have left the queue locked.
+                self.queue = queue.Queue(self.queue_size)
+            else:
+                atexit.register(self.stop)
+            self.listener = QueueListener(self.queue, *self.targets, respect_handler_level=True)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Same-process queue: only the message must be fixed now, in case the
+        # arguments change later; formatting and tracebacks are left to the listener.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            self._start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        # Drains what is already queued, then joins the listener thread.
+        with self._start_lock:
+            self._stopped = True
+            if self.listener is not None and self.listener._thread is not None and self._pid == os.getpid():
+                self.listener.stop()
+
+    def close(self):
+        self.stop()
+        super().close()
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from volunteers.archive import archive_activities, archive_cutoff
+
+
+class Command(BaseCommand):
+    help = 'Mueve las actividades antiguas, con sus inscripciones y asistencias, a las tablas de archivo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Antigüedad mínima en días (por defecto ARCHIVE_RETENTION_DAYS).')
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--limit', type=int, default=None, help='Máximo de actividades a archivar en esta ejecución.')
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff(days=options['days'])
+        total = archive_activities(cutoff=cutoff, batch_size=options['batch_size'], limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'{total} actividades archivadas (anteriores a {cutoff:%Y-%m-%d}).'))
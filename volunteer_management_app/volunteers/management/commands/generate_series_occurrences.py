@@ -0,0 +1,25 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from volunteers.models import ActivitySeries
+from volunteers.recurrence import generate_occurrences, horizon_end
+
+
+class Command(BaseCommand):
+    help = 'Genera las actividades de las series recurrentes hasta el horizonte configurado.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Horizonte en días (por defecto SERIES_HORIZON_DAYS).')
+
+    def handle(self, *args, **options):
+        until = horizon_end()
+        if options['days'] is not None:
+            until = timezone.now() + datetime.timedelta(days=options['days'])
+        active = ActivitySeries.objects.filter(Q(until__isnull=True) | Q(until__gte=timezone.localdate()))
+        total = 0
+        for series in active.iterator():
+            total += generate_occurrences(series, until=until)
+        self.stdout.write(self.style.SUCCESS(f'{total} actividades generadas.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from volunteers.certificates import eligible_volunteers, queue_stale_certificates
+
+
+class Command(BaseCommand):
+    help = 'Pone en cola la generación de certificados nuevos o desactualizados (para cron).'
+
+    def handle(self, *args, **options):
+        queued = queue_stale_certificates(eligible_volunteers())
+        self.stdout.write(self.style.SUCCESS(f'{queued} certificados en cola.'))
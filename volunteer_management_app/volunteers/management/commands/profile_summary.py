@@ -0,0 +1,57 @@
+import os
+import pstats
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from volunteers.profiling import categorize, profiling_settings, read_collapsed, write_collapsed
+
+
+class Command(BaseCommand):
+    help = 'Resume los perfiles escritos por ProfilingMiddleware, agrupados por vista.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help='Directorio de perfiles (por defecto PROFILING["DIR"]).')
+        parser.add_argument('--view', action='append', help='Solo estas vistas (se puede repetir).')
+        parser.add_argument('--sort', default='cumulative', choices=['cumulative', 'tottime', 'calls'])
+        parser.add_argument('--limit', type=int, default=15, help='Funciones a mostrar por vista.')
+        parser.add_argument('--flamegraph', metavar='ARCHIVO',
+                            help='Escribe las pilas combinadas de todas las vistas para flamegraph.pl o speedscope.')
+
+    def handle(self, *args, **options):
+        directory = options['dir'] or profiling_settings()['DIR']
+        if not os.path.isdir(directory):
+            raise CommandError(f'No existe el directorio de perfiles {directory}.')
+        views = sorted(
+            name for name in os.listdir(directory)
+            if os.path.isdir(os.path.join(directory, name)) and (not options['view'] or name in options['view'])
+        )
+        combined = Counter()
+        for view in views:
+            combined.update(self.summarize(view, os.path.join(directory, view), options))
+        if not views:
+            self.stdout.write('No hay perfiles.')
+        if options['flamegraph']:
+            write_collapsed(options['flamegraph'], combined)
+            self.stdout.write(self.style.SUCCESS(f"Pilas combinadas escritas en {options['flamegraph']}."))
+
+    def summarize(self, view, path, options):
+        files = sorted(os.listdir(path))
+        profiles = [os.path.join(path, name) for name in files if name.endswith('.prof')]
+        stacks = Counter()
+        for name in files:
+            if name.endswith('.collapsed'):
+                stacks.update(read_collapsed(os.path.join(path, name)))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{view}: {len(profiles)} solicitudes'))
+        samples = sum(stacks.values())
+        if samples:
+            breakdown = ', '.join(
+                f'{category} {count * 100 / samples:.0f}%' for category, count in categorize(stacks).most_common()
+            )
+            self.stdout.write(f'  Muestras: {samples} ({breakdown})')
+        if profiles:
+            stats = pstats.Stats(*profiles, stream=self.stdout)
+            stats.strip_dirs().sort_stats(options['sort']).print_stats(options['limit'])
+        # Rooted at the view name, so one flame graph compares the views side by side.
+        return Counter({f'{view};{stack}': count for stack, count in stacks.items()})
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from volunteers.stats import rebuild_activity_stats
+
+
+class Command(BaseCommand):
+    help = 'Recalcula la tabla de estadísticas por actividad desde Assignment y Attendance.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_activity_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Estadísticas recalculadas para {total} actividades.'))
@@ -0,0 +1,82 @@
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections, connections
+
+from volunteers.jobs import claim_job, default_worker_id, registered_tasks, requeue_stale_jobs, run_job
+
+logger = logging.getLogger(__name__)
+
+# SQLite reports lock contention between workers as an error instead of waiting.
+RETRY_DELAY = 0.05
+
+
+def work(stop, poll_interval, burst):
+    worker_id = default_worker_id()
+    last_requeue = 0.0
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            if time.monotonic() - last_requeue > 60:
+                requeue_stale_jobs()
+                last_requeue = time.monotonic()
+            job = claim_job(worker_id)
+        except OperationalError as e:
+            logger.warning('Job claim failed worker=%s error=%s', worker_id, e)
+            stop.wait(RETRY_DELAY)
+            continue
+        if job is None:
+            if burst:
+                break
+            stop.wait(poll_interval)
+            continue
+        try:
+            run_job(job)
+        except OperationalError as e:
+            # The outcome was not saved; requeue_stale_jobs returns the job to the queue.
+            logger.error('Job %s outcome not saved worker=%s error=%s', job.pk, worker_id, e)
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta trabajos en cola (correos, certificados) con N hilos o procesos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', '-c', type=int, default=2)
+        parser.add_argument('--processes', action='store_true', help='Usar procesos en lugar de hilos.')
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--burst', action='store_true', help='Terminar cuando la cola esté vacía.')
+
+    def handle(self, *args, **options):
+        registered_tasks()
+        if options['processes']:
+            # Children must not inherit the parent's open database connections.
+            connections.close_all()
+            stop = multiprocessing.Event()
+            workers = [
+                multiprocessing.Process(target=work, args=(stop, options['poll_interval'], options['burst']))
+                for _ in range(options['concurrency'])
+            ]
+        else:
+            stop = threading.Event()
+            workers = [
+                threading.Thread(target=work, args=(stop, options['poll_interval'], options['burst']))
+                for _ in range(options['concurrency'])
+            ]
+
+        def shutdown(signum, frame):
+            self.stdout.write('Deteniendo trabajadores...')
+            stop.set()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+        mode = 'procesos' if options['processes'] else 'hilos'
+        self.stdout.write(f"Iniciando {options['concurrency']} {mode}.")
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from volunteers.reminders import parse_window, reminder_windows, send_due_reminders
+
+
+class Command(BaseCommand):
+    help = 'Envía recordatorios de actividades próximas (p. ej. 48h y 2h antes) por lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--windows', help='Ventanas separadas por comas, p. ej. 48h,2h (por defecto ACTIVITY_REMINDER_WINDOWS).')
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--loop', action='store_true', help='Ejecutar como planificador en lugar de una sola vez.')
+        parser.add_argument('--interval', type=int, default=300, help='Segundos entre ejecuciones con --loop.')
+
+    def handle(self, *args, **options):
+        windows = options['windows'].split(',') if options['windows'] else reminder_windows()
+        try:
+            for window in windows:
+                parse_window(window)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        while True:
+            sent = send_due_reminders(windows=windows, batch_size=options['batch_size'])
+            self.stdout.write(f'{sent} recordatorios enviados.')
+            if not options['loop']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
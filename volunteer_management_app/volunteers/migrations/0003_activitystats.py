@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0002_customuser_profile_image_alter_assignment_volunteer_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityStats',
+            fields=[
+                ('activity', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='volunteers.activity')),
+                ('required_volunteers', models.PositiveIntegerField(default=0)),
+                ('assigned_count', models.PositiveIntegerField(default=0)),
+                ('confirmed_count', models.PositiveIntegerField(default=0)),
+                ('cancelled_count', models.PositiveIntegerField(default=0)),
+                ('attendance_count', models.PositiveIntegerField(default=0)),
+                ('attended_count', models.PositiveIntegerField(default=0)),
+                ('fill_rate', models.FloatField(db_index=True, default=0)),
+                ('confirmation_rate', models.FloatField(db_index=True, default=0)),
+                ('attendance_rate', models.FloatField(db_index=True, default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='activity',
+            name='date',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
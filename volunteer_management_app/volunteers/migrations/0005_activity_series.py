@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeriesSubscription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ActivitySeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=255)),
+                ('required_volunteers', models.PositiveIntegerField()),
+                ('profile_needed', models.CharField(blank=True, max_length=255)),
+                ('start', models.DateTimeField()),
+                ('frequency', models.CharField(choices=[('daily', 'Diaria'), ('weekly', 'Semanal'), ('monthly', 'Mensual')], default='weekly', max_length=10)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('weekdays', models.CharField(blank=True, max_length=20)),
+                ('until', models.DateField(blank=True, null=True)),
+                ('exceptions', models.JSONField(blank=True, default=list)),
+                ('generated_until', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(limit_choices_to={'role': 'admin'}, on_delete=django.db.models.deletion.CASCADE, related_name='activity_series', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='volunteers.activityseries'),
+        ),
+        migrations.AddConstraint(
+            model_name='activity',
+            constraint=models.UniqueConstraint(fields=('series', 'date'), name='unique_series_occurrence'),
+        ),
+        migrations.AddField(
+            model_name='seriessubscription',
+            name='series',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subscriptions', to='volunteers.activityseries'),
+        ),
+        migrations.AddField(
+            model_name='seriessubscription',
+            name='volunteer',
+            field=models.ForeignKey(limit_choices_to={'role': 'volunteer'}, on_delete=django.db.models.deletion.CASCADE, related_name='series_subscriptions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='seriessubscription',
+            unique_together={('series', 'volunteer')},
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0006_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=10)),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_deliveries', to='volunteers.assignment')),
+            ],
+            options={
+                'unique_together': {('assignment', 'window')},
+            },
+        ),
+    ]
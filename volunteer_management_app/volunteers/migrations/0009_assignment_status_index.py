@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0008_job_queue'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assignment',
+            name='status',
+            field=models.CharField(choices=[('assigned', 'Assigned'), ('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], db_index=True, default='assigned', max_length=20),
+        ),
+    ]
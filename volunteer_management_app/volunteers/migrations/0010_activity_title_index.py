@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0009_assignment_status_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activity',
+            name='title',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+    ]
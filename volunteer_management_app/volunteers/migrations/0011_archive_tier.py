@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0010_activity_title_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedActivity',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('date', models.DateTimeField(db_index=True)),
+                ('location', models.CharField(max_length=255)),
+                ('required_volunteers', models.PositiveIntegerField()),
+                ('profile_needed', models.CharField(blank=True, max_length=255)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('series', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='volunteers.activityseries')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedAssignment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('assigned_at', models.DateTimeField()),
+                ('status', models.CharField(max_length=20)),
+                ('activity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='volunteers.archivedactivity')),
+                ('volunteer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_assignments', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttendance',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('attended', models.BooleanField(default=False)),
+                ('hours', models.DecimalField(decimal_places=2, default=0, max_digits=4)),
+                ('recorded_at', models.DateTimeField()),
+                ('assignment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='attendance', to='volunteers.archivedassignment')),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0011_archive_tier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurred_at', models.DateTimeField()),
+                ('month', models.PositiveIntegerField()),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Inscripción'), (2, 'Inscripción cancelada'), (3, 'Asistencia registrada'), (4, 'Asistencia modificada'), (5, 'Asistencia eliminada'), (6, 'Notificación'), (7, 'Inicio de sesión'), (8, 'Inicio de sesión fallido')])),
+                ('volunteer_id', models.BigIntegerField(blank=True, null=True)),
+                ('activity_id', models.BigIntegerField(blank=True, null=True)),
+                ('object_id', models.BigIntegerField(blank=True, null=True)),
+                ('data', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['volunteer_id', 'occurred_at'], name='audit_volunteer_time'), models.Index(fields=['month', 'kind'], name='audit_month_kind'), models.Index(fields=['activity_id', 'occurred_at'], name='audit_activity_time')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0012_audit_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='client_uuid',
+            field=models.UUIDField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:19
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_end_date(apps, schema_editor):
+    duration = datetime.timedelta(hours=getattr(settings, 'ACTIVITY_DEFAULT_DURATION_HOURS', 2))
+    for name in ('Activity', 'ArchivedActivity'):
+        apps.get_model('volunteers', name).objects.filter(end_date__isnull=True).update(end_date=F('date') + duration)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0013_attendance_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='end_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedactivity',
+            name='end_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['date', 'end_date'], name='activity_interval'),
+        ),
+        migrations.RunPython(backfill_end_date, migrations.RunPython.noop),
+    ]
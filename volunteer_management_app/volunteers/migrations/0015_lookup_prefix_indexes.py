@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('volunteers', '0014_activity_end_date'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activity',
+            name='title',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='activity_title_lower'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='user_username_lower'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0015_lookup_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedActivityStats',
+            fields=[
+                ('activity', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='volunteers.archivedactivity')),
+                ('required_volunteers', models.PositiveIntegerField(default=0)),
+                ('assigned_count', models.PositiveIntegerField(default=0)),
+                ('confirmed_count', models.PositiveIntegerField(default=0)),
+                ('cancelled_count', models.PositiveIntegerField(default=0)),
+                ('attendance_count', models.PositiveIntegerField(default=0)),
+                ('attended_count', models.PositiveIntegerField(default=0)),
+                ('fill_rate', models.FloatField(default=0)),
+                ('confirmation_rate', models.FloatField(default=0)),
+                ('attendance_rate', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField()),
+            ],
+        ),
+    ]
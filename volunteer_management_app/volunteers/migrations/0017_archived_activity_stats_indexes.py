@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0016_archived_activity_stats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedactivitystats',
+            name='attendance_rate',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AlterField(
+            model_name='archivedactivitystats',
+            name='confirmation_rate',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.AlterField(
+            model_name='archivedactivitystats',
+            name='fill_rate',
+            field=models.FloatField(db_index=True, default=0),
+        ),
+    ]
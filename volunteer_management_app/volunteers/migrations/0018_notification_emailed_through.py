@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0017_archived_activity_stats_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='emailed_through',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('volunteers', '0018_notification_emailed_through'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(condition=models.Q(('attended', True)), fields=['id'], name='attendance_attended_id'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(condition=models.Q(('attended', False)), fields=['id'], name='attendance_absent_id'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['role', 'username'], name='user_role_username'),
+        ),
+    ]
@@ -1,5 +1,10 @@
+import datetime
+
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 class CustomUser(AbstractUser):
     ROLE_CHOICES = [
@@ -13,14 +18,73 @@ class CustomUser(AbstractUser):
     areas_of_interest = models.TextField(blank=True)
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Autocomplete prefix search (see views.lookups.prefix_filter).
+            models.Index(Lower('username'), name='user_username_lower'),
+            # Admin changelist `role` filter, read in its default username order.
+            models.Index(fields=['role', 'username'], name='user_role_username'),
+        ]
+
+class ActivitySeries(models.Model):
+    FREQUENCY_CHOICES = [
+        ('daily', 'Diaria'),
+        ('weekly', 'Semanal'),
+        ('monthly', 'Mensual'),
+    ]
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    location = models.CharField(max_length=255)
+    required_volunteers = models.PositiveIntegerField()
+    profile_needed = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE, limit_choices_to={'role': 'admin'}, related_name='activity_series')
+    start = models.DateTimeField()
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='weekly')
+    interval = models.PositiveSmallIntegerField(default=1)
+    # Comma-separated weekdays (0 = Monday) for weekly series; empty means the weekday of `start`.
+    weekdays = models.CharField(max_length=20, blank=True)
+    until = models.DateField(null=True, blank=True)
+    # ISO dates (YYYY-MM-DD) on which no occurrence is generated.
+    exceptions = models.JSONField(default=list, blank=True)
+    generated_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title
+
+def default_activity_duration():
+    return datetime.timedelta(hours=getattr(settings, 'ACTIVITY_DEFAULT_DURATION_HOURS', 2))
+
 class Activity(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
-    date = models.DateTimeField()
+    date = models.DateTimeField(db_index=True)
+    # Filled from `date` plus the default duration when left empty (see save()).
+    end_date = models.DateTimeField(null=True, blank=True)
     location = models.CharField(max_length=255)
     required_volunteers = models.PositiveIntegerField()
     profile_needed = models.CharField(max_length=255, blank=True)
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE, limit_choices_to={'role': 'admin'})
+    updated_at = models.DateTimeField(auto_now=True)
+    series = models.ForeignKey(ActivitySeries, on_delete=models.SET_NULL, null=True, blank=True, related_name='occurrences')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'date'], name='unique_series_occurrence'),
+        ]
+        indexes = [
+            # Overlap lookups: date < other_end AND end_date > other_start.
+            models.Index(fields=['date', 'end_date'], name='activity_interval'),
+            # Autocomplete prefix search (see views.lookups.prefix_filter).
+            models.Index(Lower('title'), name='activity_title_lower'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.end_date is None and self.date is not None:
+            self.end_date = self.date + default_activity_duration()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'end_date'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -29,22 +93,208 @@ class Assignment(models.Model):
     volunteer = models.ForeignKey(CustomUser, on_delete=models.CASCADE, limit_choices_to={'role': 'volunteer'}, related_name='assignments')
     activity = models.ForeignKey(Activity, on_delete=models.CASCADE)
     assigned_at = models.DateTimeField(auto_now_add=True)
-    status = models.CharField(max_length=20, choices=[('assigned', 'Assigned'), ('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], default='assigned')
+    status = models.CharField(max_length=20, choices=[('assigned', 'Assigned'), ('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], default='assigned', db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('volunteer', 'activity')
 
+class WaitlistEntry(models.Model):
+    activity = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='waitlist')
+    volunteer = models.ForeignKey(CustomUser, on_delete=models.CASCADE, limit_choices_to={'role': 'volunteer'}, related_name='waitlist_entries')
+    position = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('activity', 'volunteer')
+        indexes = [
+            models.Index(fields=['activity', 'position'], name='waitlist_activity_position'),
+        ]
+        ordering = ['activity', 'position']
+
+class SeriesSubscription(models.Model):
+    series = models.ForeignKey(ActivitySeries, on_delete=models.CASCADE, related_name='subscriptions')
+    volunteer = models.ForeignKey(CustomUser, on_delete=models.CASCADE, limit_choices_to={'role': 'volunteer'}, related_name='series_subscriptions')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('series', 'volunteer')
+
 class Attendance(models.Model):
     assignment = models.OneToOneField(Assignment, on_delete=models.CASCADE)
     attended = models.BooleanField(default=False)
     hours = models.DecimalField(max_digits=4, decimal_places=2, default=0)
     recorded_at = models.DateTimeField(auto_now_add=True)
+    # Set by offline check-in devices (volunteers.attendance_sync); a re-sent
+    # record with the same UUID is recognised and not applied twice.
+    client_uuid = models.UUIDField(null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Admin changelist `attended` filter, newest first. Django renders
+            # attended=True/False as a bare `"attended"` / `NOT "attended"`, which
+            # SQLite only matches against partial indexes with that same condition.
+            models.Index(fields=['id'], condition=models.Q(attended=True), name='attendance_attended_id'),
+            models.Index(fields=['id'], condition=models.Q(attended=False), name='attendance_absent_id'),
+        ]
+
+# Archive tier: activities older than ARCHIVE_RETENTION_DAYS are moved here, with
+# their assignments and attendance, by `manage.py archive_activities`. Rows keep
+# their original primary keys. volunteers.ledger reads hours across both tiers.
+class ArchivedActivity(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    date = models.DateTimeField(db_index=True)
+    end_date = models.DateTimeField(null=True, blank=True)
+    location = models.CharField(max_length=255)
+    required_volunteers = models.PositiveIntegerField()
+    profile_needed = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='+')
+    series = models.ForeignKey(ActivitySeries, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title
+
+class ArchivedAssignment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    volunteer = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='archived_assignments')
+    activity = models.ForeignKey(ArchivedActivity, on_delete=models.CASCADE, related_name='assignments')
+    assigned_at = models.DateTimeField()
+    status = models.CharField(max_length=20)
+
+class ArchivedAttendance(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    assignment = models.OneToOneField(ArchivedAssignment, on_delete=models.CASCADE, related_name='attendance')
+    attended = models.BooleanField(default=False)
+    hours = models.DecimalField(max_digits=4, decimal_places=2, default=0)
+    recorded_at = models.DateTimeField()
+
+class ReminderDelivery(models.Model):
+    # Idempotency record: one row per assignment and reminder window, written before sending.
+    assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='reminder_deliveries')
+    window = models.CharField(max_length=10)
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('assignment', 'window')
 
 class Notification(models.Model):
     activity = models.ForeignKey(Activity, on_delete=models.CASCADE)
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     recipients = models.ManyToManyField(CustomUser, limit_choices_to={'role': 'volunteer'})
+    # Highest recipient pk already emailed; a retried send resumes after it.
+    emailed_through = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f'Notification for {self.activity.title} at {self.created_at.strftime("%Y-%m-%d %H:%M")}'
+
+class ActivityStats(models.Model):
+    # Rollup maintained by volunteers.signals; rebuild with `manage.py rebuild_activity_stats`.
+    activity = models.OneToOneField(Activity, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    required_volunteers = models.PositiveIntegerField(default=0)
+    assigned_count = models.PositiveIntegerField(default=0)
+    confirmed_count = models.PositiveIntegerField(default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+    attendance_count = models.PositiveIntegerField(default=0)
+    attended_count = models.PositiveIntegerField(default=0)
+    fill_rate = models.FloatField(default=0, db_index=True)
+    confirmation_rate = models.FloatField(default=0, db_index=True)
+    attendance_rate = models.FloatField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Estadísticas de {self.activity_id}'
+
+class ArchivedActivityStats(models.Model):
+    # ActivityStats as they were when the activity was archived; the report shows them on request.
+    activity = models.OneToOneField(ArchivedActivity, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    required_volunteers = models.PositiveIntegerField(default=0)
+    assigned_count = models.PositiveIntegerField(default=0)
+    confirmed_count = models.PositiveIntegerField(default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+    attendance_count = models.PositiveIntegerField(default=0)
+    attended_count = models.PositiveIntegerField(default=0)
+    fill_rate = models.FloatField(default=0, db_index=True)
+    confirmation_rate = models.FloatField(default=0, db_index=True)
+    attendance_rate = models.FloatField(default=0, db_index=True)
+    updated_at = models.DateTimeField()
+
+class CertificateFile(models.Model):
+    # Rendered PDF kept in the database so web and worker processes share it.
+    volunteer = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name='certificate_file')
+    total_hours = models.DecimalField(max_digits=8, decimal_places=2)
+    pdf = models.BinaryField()
+    rendered_at = models.DateTimeField(auto_now=True)
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pendiente'),
+        ('running', 'En ejecución'),
+        ('done', 'Completado'),
+        ('dead', 'Fallido definitivamente'),
+    ]
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at'),
+        ]
+
+    def __str__(self):
+        return f'{self.task} #{self.pk} ({self.status})'
+
+class AuditEvent(models.Model):
+    # Append-only; written in batches by volunteers.audit. Ids are plain integers
+    # rather than foreign keys so inserts skip constraint checks and events
+    # outlive the rows they describe (deletes, archiving).
+    ENROLLED = 1
+    CANCELLED = 2
+    ATTENDANCE_RECORDED = 3
+    ATTENDANCE_CHANGED = 4
+    ATTENDANCE_DELETED = 5
+    NOTIFIED = 6
+    LOGIN = 7
+    LOGIN_FAILED = 8
+    KIND_CHOICES = [
+        (ENROLLED, 'Inscripción'),
+        (CANCELLED, 'Inscripción cancelada'),
+        (ATTENDANCE_RECORDED, 'Asistencia registrada'),
+        (ATTENDANCE_CHANGED, 'Asistencia modificada'),
+        (ATTENDANCE_DELETED, 'Asistencia eliminada'),
+        (NOTIFIED, 'Notificación'),
+        (LOGIN, 'Inicio de sesión'),
+        (LOGIN_FAILED, 'Inicio de sesión fallido'),
+    ]
+    occurred_at = models.DateTimeField()
+    # YYYYMM; the partition key when the table is range-partitioned by month.
+    month = models.PositiveIntegerField()
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    volunteer_id = models.BigIntegerField(null=True, blank=True)
+    activity_id = models.BigIntegerField(null=True, blank=True)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    data = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['volunteer_id', 'occurred_at'], name='audit_volunteer_time'),
+            models.Index(fields=['month', 'kind'], name='audit_month_kind'),
+            models.Index(fields=['activity_id', 'occurred_at'], name='audit_activity_time'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} ({self.occurred_at:%Y-%m-%d %H:%M})'
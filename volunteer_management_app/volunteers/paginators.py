@@ -0,0 +1,47 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep.
+ESTIMATE_THRESHOLD = 10000
+
+
+def estimated_row_count(model):
+    """Planner statistics for the table's size, or None when the backend has none."""
+    connection = connections[model.objects.db]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            # SQLite keeps no row estimate; the highest primary key is an index lookup away.
+            cursor.execute(f'SELECT MAX({connection.ops.quote_name(model._meta.pk.column)}) FROM {connection.ops.quote_name(table)}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that avoids COUNT(*) on large unfiltered changelists.
+
+    Filtered or searched querysets are still counted exactly, since the estimate
+    only describes the whole table.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_row_count(queryset.model)
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
@@ -0,0 +1,187 @@
+"""Opt-in request profiling.
+
+ProfilingMiddleware profiles a random PROFILING['SAMPLE_RATE'] fraction of
+requests, plus any request from an admin that carries PROFILING['HEADER']. A
+profiled request runs under cProfile while a sampler thread records its stack
+every PROFILING['INTERVAL'] seconds. Each request leaves two files under
+PROFILING['DIR']/<view name>/:
+
+    <stamp>.prof       pstats dump (python -m pstats, snakeviz, ...)
+    <stamp>.collapsed  wall-clock stacks, one "frame;frame;frame count" per
+                       line, the input format of flamegraph.pl and speedscope
+
+`manage.py profile_summary` merges them per view. Only one request per process
+is profiled at a time; the others run normally. With ENABLED false the
+middleware removes itself at startup.
+"""
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 0.0,
+    'HEADER': 'X-Profile',
+    'DIR': 'profiles',
+    'INTERVAL': 0.005,
+}
+# Sampled time is attributed to the innermost frame from one of these modules.
+CATEGORIES = [
+    ('ORM', ('django.db',)),
+    ('Plantillas', ('django.template', 'django.templatetags')),
+    ('ReportLab', ('reportlab',)),
+    ('NumPy', ('numpy',)),
+]
+_UNSAFE_CHARS = re.compile(r'[^\w.-]+')
+
+
+def profiling_settings():
+    return {**DEFAULTS, **getattr(settings, 'PROFILING', {})}
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}"
+
+
+class StackSampler:
+    """Counts the stacks of one thread from a background thread."""
+
+    def __init__(self, thread_id, interval, stop_code=None):
+        self.thread_id = thread_id
+        self.interval = interval
+        # Frames at and above this code object (the middleware) are left out.
+        self.stop_code = stop_code
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None and frame.f_code is not self.stop_code:
+            labels.append(frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            self.stacks[';'.join(reversed(labels))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+def write_collapsed(path, stacks):
+    with open(path, 'w', encoding='utf-8') as handle:
+        for stack, count in stacks.most_common():
+            handle.write(f'{stack} {count}\n')
+
+
+def read_collapsed(path):
+    stacks = Counter()
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+    return stacks
+
+
+def categorize(stacks):
+    """Sample counts per category (ORM, templates, ReportLab, ...) from collapsed stacks."""
+    totals = Counter()
+    for stack, count in stacks.items():
+        category = None
+        for label in reversed(stack.split(';')):
+            module = label.partition(':')[0]
+            category = next(
+                (name for name, prefixes in CATEGORIES if module.startswith(prefixes)), None,
+            )
+            if category is not None:
+                break
+        totals[category or 'Otro'] += count
+    return totals
+
+
+def view_key(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    name = match.view_name or match._func_path
+    return _UNSAFE_CHARS.sub('_', name)
+
+
+class ProfilingMiddleware:
+    """Place after AuthenticationMiddleware so the header can be restricted to admins."""
+
+    def __init__(self, get_response):
+        config = profiling_settings()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config['SAMPLE_RATE']
+        self.header = 'HTTP_' + config['HEADER'].upper().replace('-', '_')
+        self.directory = config['DIR']
+        self.interval = config['INTERVAL']
+        self._busy = threading.Lock()
+        self._sequence = 0
+
+    def should_profile(self, request):
+        if request.META.get(self.header):
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated and (user.is_staff or user.role.lower() == 'admin'):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if not self.should_profile(request) or not self._busy.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self._profile(request)
+        finally:
+            self._busy.release()
+
+    def _profile(self, request):
+        import cProfile
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with StackSampler(threading.get_ident(), self.interval, stop_code=self._profile.__code__) as sampler:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        elapsed = time.perf_counter() - started
+        try:
+            self._write(view_key(request), profiler, sampler.stacks)
+        except OSError as e:
+            logger.error('Profile not written path=%s error=%s', request.path, e)
+        logger.info('Profiled view=%s path=%s elapsed_ms=%.1f samples=%d',
+                    view_key(request), request.path, elapsed * 1000, sum(sampler.stacks.values()))
+        return response
+
+    def _write(self, view, profiler, stacks):
+        directory = os.path.join(self.directory, view)
+        os.makedirs(directory, exist_ok=True)
+        self._sequence += 1
+        stem = os.path.join(directory, f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{self._sequence}')
+        profiler.dump_stats(stem + '.prof')
+        write_collapsed(stem + '.collapsed', stacks)
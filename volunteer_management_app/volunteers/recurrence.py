@@ -0,0 +1,149 @@
+import calendar
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import audit
+from .models import Activity, Assignment, AuditEvent, SeriesSubscription, WaitlistEntry, default_activity_duration
+from .stats import refresh_activity_stats
+from .waitlist import enroll_many, schedule_promotion
+
+
+def horizon_end():
+    return timezone.now() + datetime.timedelta(days=getattr(settings, 'SERIES_HORIZON_DAYS', 90))
+
+
+def _weekdays(series, first):
+    if series.weekdays:
+        return sorted({int(day) for day in series.weekdays.split(',') if day.strip()})
+    return [first.weekday()]
+
+
+def _add_months(value, months):
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    if value.day > calendar.monthrange(year, month)[1]:
+        return None
+    return value.replace(year=year, month=month)
+
+
+def _iter_local(series, first):
+    """Yield naive local datetimes of the rule, starting at `first`, in order."""
+    step = max(series.interval, 1)
+    if series.frequency == 'daily':
+        k = 0
+        while True:
+            yield first + datetime.timedelta(days=k * step)
+            k += 1
+    elif series.frequency == 'weekly':
+        days = _weekdays(series, first)
+        week = first - datetime.timedelta(days=first.weekday())
+        while True:
+            for day in days:
+                candidate = week + datetime.timedelta(days=day)
+                if candidate >= first:
+                    yield candidate
+            week += datetime.timedelta(weeks=step)
+    else:
+        k = 0
+        while True:
+            candidate = _add_months(first, k * step)
+            if candidate is not None:
+                yield candidate
+            k += 1
+
+
+def iter_occurrences(series, start, end):
+    """Aware datetimes of `series` falling in [start, end), minus its exceptions."""
+    tz = timezone.get_current_timezone()
+    first = timezone.localtime(series.start, tz).replace(tzinfo=None)
+    skipped = set(series.exceptions or [])
+    for local in _iter_local(series, first):
+        if series.until and local.date() > series.until:
+            return
+        occurrence = timezone.make_aware(local, tz)
+        if occurrence >= end:
+            return
+        if occurrence >= start and local.date().isoformat() not in skipped:
+            yield occurrence
+
+
+@transaction.atomic
+def generate_occurrences(series, until=None):
+    """Materialize occurrences up to `until` and enroll the series subscribers.
+
+    Idempotent: the (series, date) constraint makes re-runs skip existing rows.
+    Runs a constant number of queries regardless of how many occurrences are created.
+    """
+    until = until or horizon_end()
+    start = series.generated_until or series.start
+    if start >= until:
+        return 0
+    dates = list(iter_occurrences(series, start, until))
+    duration = default_activity_duration()
+    Activity.objects.bulk_create(
+        [Activity(
+            title=series.title,
+            description=series.description,
+            date=date,
+            end_date=date + duration,
+            location=series.location,
+            required_volunteers=series.required_volunteers,
+            profile_needed=series.profile_needed,
+            created_by_id=series.created_by_id,
+            series=series,
+        ) for date in dates],
+        ignore_conflicts=True,
+        batch_size=500,
+    )
+    activity_ids = list(
+        Activity.objects.filter(series=series, date__gte=start, date__lt=until).values_list('id', flat=True)
+    )
+    # Earliest subscribers get the seats; the rest wait in line per occurrence.
+    volunteer_ids = list(series.subscriptions.order_by('created_at', 'id').values_list('volunteer_id', flat=True))
+    if volunteer_ids:
+        enroll_many(activity_ids, volunteer_ids)
+    # bulk_create bypasses the post_save handlers that keep ActivityStats current.
+    refresh_activity_stats(activity_ids)
+    series.generated_until = until
+    series.save(update_fields=['generated_until'])
+    return len(dates)
+
+
+@transaction.atomic
+def subscribe(series, volunteer):
+    """Subscribe a volunteer to every upcoming occurrence.
+
+    Returns (subscription, created, enrollment); full occurrences put the
+    volunteer on their waitlist (see waitlist.enroll_many).
+    """
+    subscription, created = SeriesSubscription.objects.get_or_create(series=series, volunteer=volunteer)
+    activity_ids = list(
+        series.occurrences.filter(date__gte=timezone.now()).values_list('id', flat=True)
+    )
+    enrollment = enroll_many(activity_ids, [volunteer.id])
+    refresh_activity_stats(activity_ids)
+    return subscription, created, enrollment
+
+
+@transaction.atomic
+def unsubscribe(series, volunteer):
+    """Drop the subscription and cancel the volunteer's upcoming occurrences."""
+    SeriesSubscription.objects.filter(series=series, volunteer=volunteer).delete()
+    upcoming = Assignment.objects.filter(
+        volunteer=volunteer, activity__series=series, activity__date__gte=timezone.now(),
+    ).exclude(status='cancelled')
+    cancelled = list(upcoming.values_list('pk', 'activity_id'))
+    activity_ids = [activity_id for _, activity_id in cancelled]
+    Assignment.objects.filter(pk__in=[pk for pk, _ in cancelled]).update(status='cancelled', updated_at=timezone.now())
+    # update() skips the post_save handler that audits cancellations.
+    for pk, activity_id in cancelled:
+        audit.record(AuditEvent.CANCELLED, volunteer_id=volunteer.id, activity_id=activity_id, object_id=pk)
+    WaitlistEntry.objects.filter(
+        volunteer=volunteer, activity__series=series, activity__date__gte=timezone.now(),
+    ).delete()
+    refresh_activity_stats(activity_ids)
+    for activity_id in activity_ids:
+        schedule_promotion(activity_id)
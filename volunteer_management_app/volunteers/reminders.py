@@ -0,0 +1,92 @@
+import datetime
+import logging
+import re
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import Assignment, ReminderDelivery
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REMINDER_WINDOWS = ['48h', '2h']
+_WINDOW_RE = re.compile(r'^(\d+)([mhd])$')
+_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+
+
+def parse_window(value):
+    match = _WINDOW_RE.match(value.strip())
+    if not match:
+        raise ValueError(f'Ventana inválida: {value!r} (use p. ej. 30m, 2h, 2d)')
+    return datetime.timedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def reminder_windows():
+    return getattr(settings, 'ACTIVITY_REMINDER_WINDOWS', DEFAULT_REMINDER_WINDOWS)
+
+
+def _reminder_message(assignment, connection):
+    activity = assignment.activity
+    when = timezone.localtime(activity.date).strftime('%Y-%m-%d %H:%M')
+    return EmailMessage(
+        f'Recordatorio: {activity.title}',
+        f'Hola {assignment.volunteer.get_full_name() or assignment.volunteer.username}, '
+        f'te recordamos que {activity.title} comienza el {when} en {activity.location}.',
+        'noreply@example.com',
+        [assignment.volunteer.email],
+        connection=connection,
+    )
+
+
+def send_due_reminders(windows=None, batch_size=200, now=None):
+    """Send reminders for activities starting within each window; returns messages sent.
+
+    Windows form bands: with 48h and 2h, an activity 30 hours away gets the 48h
+    reminder and one 1 hour away only the 2h reminder. Delivery rows are written
+    before each batch goes out, so a restarted scheduler never sends twice.
+    """
+    now = now or timezone.now()
+    bands = sorted((parse_window(label), label) for label in (windows or reminder_windows()))
+    sent = 0
+    connection = get_connection()
+    connection.open()
+    try:
+        lower = now
+        for span, label in bands:
+            upper = now + span
+            # Range scan on the Activity.date index.
+            pending = (
+                Assignment.objects
+                .filter(activity__date__gt=lower, activity__date__lte=upper)
+                .exclude(status='cancelled')
+                .exclude(volunteer__email='')
+                .exclude(reminder_deliveries__window=label)
+                .select_related('volunteer', 'activity')
+                .order_by('activity__date', 'id')
+            )
+            batch = []
+            for assignment in pending.iterator(chunk_size=batch_size):
+                batch.append(assignment)
+                if len(batch) >= batch_size:
+                    sent += _send_batch(batch, label, connection)
+                    batch = []
+            if batch:
+                sent += _send_batch(batch, label, connection)
+            lower = upper
+    finally:
+        connection.close()
+    return sent
+
+
+def _send_batch(assignments, label, connection):
+    ReminderDelivery.objects.bulk_create(
+        [ReminderDelivery(assignment=assignment, window=label) for assignment in assignments],
+        ignore_conflicts=True,
+    )
+    messages = [_reminder_message(assignment, connection) for assignment in assignments]
+    try:
+        return connection.send_messages(messages) or 0
+    except Exception as e:
+        logger.error('Error sending %s reminder batch of %d: %s', label, len(messages), e)
+        return 0
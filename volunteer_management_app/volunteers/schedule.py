@@ -0,0 +1,120 @@
+"""Overlap checks between a volunteer's assignments.
+
+Two activities overlap when each starts before the other ends (touching
+intervals do not). Enrollment asks the database for the volunteer's
+assignments in the new activity's window, using the (date, end_date) index;
+the admin report finds every overlap in one pass over the assignments sorted
+by volunteer and start time. Bulk enrollment loads a Timetable of the
+volunteers' bookings once and checks each activity against it in memory.
+"""
+import bisect
+import datetime
+import heapq
+from collections import defaultdict
+
+from django.db.models import Q
+
+from .models import Assignment, default_activity_duration
+
+
+def activity_end(activity):
+    return activity.end_date or activity.date + default_activity_duration()
+
+
+def overlapping_assignments(volunteer, start, end, exclude_activity_id=None):
+    """Active assignments of `volunteer` whose activity overlaps [start, end)."""
+    assignments = (
+        Assignment.objects.filter(volunteer=volunteer, activity__date__lt=end)
+        .filter(
+            Q(activity__end_date__gt=start)
+            # Rows written with bulk_create may not have an end yet.
+            | Q(activity__end_date__isnull=True, activity__date__gt=start - default_activity_duration())
+        )
+        .exclude(status='cancelled')
+        .select_related('activity')
+    )
+    if exclude_activity_id is not None:
+        assignments = assignments.exclude(activity_id=exclude_activity_id)
+    return assignments.order_by('activity__date')
+
+
+class Timetable:
+    """Booked intervals per volunteer, for checking many enrollments at once."""
+
+    def __init__(self):
+        self._starts = defaultdict(list)
+        self._slots = defaultdict(list)
+        self._longest = datetime.timedelta(0)
+
+    def add(self, volunteer_id, activity_id, start, end):
+        starts = self._starts[volunteer_id]
+        position = bisect.bisect_right(starts, start)
+        starts.insert(position, start)
+        self._slots[volunteer_id].insert(position, (start, end, activity_id))
+        self._longest = max(self._longest, end - start)
+
+    def clash(self, volunteer_id, start, end, exclude_activity_id=None):
+        """Id of a booked activity overlapping [start, end), or None."""
+        starts = self._starts.get(volunteer_id)
+        if not starts:
+            return None
+        # Only bookings starting in (start - longest, end) can reach into the interval.
+        first = bisect.bisect_right(starts, start - self._longest)
+        for slot_start, slot_end, activity_id in self._slots[volunteer_id][first:bisect.bisect_left(starts, end)]:
+            if slot_end > start and activity_id != exclude_activity_id:
+                return activity_id
+        return None
+
+
+def load_timetable(volunteer_ids, start, end):
+    """Timetable of the volunteers' active assignments overlapping [start, end)."""
+    timetable = Timetable()
+    duration = default_activity_duration()
+    rows = (
+        Assignment.objects.filter(volunteer_id__in=volunteer_ids, activity__date__lt=end)
+        .filter(
+            Q(activity__end_date__gt=start)
+            | Q(activity__end_date__isnull=True, activity__date__gt=start - duration)
+        )
+        .exclude(status='cancelled')
+        .values_list('volunteer_id', 'activity_id', 'activity__date', 'activity__end_date')
+    )
+    for volunteer_id, activity_id, activity_start, activity_stop in rows.iterator(chunk_size=2000):
+        timetable.add(volunteer_id, activity_id, activity_start, activity_stop or activity_start + duration)
+    return timetable
+
+
+def find_conflicts(since=None):
+    """Pairs of active assignments of the same volunteer that overlap.
+
+    Returns a list of (first, second) Assignment pairs, with `first` starting
+    no later than `second`. Assignments are read once, ordered by volunteer and
+    start; for each volunteer a heap keyed by end time holds the activities
+    still running, so the sweep costs O(n log n + k) for k conflicts instead of
+    comparing every pair.
+    """
+    assignments = (
+        Assignment.objects.exclude(status='cancelled')
+        .select_related('activity', 'volunteer')
+        .order_by('volunteer_id', 'activity__date', 'id')
+    )
+    if since is not None:
+        assignments = assignments.filter(
+            Q(activity__end_date__gt=since)
+            | Q(activity__end_date__isnull=True, activity__date__gt=since - default_activity_duration())
+        )
+
+    conflicts = []
+    volunteer_id = None
+    running = []
+    for assignment in assignments.iterator(chunk_size=2000):
+        if assignment.volunteer_id != volunteer_id:
+            volunteer_id = assignment.volunteer_id
+            running = []
+        start = assignment.activity.date
+        while running and running[0][0] <= start:
+            heapq.heappop(running)
+        for _, _, other in running:
+            conflicts.append((other, assignment))
+        heapq.heappush(running, (activity_end(assignment.activity), assignment.id, assignment))
+    return conflicts
@@ -0,0 +1,280 @@
+"""Audience segments for notifications.
+
+A segment is a boolean expression over volunteer attributes, for example
+
+    interest:ambiente AND attended:90 AND NOT upcoming
+
+Terms:
+    interest:<word>   the word appears in areas_of_interest (accents and case ignored)
+    attended:<days>   attended an activity in the last <days> days
+    upcoming          has an active assignment in an activity that has not started
+    activity:<id>     has an active assignment in that activity
+    all               every active volunteer
+
+Operators are AND, OR, NOT (in that order of precedence, NOT binding tightest)
+and parentheses.
+
+Expressions are evaluated against a per-process SegmentIndex, built with a few
+queries and kept for SEGMENT_INDEX_TTL seconds. Each volunteer gets a position;
+a set of volunteers is a Python int used as a bitset, so AND/OR/NOT are single
+big-integer operations, and NumPy (imported on use) packs and unpacks the bits.
+"""
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import ArchivedAttendance, Assignment, Attendance, CustomUser
+
+TERMS = ('interest', 'attended', 'upcoming', 'activity', 'all')
+MAX_EXPRESSION_LENGTH = 500
+_TOKEN_RE = re.compile(r'\(|\)|[^\s()]+')
+_WORD_RE = re.compile(r'\w{3,}')
+
+
+class SegmentError(Exception):
+    pass
+
+
+def normalize_word(word):
+    decomposed = unicodedata.normalize('NFKD', word.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def interest_words(text):
+    return set(_WORD_RE.findall(normalize_word(text or '')))
+
+
+# -- Parsing ----------------------------------------------------------------
+
+def _parse_term(token):
+    name, _, arg = token.partition(':')
+    name = name.lower()
+    if name not in TERMS:
+        raise SegmentError(f'Término desconocido: {token}.')
+    if name in ('upcoming', 'all'):
+        if arg:
+            raise SegmentError(f'{name} no lleva argumento.')
+        return ('term', name, None)
+    if name == 'interest':
+        words = _WORD_RE.findall(normalize_word(arg))
+        if len(words) != 1 or words[0] != normalize_word(arg):
+            raise SegmentError(f'interest necesita una palabra de al menos 3 letras: {token}.')
+        return ('term', name, words[0])
+    if not arg.isdigit():
+        raise SegmentError(f'{name} necesita un número: {token}.')
+    return ('term', name, int(arg))
+
+
+def parse(expression):
+    """Parse a segment expression into a tree of tuples; raises SegmentError."""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise SegmentError('La expresión es demasiado larga.')
+    tokens = _TOKEN_RE.findall(expression)
+    if not tokens:
+        raise SegmentError('La expresión está vacía.')
+    position = 0
+
+    def peek():
+        return tokens[position].upper() if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        node = parse_and()
+        while peek() == 'OR':
+            take()
+            node = ('or', node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() == 'AND':
+            take()
+            node = ('and', node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == 'NOT':
+            take()
+            return ('not', parse_not())
+        if peek() == '(':
+            take()
+            node = parse_or()
+            if peek() != ')':
+                raise SegmentError('Falta cerrar un paréntesis.')
+            take()
+            return node
+        if peek() in (None, ')', 'AND', 'OR'):
+            raise SegmentError('Falta un término.')
+        return _parse_term(take())
+
+    tree = parse_or()
+    if position != len(tokens):
+        raise SegmentError(f'Sobra texto a partir de: {tokens[position]}.')
+    return tree
+
+
+# -- Bitsets ----------------------------------------------------------------
+
+def _bits_from_mask(mask):
+    import numpy as np
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+def _bits_from_positions(positions, size):
+    import numpy as np
+    mask = np.zeros(size, dtype=bool)
+    mask[positions] = True
+    return _bits_from_mask(mask)
+
+
+class SegmentIndex:
+    """Volunteer attributes laid out by position, ready for set algebra.
+
+    `volunteers` is a list of (id, areas_of_interest) sorted by id;
+    `last_attended` maps volunteer id to the epoch seconds of the latest
+    attended activity, and `upcoming_ids` lists volunteers with an upcoming
+    assignment. build_index() reads all of them from the database.
+    """
+
+    def __init__(self, volunteers, last_attended, upcoming_ids, built_at):
+        import numpy as np
+
+        self.built_at = built_at
+        self.size = len(volunteers)
+        self.ids = np.fromiter((pk for pk, _ in volunteers), dtype=np.int64, count=self.size)
+        self.all = (1 << self.size) - 1
+
+        # Positions per interest word; turned into bitsets the first time a word is asked for.
+        words = defaultdict(list)
+        for position, (_, text) in enumerate(volunteers):
+            for word in interest_words(text):
+                words[word].append(position)
+        self._interest_positions = {word: np.array(positions, dtype=np.int64) for word, positions in words.items()}
+
+        # 0 marks volunteers who never attended.
+        self.last_attended = np.zeros(self.size, dtype=np.int64)
+        positions, found = self.positions(list(last_attended))
+        self.last_attended[positions] = np.fromiter(last_attended.values(), dtype=np.int64, count=len(last_attended))[found]
+
+        self.upcoming = _bits_from_positions(self.positions(upcoming_ids)[0], self.size)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def positions(self, volunteer_ids):
+        """Positions of the given ids that are in the index, and the mask of those found."""
+        import numpy as np
+        ids = np.asarray(volunteer_ids, dtype=np.int64)
+        positions = np.searchsorted(self.ids, ids)
+        found = positions < self.size
+        found[found] = self.ids[positions[found]] == ids[found]
+        return positions[found], found
+
+    def term(self, name, arg):
+        if name == 'all':
+            return self.all
+        if name == 'upcoming':
+            return self.upcoming
+        if name == 'activity':
+            # Not cached: rosters change while the index is alive.
+            volunteer_ids = list(
+                Assignment.objects.filter(activity_id=arg).exclude(status='cancelled').values_list('volunteer_id', flat=True)
+            )
+            return _bits_from_positions(self.positions(volunteer_ids)[0], self.size)
+        key = (name, arg)
+        with self._lock:
+            bits = self._cache.get(key)
+        if bits is None:
+            if name == 'interest':
+                positions = self._interest_positions.get(arg)
+                bits = 0 if positions is None else _bits_from_positions(positions, self.size)
+            else:
+                since = int(self.built_at.timestamp()) - arg * 86400
+                bits = _bits_from_mask(self.last_attended >= max(since, 1))
+            with self._lock:
+                self._cache[key] = bits
+        return bits
+
+    def evaluate(self, tree):
+        kind = tree[0]
+        if kind == 'term':
+            return self.term(tree[1], tree[2])
+        if kind == 'not':
+            return self.all & ~self.evaluate(tree[1])
+        left, right = self.evaluate(tree[1]), self.evaluate(tree[2])
+        return left & right if kind == 'and' else left | right
+
+    def volunteer_ids(self, bits):
+        """Volunteer ids of a bitset, in ascending order."""
+        import numpy as np
+        if not bits:
+            return []
+        packed = np.frombuffer(bits.to_bytes((self.size + 7) // 8, 'little'), dtype=np.uint8)
+        positions = np.flatnonzero(np.unpackbits(packed, bitorder='little', count=self.size))
+        return self.ids[positions].tolist()
+
+
+def build_index(now=None):
+    now = now or timezone.now()
+    volunteers = list(
+        CustomUser.objects.filter(role__iexact='volunteer', is_active=True)
+        .order_by('pk').values_list('pk', 'areas_of_interest')
+    )
+    last_attended = {}
+    for model in (Attendance, ArchivedAttendance):
+        rows = (
+            model.objects.filter(attended=True)
+            .values_list('assignment__volunteer_id')
+            .annotate(last=Max('assignment__activity__date'))
+        )
+        for volunteer_id, last in rows.iterator(chunk_size=10000):
+            last_attended[volunteer_id] = max(last_attended.get(volunteer_id, 0), int(last.timestamp()))
+    upcoming_ids = list(
+        Assignment.objects.exclude(status='cancelled')
+        .filter(activity__date__gte=now)
+        .values_list('volunteer_id', flat=True).distinct()
+    )
+    return SegmentIndex(volunteers, last_attended, upcoming_ids, now)
+
+
+_index = None
+_index_built = 0.0
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index, _index_built
+    ttl = getattr(settings, 'SEGMENT_INDEX_TTL', 300)
+    with _index_lock:
+        if _index is None or time.monotonic() - _index_built > ttl:
+            _index = build_index()
+            _index_built = time.monotonic()
+        return _index
+
+
+def reset_index():
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def volunteer_ids(expression, index=None):
+    """Ids of the active volunteers matching `expression`."""
+    tree = parse(expression)
+    index = index or get_index()
+    return index.volunteer_ids(index.evaluate(tree))
+
+
+def add_recipients(notification, volunteer_ids, chunk_size=1000):
+    """Attach recipients in chunks; each chunk is one lookup and one bulk insert."""
+    for start in range(0, len(volunteer_ids), chunk_size):
+        notification.recipients.add(*volunteer_ids[start:start + chunk_size])
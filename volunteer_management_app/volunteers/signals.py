@@ -0,0 +1,117 @@
+from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.core.signals import request_finished
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import audit
+from .analytics import invalidate_hours_cache
+from .models import Activity, Assignment, Attendance, AuditEvent, Notification
+from .stats import refresh_activity_stats
+from .waitlist import schedule_promotion
+
+
+def _deleted_with(origin, model):
+    # post_delete also fires for rows removed by a cascade; the parent handles those.
+    return isinstance(origin, model) or getattr(origin, 'model', None) is model
+
+
+@receiver(post_save, sender=Activity)
+def activity_saved(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        refresh_activity_stats([instance.pk])
+        invalidate_hours_cache()
+        # required_volunteers may have grown.
+        if not created and instance.waitlist.exists():
+            schedule_promotion(instance.pk)
+
+
+@receiver(pre_save, sender=Assignment)
+def assignment_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    # The stored row, so post_save acts on transitions rather than on every save.
+    if raw or instance._state.adding or (
+        update_fields is not None and not {'status', 'volunteer', 'activity'} & set(update_fields)
+    ):
+        instance._previous_status = instance.status
+        instance._previous_owner = (instance.volunteer_id, instance.activity_id)
+    else:
+        previous = sender.objects.filter(pk=instance.pk).values_list('status', 'volunteer_id', 'activity_id').first()
+        instance._previous_status, instance._previous_owner = (previous[0], previous[1:]) if previous else (None, None)
+
+
+@receiver(post_save, sender=Assignment)
+def assignment_saved(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        refresh_activity_stats([instance.activity_id])
+        previous = None if created else getattr(instance, '_previous_status', None)
+        was_active = previous is not None and previous != 'cancelled'
+        is_active = instance.status != 'cancelled'
+        if not is_active and (created or was_active):
+            schedule_promotion(instance.activity_id)
+        if (created or previous is not None) and is_active != was_active:
+            audit.record(
+                AuditEvent.ENROLLED if is_active else AuditEvent.CANCELLED,
+                volunteer_id=instance.volunteer_id, activity_id=instance.activity_id, object_id=instance.pk,
+            )
+        previous_owner = getattr(instance, '_previous_owner', None)
+        if not created and previous_owner not in (None, (instance.volunteer_id, instance.activity_id)):
+            # Its attendance now counts for another volunteer or activity.
+            invalidate_hours_cache()
+
+
+@receiver(post_delete, sender=Assignment)
+def assignment_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleted_with(origin, Activity):
+        refresh_activity_stats([instance.activity_id])
+        schedule_promotion(instance.activity_id)
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, created=False, raw=False, **kwargs):
+    # Fixtures (raw saves) change the hours too.
+    invalidate_hours_cache()
+    if not raw:
+        refresh_activity_stats([instance.assignment.activity_id])
+        audit.record(
+            AuditEvent.ATTENDANCE_RECORDED if created else AuditEvent.ATTENDANCE_CHANGED,
+            volunteer_id=instance.assignment.volunteer_id, activity_id=instance.assignment.activity_id,
+            object_id=instance.pk, attended=instance.attended, hours=str(instance.hours),
+        )
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_deleted(sender, instance, origin=None, **kwargs):
+    invalidate_hours_cache()
+    if not (_deleted_with(origin, Activity) or _deleted_with(origin, Assignment)):
+        refresh_activity_stats([instance.assignment.activity_id])
+        audit.record(
+            AuditEvent.ATTENDANCE_DELETED,
+            volunteer_id=instance.assignment.volunteer_id, activity_id=instance.assignment.activity_id,
+            object_id=instance.pk,
+        )
+
+
+@receiver(m2m_changed, sender=Notification.recipients.through)
+def notification_recipients_added(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add' and not reverse:
+        for volunteer_id in pk_set:
+            audit.record(AuditEvent.NOTIFIED, volunteer_id=volunteer_id,
+                         activity_id=instance.activity_id, object_id=instance.pk)
+
+
+def _client_ip(request):
+    return request.META.get('REMOTE_ADDR', '') if request is not None else ''
+
+
+@receiver(user_logged_in)
+def login_succeeded(sender, request, user, **kwargs):
+    audit.record(AuditEvent.LOGIN, volunteer_id=user.pk, ip=_client_ip(request))
+
+
+@receiver(user_login_failed)
+def login_failed(sender, credentials, request=None, **kwargs):
+    audit.record(AuditEvent.LOGIN_FAILED, username=credentials.get('username', ''), ip=_client_ip(request))
+
+
+@receiver(request_finished)
+def flush_audit_events(sender, **kwargs):
+    audit.get_buffer().flush_if_due()
@@ -0,0 +1,55 @@
+(function () {
+  'use strict';
+
+  function setup(select) {
+    var url = select.dataset.autocompleteUrl;
+    var search = document.createElement('input');
+    search.type = 'search';
+    search.className = 'form-control mb-1';
+    search.placeholder = select.dataset.placeholder || '';
+    select.parentNode.insertBefore(search, select);
+
+    var more = document.createElement('button');
+    more.type = 'button';
+    more.className = 'btn btn-link btn-sm p-0';
+    more.textContent = 'Más resultados';
+    more.hidden = true;
+    select.parentNode.insertBefore(more, select.nextSibling);
+
+    var page = 1;
+    var timer = null;
+
+    function load(append) {
+      var query = new URLSearchParams({q: search.value, page: page});
+      fetch(url + '?' + query, {credentials: 'same-origin'})
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+          if (!append) {
+            Array.prototype.slice.call(select.options).forEach(function (option) {
+              if (!option.selected && option.value !== '') { option.remove(); }
+            });
+          }
+          data.results.forEach(function (item) {
+            if (!select.querySelector('option[value="' + item.id + '"]')) {
+              select.add(new Option(item.text, item.id));
+            }
+          });
+          more.hidden = !data.more;
+        });
+    }
+
+    search.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () { page = 1; load(false); }, 250);
+    });
+    more.addEventListener('click', function () { page += 1; load(true); });
+    select.addEventListener('focus', function onFocus() {
+      select.removeEventListener('focus', onFocus);
+      load(false);
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('select[data-autocomplete-url]').forEach(setup);
+  });
+})();
@@ -0,0 +1,42 @@
+(function () {
+  'use strict';
+
+  var form = document.getElementById('kiosk-form');
+  if (!form) { return; }
+  var input = form.elements.code;
+  var status = document.getElementById('kiosk-status');
+  var count = document.getElementById('kiosk-count');
+  var admitted = 0;
+
+  function show(kind, text) {
+    status.className = 'alert mt-3 alert-' + kind;
+    status.textContent = text;
+  }
+
+  // Hardware scanners type the code and press Enter.
+  form.addEventListener('submit', function (event) {
+    event.preventDefault();
+    var code = input.value.trim();
+    input.value = '';
+    if (!code) { return; }
+    fetch(form.dataset.scanUrl, {
+      method: 'POST',
+      headers: {'X-Kiosk-Token': form.dataset.kioskToken},
+      body: new URLSearchParams({code: code})
+    })
+      .then(function (response) { return response.json(); })
+      .then(function (data) {
+        if (data.error) {
+          show('danger', data.error);
+        } else if (data.status === 'duplicate') {
+          show('info', 'Ya registrado.');
+        } else {
+          admitted += 1;
+          count.textContent = admitted;
+          show('success', 'Bienvenido. Asistencia registrada.');
+        }
+      })
+      .catch(function () { show('warning', 'Sin conexión. Intente de nuevo.'); });
+    input.focus();
+  });
+}());
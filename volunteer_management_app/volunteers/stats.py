@@ -0,0 +1,78 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Activity, ActivityStats, Assignment
+
+STATS_FIELDS = [
+    'required_volunteers', 'assigned_count', 'confirmed_count', 'cancelled_count',
+    'attendance_count', 'attended_count', 'fill_rate', 'confirmation_rate',
+    'attendance_rate', 'updated_at',
+]
+
+
+def _rate(numerator, denominator):
+    return numerator / denominator if denominator else 0.0
+
+
+def refresh_activity_stats(activity_ids):
+    """Recompute the rollup rows for the given activities with one grouped query."""
+    activity_ids = set(activity_ids)
+    if not activity_ids:
+        return 0
+    required = dict(
+        Activity.objects.filter(id__in=activity_ids).values_list('id', 'required_volunteers')
+    )
+    if not required:
+        return 0
+    counts = {
+        row['activity_id']: row
+        for row in Assignment.objects.filter(activity_id__in=required.keys())
+        .values('activity_id')
+        .annotate(
+            assigned=Count('id', filter=~Q(status='cancelled')),
+            confirmed=Count('id', filter=Q(status='confirmed')),
+            cancelled=Count('id', filter=Q(status='cancelled')),
+            recorded=Count('attendance'),
+            attended=Count('attendance', filter=Q(attendance__attended=True)),
+        )
+    }
+    now = timezone.now()
+    rows = []
+    for activity_id, required_volunteers in required.items():
+        row = counts.get(activity_id, {})
+        assigned = row.get('assigned', 0)
+        confirmed = row.get('confirmed', 0)
+        recorded = row.get('recorded', 0)
+        attended = row.get('attended', 0)
+        rows.append(ActivityStats(
+            activity_id=activity_id,
+            required_volunteers=required_volunteers,
+            assigned_count=assigned,
+            confirmed_count=confirmed,
+            cancelled_count=row.get('cancelled', 0),
+            attendance_count=recorded,
+            attended_count=attended,
+            fill_rate=_rate(assigned, required_volunteers),
+            confirmation_rate=_rate(confirmed, assigned),
+            attendance_rate=_rate(attended, recorded),
+            updated_at=now,
+        ))
+    ActivityStats.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['activity'], update_fields=STATS_FIELDS,
+    )
+    return len(rows)
+
+
+def rebuild_activity_stats(batch_size=1000):
+    """Recompute every rollup row, walking activities in primary-key batches."""
+    total = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Activity.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        total += refresh_activity_stats(ids)
+        last_id = ids[-1]
+    return total
@@ -0,0 +1,30 @@
+"""Job handlers run by `manage.py runworker` (see volunteers.jobs)."""
+from django.core.mail import send_mail
+
+from . import waitlist
+from .certificates import store_certificate
+from .emails import send_notification
+from .jobs import task
+from .ledger import volunteer_total_hours
+from .models import CustomUser, Notification
+
+
+@task('send_email')
+def send_email(subject, message, recipient_list, from_email='noreply@example.com'):
+    send_mail(subject, message, from_email, recipient_list)
+
+
+@task('send_notification_emails')
+def send_notification_emails(notification_id):
+    send_notification(Notification.objects.select_related('activity').get(pk=notification_id))
+
+
+@task('render_certificate')
+def render_certificate(volunteer_id):
+    volunteer = CustomUser.objects.get(pk=volunteer_id)
+    store_certificate(volunteer, volunteer_total_hours(volunteer))
+
+
+@task('promote_waitlist')
+def promote_waitlist(activity_id):
+    waitlist.promote_waitlist([activity_id])
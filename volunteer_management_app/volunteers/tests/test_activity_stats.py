@@ -0,0 +1,73 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from volunteers.models import Activity, ActivityStats, Assignment, Attendance
+from django.utils import timezone
+import datetime
+import io
+from unittest import mock
+
+User = get_user_model()
+
+class ActivityStatsTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteers = [
+            User.objects.create_user(username=f'vol{i}', password='volpass', role='volunteer')
+            for i in range(3)
+        ]
+        self.activity = Activity.objects.create(
+            title='Reforestación',
+            description='Sembrar árboles',
+            date=timezone.now() + datetime.timedelta(days=3),
+            location='Parque',
+            required_volunteers=4,
+            created_by=self.admin
+        )
+
+    def test_stats_follow_assignments_and_attendance(self):
+        a1 = Assignment.objects.create(volunteer=self.volunteers[0], activity=self.activity, status='confirmed')
+        a2 = Assignment.objects.create(volunteer=self.volunteers[1], activity=self.activity)
+        Assignment.objects.create(volunteer=self.volunteers[2], activity=self.activity, status='cancelled')
+        Attendance.objects.create(assignment=a1, attended=True, hours=2)
+        Attendance.objects.create(assignment=a2, attended=False, hours=0)
+
+        stats = ActivityStats.objects.get(activity=self.activity)
+        self.assertEqual(stats.assigned_count, 2)
+        self.assertEqual(stats.cancelled_count, 1)
+        self.assertEqual(stats.fill_rate, 0.5)
+        self.assertEqual(stats.confirmation_rate, 0.5)
+        self.assertEqual(stats.attendance_rate, 0.5)
+
+        a2.delete()
+        stats.refresh_from_db()
+        self.assertEqual(stats.assigned_count, 1)
+        self.assertEqual(stats.attendance_count, 1)
+
+    def test_activity_delete_cascades_cleanly(self):
+        assignment = Assignment.objects.create(volunteer=self.volunteers[0], activity=self.activity)
+        Attendance.objects.create(assignment=assignment, attended=True, hours=1)
+        self.activity.delete()
+        self.assertFalse(ActivityStats.objects.exists())
+
+    def test_rebuild_command_and_report(self):
+        Assignment.objects.create(volunteer=self.volunteers[0], activity=self.activity)
+        ActivityStats.objects.all().delete()
+        call_command('rebuild_activity_stats', stdout=io.StringIO())
+        self.assertEqual(ActivityStats.objects.get(activity=self.activity).assigned_count, 1)
+
+        self.client.login(username='admin', password='adminpass')
+        response = self.client.get(reverse('activity_report'), {'sort': '-fill_rate'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Reforestación')
+
+    def test_report_pages_without_counting_large_tables(self):
+        self.client.login(username='admin', password='adminpass')
+        with mock.patch('volunteers.paginators.ESTIMATE_THRESHOLD', 1), CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('activity_report'))
+        self.assertContains(response, 'Reforestación')
+        self.assertFalse([q['sql'] for q in queries if 'COUNT(' in q['sql']])
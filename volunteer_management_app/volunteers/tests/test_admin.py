@@ -0,0 +1,78 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+from volunteers.models import Activity, Assignment, Attendance, Notification
+from volunteers.paginators import EstimatedCountPaginator
+from django.utils import timezone
+import datetime
+
+User = get_user_model()
+
+
+class ScalableAdminTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.superuser = User.objects.create_superuser(username='root', password='rootpass', email='root@example.com', role='admin')
+        self.client.login(username='root', password='rootpass')
+        self.activity = Activity.objects.create(
+            title='Limpieza', description='-', location='Playa',
+            date=timezone.now() + datetime.timedelta(days=3),
+            required_volunteers=50, created_by=self.superuser
+        )
+        volunteers = User.objects.bulk_create([
+            User(username=f'vol{i}', email=f'vol{i}@example.com', role='volunteer') for i in range(20)
+        ])
+        assignments = Assignment.objects.bulk_create([
+            Assignment(volunteer=volunteer, activity=self.activity) for volunteer in volunteers
+        ])
+        Attendance.objects.bulk_create([
+            Attendance(assignment=assignment, attended=True, hours=2) for assignment in assignments
+        ])
+        notification = Notification.objects.create(activity=self.activity, message='Hola')
+        notification.recipients.set(volunteers)
+
+    def test_changelists_render_with_constant_queries(self):
+        for model in ('activity', 'assignment', 'attendance', 'notification'):
+            url = reverse(f'admin:volunteers_{model}_changelist')
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, model)
+            # Related columns come from list_select_related, not one query per row.
+            self.assertLess(len(queries), 12, model)
+
+    def test_filtered_changelist_skips_full_count(self):
+        url = reverse('admin:volunteers_assignment_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'status__exact': 'assigned'})
+        self.assertEqual(response.status_code, 200)
+        counts = [q['sql'] for q in queries if 'COUNT(' in q['sql'].upper()]
+        self.assertEqual(len(counts), 1)
+
+    def test_list_filters_use_indexes(self):
+        plan = Attendance.objects.filter(attended=True).order_by('-id')[:50].explain()
+        self.assertIn('attendance_attended_id', plan)
+        plan = Attendance.objects.filter(attended=False).order_by('-id')[:50].explain()
+        self.assertIn('attendance_absent_id', plan)
+        plan = User.objects.filter(role='volunteer').order_by('username')[:100].explain()
+        self.assertIn('user_role_username', plan)
+        for model, params in (('attendance', {'attended__exact': '1'}), ('customuser', {'role__exact': 'volunteer'})):
+            response = self.client.get(reverse(f'admin:volunteers_{model}_changelist'), params)
+            self.assertEqual(response.status_code, 200, model)
+
+    def test_search_uses_prefix_match(self):
+        response = self.client.get(reverse('admin:volunteers_activity_changelist'), {'q': 'Limp'})
+        self.assertContains(response, 'Limpieza')
+        response = self.client.get(reverse('admin:volunteers_activity_changelist'), {'q': 'mpieza'})
+        self.assertNotContains(response, '>Limpieza<')
+
+    def test_paginator_estimates_large_unfiltered_tables(self):
+        paginator = EstimatedCountPaginator(Assignment.objects.order_by('id'), 5)
+        self.assertEqual(paginator.count, 20)
+        with mock.patch('volunteers.paginators.ESTIMATE_THRESHOLD', 1):
+            estimated = EstimatedCountPaginator(Assignment.objects.order_by('id'), 5)
+            self.assertEqual(estimated.count, Assignment.objects.order_by('-id').first().id)
+            filtered = EstimatedCountPaginator(Assignment.objects.filter(status='assigned').order_by('id'), 5)
+            self.assertEqual(filtered.count, 20)
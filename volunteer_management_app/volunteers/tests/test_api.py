@@ -0,0 +1,82 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from volunteers.models import Activity, Assignment, Notification
+from django.utils import timezone
+import datetime
+
+User = get_user_model()
+
+class ApiTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='volpass', role='volunteer')
+        self.activities = [
+            Activity.objects.create(
+                title=f'Actividad {i}', description='-', location='Parque',
+                date=timezone.now() + datetime.timedelta(days=i + 1),
+                required_volunteers=3, created_by=self.admin
+            )
+            for i in range(5)
+        ]
+        Assignment.objects.create(volunteer=self.volunteer, activity=self.activities[0])
+        notification = Notification.objects.create(activity=self.activities[0], message='Hola')
+        notification.recipients.set([self.volunteer])
+
+    def test_activity_cursor_pagination_and_fields(self):
+        response = self.client.get(reverse('api_activity_list'), {'limit': 2, 'fields': 'id,title'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([row['title'] for row in data['results']], ['Actividad 0', 'Actividad 1'])
+        self.assertEqual(set(data['results'][0]), {'id', 'title'})
+
+        titles = []
+        cursor = data['next_cursor']
+        while cursor:
+            data = self.client.get(reverse('api_activity_list'), {'limit': 2, 'cursor': cursor}).json()
+            titles += [row['title'] for row in data['results']]
+            cursor = data['next_cursor']
+        self.assertEqual(titles, ['Actividad 2', 'Actividad 3', 'Actividad 4'])
+
+    def test_conditional_get_returns_304_until_changed(self):
+        response = self.client.get(reverse('api_activity_list'))
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(reverse('api_activity_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.activities[2].title = 'Cambiada'
+        self.activities[2].save()
+        response = self.client.get(reverse('api_activity_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_gzip_and_invalid_parameters(self):
+        response = self.client.get(reverse('api_activity_list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        response = self.client.get(reverse('api_activity_list'), {'fields': 'password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_volunteer_resources_require_login(self):
+        self.assertEqual(self.client.get(reverse('api_my_assignments')).status_code, 401)
+        self.client.login(username='vol', password='volpass')
+        assignments = self.client.get(reverse('api_my_assignments')).json()['results']
+        self.assertEqual(assignments[0]['activity_title'], 'Actividad 0')
+        notifications = self.client.get(reverse('api_my_notifications')).json()['results']
+        self.assertEqual(notifications[0]['message'], 'Hola')
+
+    def test_volunteer_lists_change_when_activity_changes(self):
+        self.client.login(username='vol', password='volpass')
+        urls = [reverse('api_my_assignments'), reverse('api_my_notifications')]
+        etags = [self.client.get(url)['ETag'] for url in urls]
+        for url, etag in zip(urls, etags):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.activities[0].title = 'Renombrada'
+        self.activities[0].save()
+        for url, etag in zip(urls, etags):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        assignments = self.client.get(urls[0]).json()['results']
+        self.assertEqual(assignments[0]['activity_title'], 'Renombrada')
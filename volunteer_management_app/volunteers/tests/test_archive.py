@@ -0,0 +1,86 @@
+from django.test import TestCase, Client, RequestFactory
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from volunteers.models import Activity, ArchivedActivity, ArchivedActivityStats, ArchivedAssignment, ArchivedAttendance, Assignment, Attendance, Notification
+from volunteers import archive, ledger, views
+from volunteers.analytics import load_hours_columns
+from django.utils import timezone
+from decimal import Decimal
+import datetime
+import io
+
+User = get_user_model()
+
+
+class ArchiveTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='volpass', role='volunteer', first_name='Ana')
+        now = timezone.now()
+        self.old = Activity.objects.create(
+            title='Censo 2019', description='-', location='Barrio',
+            date=now - datetime.timedelta(days=800), required_volunteers=5, created_by=self.admin
+        )
+        self.recent = Activity.objects.create(
+            title='Huerta', description='-', location='Escuela',
+            date=now - datetime.timedelta(days=10), required_volunteers=5, created_by=self.admin
+        )
+        for activity, hours, attended in ((self.old, 3, True), (self.recent, 2, True)):
+            assignment = Assignment.objects.create(volunteer=self.volunteer, activity=activity)
+            Attendance.objects.create(assignment=assignment, attended=attended, hours=hours)
+        Notification.objects.create(activity=self.old, message='Gracias')
+
+    def test_archives_old_activities_with_children(self):
+        old_assignment = Assignment.objects.get(activity=self.old)
+        self.assertEqual(archive.archive_activities(batch_size=1), 1)
+        self.assertFalse(Activity.objects.filter(pk=self.old.pk).exists())
+        self.assertTrue(Activity.objects.filter(pk=self.recent.pk).exists())
+        archived = ArchivedActivity.objects.get(pk=self.old.pk)
+        self.assertEqual(archived.title, 'Censo 2019')
+        self.assertEqual(ArchivedAssignment.objects.get(pk=old_assignment.pk).activity_id, self.old.pk)
+        self.assertEqual(ArchivedAttendance.objects.get(assignment_id=old_assignment.pk).hours, Decimal('3'))
+        # A second run has nothing left to move.
+        self.assertEqual(archive.archive_activities(), 0)
+
+    def test_ledger_spans_both_tiers(self):
+        before = ledger.volunteer_total_hours(self.volunteer)
+        archive.archive_activities()
+        self.assertEqual(ledger.volunteer_total_hours(self.volunteer), before)
+        self.assertEqual(before, Decimal('5'))
+        annotated = ledger.annotate_hours(User.objects.filter(pk=self.volunteer.pk)).get()
+        self.assertEqual(annotated.total_hours, Decimal('5'))
+        self.assertEqual(ledger.annotate_hours(User.objects.filter(pk=self.admin.pk)).get().total_hours, 0)
+        self.assertEqual(sorted(load_hours_columns().hours.tolist()), [2.0, 3.0])
+
+    def test_history_and_eligibility_read_archive(self):
+        archive.archive_activities()
+        titles = [row['activity_title'] for row in ledger.attendance_history()]
+        self.assertEqual(titles, ['Huerta', 'Censo 2019'])
+        request = RequestFactory().get('/')
+        request.user = self.admin
+        response = views.admin_certificate_eligibility(request)
+        self.assertContains(response, 'vol')
+        self.assertContains(response, '5')
+
+    def test_activity_report_shows_archived_activities_on_request(self):
+        archive.archive_activities()
+        self.assertEqual(ArchivedActivityStats.objects.get(activity_id=self.old.pk).assigned_count, 1)
+        request = RequestFactory().get('/', {'sort': 'date'})
+        request.user = self.admin
+        response = views.activity_report(request)
+        self.assertContains(response, 'Huerta')
+        self.assertNotContains(response, 'Censo 2019')
+
+        request = RequestFactory().get('/', {'sort': 'date', 'archived': '1'})
+        request.user = self.admin
+        response = views.activity_report(request)
+        self.assertContains(response, 'Censo 2019')
+        self.assertNotContains(response, 'Huerta')
+        self.assertContains(response, '?archived=1&sort=-date')
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('archive_activities', '--days', '5', stdout=out)
+        self.assertIn('2 actividades archivadas', out.getvalue())
+        self.assertFalse(Activity.objects.exists())
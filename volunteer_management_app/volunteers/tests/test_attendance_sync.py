@@ -0,0 +1,117 @@
+import datetime
+import json
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from volunteers.models import Activity, ActivityStats, Assignment, Attendance
+
+User = get_user_model()
+
+
+class AttendanceSyncTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='coord', password='pass', role='admin')
+        self.other_admin = User.objects.create_user(username='otro', password='pass', role='admin')
+        self.activity = Activity.objects.create(
+            title='Jornada', description='-', location='Parque',
+            date=timezone.now() + datetime.timedelta(days=1), required_volunteers=400, created_by=self.admin,
+        )
+        volunteers = User.objects.bulk_create([
+            User(username=f'vol{i}', role='volunteer', first_name=f'Nombre{i}') for i in range(300)
+        ])
+        Assignment.objects.bulk_create([Assignment(volunteer=v, activity=self.activity) for v in volunteers])
+        self.assignments = list(Assignment.objects.filter(activity=self.activity).order_by('id'))
+        self.url = reverse('api_attendance_sync', args=[self.activity.id])
+        self.client.login(username='coord', password='pass')
+
+    def sync(self, records, token=None):
+        return self.client.post(self.url, json.dumps({'token': token, 'records': records}),
+                                content_type='application/json')
+
+    def records(self, assignments, attended=True, hours='3.5', **extra):
+        return [
+            {'uuid': str(uuid.uuid4()), 'assignment_id': a.id, 'attended': attended, 'hours': hours, **extra}
+            for a in assignments
+        ]
+
+    def test_batch_upsert_in_constant_queries(self):
+        records = self.records(self.assignments)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.sync(records)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['applied']), 300)
+        self.assertTrue(data['full'])
+        self.assertEqual(len(data['roster']), 300)
+        self.assertLess(len(queries), 20)
+
+        self.assertEqual(Attendance.objects.filter(assignment__activity=self.activity, attended=True).count(), 300)
+        stats = ActivityStats.objects.get(activity=self.activity)
+        self.assertEqual(stats.attended_count, 300)
+
+    def test_resent_queue_is_idempotent(self):
+        records = self.records(self.assignments[:5])
+        self.sync(records)
+        before = list(Attendance.objects.order_by('id').values_list('id', 'updated_at'))
+
+        data = self.sync(records).json()
+        self.assertEqual(data['applied'], [])
+        self.assertEqual(len(data['duplicates']), 5)
+        self.assertEqual(list(Attendance.objects.order_by('id').values_list('id', 'updated_at')), before)
+
+    def test_later_record_updates_in_place(self):
+        self.sync(self.records(self.assignments[:1], attended=False, hours='0'))
+        self.sync(self.records(self.assignments[:1], attended=True, hours='2'))
+        attendance = Attendance.objects.get(assignment=self.assignments[0])
+        self.assertTrue(attendance.attended)
+        self.assertEqual(str(attendance.hours), '2.00')
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_server_copy_wins_over_older_capture(self):
+        Attendance.objects.create(assignment=self.assignments[0], attended=True, hours=4)
+        captured = (timezone.now() - datetime.timedelta(hours=1)).isoformat()
+        data = self.sync(self.records(self.assignments[:1], attended=False, captured_at=captured)).json()
+        self.assertEqual(len(data['conflicts']), 1)
+        self.assertTrue(Attendance.objects.get(assignment=self.assignments[0]).attended)
+
+    @mock.patch('volunteers.attendance_sync.TOKEN_OVERLAP', datetime.timedelta(0))
+    def test_delta_since_token(self):
+        token = self.sync([]).json()['token']
+        Assignment.objects.filter(pk=self.assignments[1].pk).update(status='cancelled', updated_at=timezone.now())
+        data = self.sync(self.records(self.assignments[2:3]), token=token).json()
+        self.assertFalse(data['full'])
+        self.assertEqual(
+            {(row['assignment_id'], row['status']) for row in data['roster']},
+            {(self.assignments[1].id, 'cancelled'), (self.assignments[2].id, 'assigned')},
+        )
+        # Cancelled roster entries cannot receive attendance.
+        data = self.sync(self.records(self.assignments[1:2]), token=data['token']).json()
+        self.assertEqual(len(data['errors']), 1)
+
+    def test_invalid_records_are_reported_not_applied(self):
+        other = Activity.objects.create(
+            title='Otra', description='-', location='X', date=timezone.now(), required_volunteers=1, created_by=self.admin,
+        )
+        foreign = Assignment.objects.create(volunteer=self.assignments[0].volunteer, activity=other)
+        records = self.records(self.assignments[:1]) + [
+            {'uuid': 'no-es-uuid', 'assignment_id': self.assignments[1].id},
+            {'uuid': str(uuid.uuid4()), 'assignment_id': self.assignments[2].id, 'hours': '-1'},
+            {'uuid': str(uuid.uuid4()), 'assignment_id': foreign.id},
+        ]
+        data = self.sync(records).json()
+        self.assertEqual(len(data['applied']), 1)
+        self.assertEqual(len(data['errors']), 3)
+
+    def test_permissions_and_bad_token(self):
+        self.assertEqual(self.sync([], token='basura').status_code, 400)
+        self.client.login(username='otro', password='pass')
+        self.assertEqual(self.sync([]).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.sync([]).status_code, 401)
@@ -0,0 +1,141 @@
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from volunteers.models import Activity, ActivitySeries, Assignment, Attendance, AuditEvent, Notification
+from volunteers import audit, recurrence
+from volunteers.waitlist import enroll_many
+from django.utils import timezone
+from unittest import mock
+import datetime
+
+User = get_user_model()
+
+
+class AuditBufferTestCase(TestCase):
+    def test_flushes_on_size(self):
+        buffer = audit.AuditBuffer(flush_size=3, flush_seconds=60)
+        now = timezone.now()
+        for _ in range(2):
+            buffer.append(AuditEvent(occurred_at=now, month=202601, kind=AuditEvent.LOGIN))
+        self.assertEqual(AuditEvent.objects.count(), 0)
+        with self.assertNumQueries(1):
+            buffer.append(AuditEvent(occurred_at=now, month=202601, kind=AuditEvent.LOGIN))
+        self.assertEqual(AuditEvent.objects.count(), 3)
+        self.assertEqual(len(buffer), 0)
+
+    def test_flushes_on_time(self):
+        clock = mock.Mock(return_value=0.0)
+        buffer = audit.AuditBuffer(flush_size=100, flush_seconds=5, clock=clock)
+        buffer.append(AuditEvent(occurred_at=timezone.now(), month=202601, kind=AuditEvent.LOGIN))
+        buffer.flush_if_due()
+        self.assertEqual(len(buffer), 1)
+        clock.return_value = 6.0
+        buffer.flush_if_due()
+        self.assertEqual(AuditEvent.objects.count(), 1)
+
+    def test_failed_flush_keeps_newest_events(self):
+        buffer = audit.AuditBuffer(flush_size=100, capacity=2)
+        for month in (202601, 202602, 202603):
+            buffer.append(AuditEvent(occurred_at=timezone.now(), month=month, kind=AuditEvent.LOGIN))
+        self.assertEqual(buffer.dropped, 1)
+        with mock.patch.object(AuditEvent.objects, 'bulk_create', side_effect=RuntimeError('down')):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(sorted(AuditEvent.objects.values_list('month', flat=True)), [202602, 202603])
+
+
+@override_settings(AUDIT_FLUSH_SIZE=1000, WAITLIST_ASYNC=False)
+class AuditHooksTestCase(TestCase):
+    def setUp(self):
+        audit.reset_buffer()
+        self.addCleanup(audit.reset_buffer)
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='volpass', role='volunteer')
+        self.activity = Activity.objects.create(
+            title='Huerta', description='-', location='Escuela',
+            date=timezone.now() + datetime.timedelta(days=2), required_volunteers=5, created_by=self.admin
+        )
+
+    def test_events_are_buffered_until_flush(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment = Assignment.objects.create(volunteer=self.volunteer, activity=self.activity)
+            Attendance.objects.create(assignment=assignment, attended=True, hours=2)
+            notification = Notification.objects.create(activity=self.activity, message='Hola')
+            notification.recipients.set([self.volunteer])
+            assignment.status = 'cancelled'
+            assignment.save()
+        self.assertEqual(AuditEvent.objects.count(), 0)
+        self.assertEqual(audit.flush(), 4)
+        kinds = list(audit.volunteer_events(self.volunteer.id).values_list('kind', flat=True))
+        self.assertEqual(sorted(kinds), sorted([
+            AuditEvent.ENROLLED, AuditEvent.ATTENDANCE_RECORDED, AuditEvent.NOTIFIED, AuditEvent.CANCELLED,
+        ]))
+        event = AuditEvent.objects.get(kind=AuditEvent.ATTENDANCE_RECORDED)
+        self.assertEqual(event.data, {'attended': True, 'hours': '2'})
+        now = timezone.now()
+        self.assertEqual(event.month, now.year * 100 + now.month)
+
+    def test_only_status_transitions_are_audited(self):
+        other = User.objects.create_user(username='otro', password='pass', role='volunteer')
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment = Assignment.objects.create(volunteer=self.volunteer, activity=self.activity)
+            assignment.status = 'cancelled'
+            assignment.save()
+            assignment.save()
+            assignment.status = 'assigned'
+            assignment.save()
+            assignment.status = 'confirmed'
+            assignment.save()
+            enroll_many([self.activity.id], [other.id])
+        audit.flush()
+        kinds = list(
+            AuditEvent.objects.filter(volunteer_id=self.volunteer.id).order_by('id').values_list('kind', flat=True)
+        )
+        self.assertEqual(kinds, [AuditEvent.ENROLLED, AuditEvent.CANCELLED, AuditEvent.ENROLLED])
+        event = AuditEvent.objects.get(volunteer_id=other.id)
+        self.assertEqual((event.kind, event.activity_id), (AuditEvent.ENROLLED, self.activity.id))
+
+    def test_series_unsubscribe_audits_cancellations(self):
+        series = ActivitySeries.objects.create(
+            title='Comedor', description='-', location='Centro', required_volunteers=5, created_by=self.admin,
+            start=timezone.now() + datetime.timedelta(days=1), frequency='weekly',
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            recurrence.generate_occurrences(series, until=series.start + datetime.timedelta(days=14))
+            recurrence.subscribe(series, self.volunteer)
+            recurrence.unsubscribe(series, self.volunteer)
+        audit.flush()
+        kinds = AuditEvent.objects.filter(volunteer_id=self.volunteer.id).values_list('kind', flat=True)
+        self.assertEqual(sorted(kinds), [AuditEvent.ENROLLED] * 2 + [AuditEvent.CANCELLED] * 2)
+
+    def test_events_for_another_database_are_discarded(self):
+        buffer = audit.AuditBuffer(flush_size=100)
+        buffer.append(AuditEvent(occurred_at=timezone.now(), month=202601, kind=AuditEvent.LOGIN))
+        # What the exit hook sees after the test runner restores the real database settings.
+        with mock.patch('volunteers.audit._database_name', return_value='db.sqlite3'), \
+                self.assertLogs('volunteers.audit', 'WARNING'):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(buffer.dropped, 1)
+        self.assertEqual(len(buffer), 0)
+        self.assertFalse(AuditEvent.objects.exists())
+
+    def test_rolled_back_changes_are_not_audited(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                from django.db import transaction
+                with transaction.atomic():
+                    Assignment.objects.create(volunteer=self.volunteer, activity=self.activity)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(len(audit.get_buffer()), 0)
+
+    def test_logins_are_audited(self):
+        client = Client()
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(reverse('login'), {'username': 'vol', 'password': 'wrong'})
+            client.post(reverse('login'), {'username': 'vol', 'password': 'volpass'})
+        audit.flush()
+        self.assertEqual(AuditEvent.objects.get(kind=AuditEvent.LOGIN).volunteer_id, self.volunteer.id)
+        self.assertEqual(AuditEvent.objects.get(kind=AuditEvent.LOGIN_FAILED).data['username'], 'vol')
@@ -0,0 +1,77 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from volunteers.forms import NotificationForm, VolunteerPickerForm
+from volunteers.models import Activity
+from volunteers import views
+from volunteers.views.lookups import prefix_filter
+from django.utils import timezone
+import datetime
+
+User = get_user_model()
+
+
+class AutocompleteTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='volpass', role='volunteer')
+        now = timezone.now()
+        self.past = Activity.objects.create(
+            title='Reforestación 2020', description='-', location='Cerro',
+            date=now - datetime.timedelta(days=30), required_volunteers=5, created_by=self.admin
+        )
+        Activity.objects.bulk_create([
+            Activity(title=f'Taller {i:02d}', description='-', location='Centro',
+                     date=now + datetime.timedelta(days=i + 1), required_volunteers=5, created_by=self.admin)
+            for i in range(views.LOOKUP_PAGE_SIZE + 5)
+        ])
+
+    def test_activity_lookup_defaults_to_upcoming_and_pages(self):
+        self.client.login(username='admin', password='adminpass')
+        data = self.client.get(reverse('activity_lookup')).json()
+        self.assertEqual(len(data['results']), views.LOOKUP_PAGE_SIZE)
+        self.assertTrue(data['more'])
+        self.assertTrue(data['results'][0]['text'].startswith('Taller 00'))
+        data = self.client.get(reverse('activity_lookup'), {'page': 2}).json()
+        self.assertEqual(len(data['results']), 5)
+        self.assertFalse(data['more'])
+
+    def test_activity_lookup_searches_by_title_prefix(self):
+        self.client.login(username='admin', password='adminpass')
+        data = self.client.get(reverse('activity_lookup'), {'q': 'refo'}).json()
+        self.assertEqual(data['results'], [])
+        data = self.client.get(reverse('activity_lookup'), {'q': 'refo', 'all': '1'}).json()
+        self.assertEqual([item['id'] for item in data['results']], [self.past.id])
+
+    def test_volunteer_lookup(self):
+        self.client.login(username='admin', password='adminpass')
+        data = self.client.get(reverse('volunteer_lookup'), {'q': 'VO'}).json()
+        self.assertEqual([item['id'] for item in data['results']], [self.volunteer.id])
+
+    def test_prefix_filter_searches_the_lower_index(self):
+        plan = prefix_filter(Activity.objects.all(), 'title', 'Ta').explain()
+        self.assertIn('activity_title_lower', plan)
+        plan = prefix_filter(User.objects.all(), 'username', 'VO').explain()
+        self.assertIn('user_username_lower', plan)
+        self.assertEqual(prefix_filter(Activity.objects.all(), 'title', 'taller 0').count(), 10)
+
+    def test_lookups_require_admin(self):
+        self.client.login(username='vol', password='volpass')
+        self.assertEqual(self.client.get(reverse('activity_lookup')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('volunteer_lookup')).status_code, 403)
+
+    def test_widget_renders_only_selected_option(self):
+        html = str(NotificationForm()['activity'])
+        self.assertIn('data-autocomplete-url="%s"' % reverse('activity_lookup'), html)
+        self.assertNotIn('Taller', html)
+        with self.assertNumQueries(1):
+            html = str(NotificationForm(initial={'activity': self.past.id})['activity'])
+        self.assertIn('Reforestación 2020', html)
+        self.assertEqual(html.count('<option'), 1)
+
+    def test_form_accepts_any_activity(self):
+        form = NotificationForm({'activity': self.past.id, 'message': 'Gracias'})
+        self.assertTrue(form.is_valid(), form.errors)
+        picker = VolunteerPickerForm({'volunteer_id': self.volunteer.id})
+        self.assertTrue(picker.is_valid(), picker.errors)
@@ -0,0 +1,113 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from volunteers import checkin, ledger
+from volunteers.models import Activity, Assignment, Attendance
+
+User = get_user_model()
+
+
+@override_settings(CHECKIN_ASYNC=False)
+class CheckinTests(TestCase):
+    def setUp(self):
+        checkin.reset_queue()
+        self.addCleanup(checkin.reset_queue)
+        self.admin = User.objects.create_user(username='coord', password='pass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='pass', role='volunteer')
+        self.other = User.objects.create_user(username='otro', password='pass', role='volunteer')
+        self.activity = Activity.objects.create(
+            title='Jornada', description='-', location='Parque',
+            date=timezone.now() + datetime.timedelta(hours=1), required_volunteers=5, created_by=self.admin,
+        )
+        self.assignment = Assignment.objects.create(volunteer=self.volunteer, activity=self.activity)
+        self.scan_url = reverse('checkin_scan', args=[self.activity.id])
+        self.kiosk = checkin.kiosk_token(self.activity.id, self.admin.pk)
+
+    def scan(self, code, kiosk=None):
+        return self.client.post(self.scan_url, {'code': code}, HTTP_X_KIOSK_TOKEN=kiosk or self.kiosk)
+
+    def test_token_is_verified_without_queries(self):
+        token = checkin.checkin_token(self.assignment)
+        with self.assertNumQueries(0):
+            self.assertEqual(checkin.read_checkin_token(token), (self.activity.id, self.assignment.id))
+        with self.assertRaises(checkin.CheckinError):
+            checkin.read_checkin_token(token.replace(f'{self.activity.id}.', f'{self.activity.id + 1}.', 1))
+
+    def test_scan_records_attendance(self):
+        response = self.scan(checkin.checkin_token(self.assignment))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'queued')
+        self.assertTrue(Attendance.objects.get(assignment=self.assignment).attended)
+
+        self.assertEqual(self.scan(checkin.checkin_token(self.assignment)).json()['status'], 'duplicate')
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_scan_keeps_recorded_hours(self):
+        Attendance.objects.create(assignment=self.assignment, attended=False, hours=3)
+        self.scan(checkin.checkin_token(self.assignment))
+        attendance = Attendance.objects.get(assignment=self.assignment)
+        self.assertTrue(attendance.attended)
+        self.assertEqual(attendance.hours, 3)
+
+    def test_coordinator_records_hours_after_scan(self):
+        self.scan(checkin.checkin_token(self.assignment))
+        self.client.login(username='coord', password='pass')
+        url = reverse('record_attendance', args=[self.assignment.id])
+        self.client.post(url, {'attended': 'on', 'hours': '2.5'})
+        attendance = Attendance.objects.get(assignment=self.assignment)
+        self.assertTrue(attendance.attended)
+        self.assertEqual(attendance.hours, Decimal('2.5'))
+        self.assertEqual(ledger.volunteer_total_hours(self.volunteer), Decimal('2.5'))
+
+        # Once the hours are in, the form no longer overwrites them.
+        self.client.post(url, {'attended': 'on', 'hours': '9'})
+        self.assertEqual(Attendance.objects.get(assignment=self.assignment).hours, Decimal('2.5'))
+
+    @override_settings(CHECKIN_ASYNC=True, CHECKIN_BATCH_SIZE=1000, CHECKIN_FLUSH_SECONDS=60)
+    def test_async_scan_is_queued_without_queries(self):
+        token = checkin.checkin_token(self.assignment)
+        with self.assertNumQueries(0):
+            response = self.scan(token)
+        self.assertEqual(response.status_code, 202)
+        queue = checkin.get_queue()
+        self.assertEqual(len(queue), 1)
+        self.assertFalse(Attendance.objects.exists())
+
+        self.assertEqual(queue.flush(), 1)
+        self.assertTrue(Attendance.objects.get(assignment=self.assignment).attended)
+
+    def test_rejected_scans(self):
+        other_activity = Activity.objects.create(
+            title='Otra', description='-', location='X', date=timezone.now(), required_volunteers=1, created_by=self.admin,
+        )
+        foreign = Assignment.objects.create(volunteer=self.other, activity=other_activity)
+        self.assertEqual(self.scan(checkin.checkin_token(foreign)).status_code, 400)
+        self.assertEqual(self.scan('basura').status_code, 400)
+        other_kiosk = checkin.kiosk_token(other_activity.id, self.admin.pk)
+        self.assertEqual(self.scan(checkin.checkin_token(self.assignment), kiosk=other_kiosk).status_code, 403)
+
+        # A cancelled assignment is rejected when the batch commits and may scan again later.
+        self.assignment.status = 'cancelled'
+        self.assignment.save()
+        self.scan(checkin.checkin_token(self.assignment))
+        self.assertFalse(Attendance.objects.exists())
+        self.assertEqual(self.scan(checkin.checkin_token(self.assignment)).json()['status'], 'queued')
+
+    def test_code_and_kiosk_pages(self):
+        self.client.login(username='vol', password='pass')
+        response = self.client.get(reverse('checkin_code', args=[self.assignment.id]))
+        self.assertContains(response, checkin.checkin_token(self.assignment))
+        self.assertEqual(self.client.get(reverse('checkin_kiosk', args=[self.activity.id])).status_code, 403)
+
+        self.client.login(username='otro', password='pass')
+        self.assertEqual(self.client.get(reverse('checkin_code', args=[self.assignment.id])).status_code, 403)
+
+        self.client.login(username='coord', password='pass')
+        response = self.client.get(reverse('checkin_kiosk', args=[self.activity.id]))
+        self.assertEqual(response.status_code, 200)
+        checkin.read_kiosk_token(response.context['kiosk_token'], self.activity.id)
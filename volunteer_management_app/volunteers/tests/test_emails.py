@@ -0,0 +1,70 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends import locmem
+from volunteers.models import Activity, Notification
+from volunteers import emails, jobs
+from django.utils import timezone
+from unittest import mock
+import datetime
+import types
+
+User = get_user_model()
+
+class NotificationEmailTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.activity = Activity.objects.create(
+            title='Jornada <Limpieza>', description='-', location='Parque de Nariño',
+            date=timezone.now() + datetime.timedelta(days=2),
+            required_volunteers=5, created_by=self.admin
+        )
+        self.notification = Notification.objects.create(activity=self.activity, message='Traer guantes & agua.')
+        volunteers = [
+            User.objects.create_user(username=f'vol{i}', first_name=f'Ana{i}', role='volunteer', email=f'vol{i}@example.com')
+            for i in range(3)
+        ] + [User.objects.create_user(username='noemail', role='volunteer')]
+        self.notification.recipients.set(volunteers)
+
+    def test_personalized_text_and_html(self):
+        jobs.enqueue('send_notification_emails', {'notification_id': self.notification.pk})
+        jobs.run_pending_jobs()
+        self.assertEqual(len(mail.outbox), 3)
+        message = mail.outbox[0]
+        self.assertIn('Hola Ana0', message.body)
+        self.assertIn('Traer guantes & agua.', message.body)
+        html, mimetype = message.alternatives[0]
+        self.assertEqual(mimetype, 'text/html')
+        self.assertIn('Jornada &lt;Limpieza&gt;', html)
+
+    def test_messages_are_lazy_and_templates_loaded_once(self):
+        recipients = list(self.notification.recipients.all())
+        with mock.patch('volunteers.emails.get_template', wraps=emails.get_template) as get_template:
+            messages = emails.iter_notification_messages(self.notification, recipients)
+            self.assertIsInstance(messages, types.GeneratorType)
+            self.assertEqual(len(list(messages)), 3)
+        self.assertEqual(get_template.call_count, 2)
+
+    def test_send_in_batches(self):
+        sent = emails.send_notification(self.notification, batch_size=2)
+        self.assertEqual(sent, 3)
+
+    def test_retry_skips_recipients_already_mailed(self):
+        send_messages = locmem.EmailBackend.send_messages
+        calls = []
+
+        def fail_second_batch(backend, messages):
+            calls.append(len(messages))
+            if len(calls) == 2:
+                raise ConnectionError('smtp caído')
+            return send_messages(backend, messages)
+
+        with mock.patch.object(locmem.EmailBackend, 'send_messages', fail_second_batch):
+            with self.assertRaises(ConnectionError):
+                emails.send_notification(self.notification, batch_size=2)
+        self.assertEqual(len(mail.outbox), 2)
+
+        notification = Notification.objects.get(pk=self.notification.pk)
+        self.assertEqual(emails.send_notification(notification, batch_size=2), 1)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [f'vol{i}@example.com' for i in range(3)])
+
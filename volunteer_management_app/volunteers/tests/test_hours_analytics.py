@@ -0,0 +1,69 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from volunteers.models import Activity, Assignment, Attendance
+from volunteers.analytics import hours_report
+import datetime
+
+User = get_user_model()
+
+class HoursAnalyticsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='volpass', role='volunteer')
+        dates = [
+            (datetime.datetime(2025, 1, 6, 9, tzinfo=datetime.timezone.utc), 'Parque', '2.5'),
+            (datetime.datetime(2025, 1, 8, 9, tzinfo=datetime.timezone.utc), 'Playa', '1.5'),
+            (datetime.datetime(2025, 2, 3, 9, tzinfo=datetime.timezone.utc), 'Parque', '4'),
+        ]
+        for date, location, hours in dates:
+            activity = Activity.objects.create(
+                title=f'Actividad {location}', description='-', date=date, location=location,
+                required_volunteers=2, created_by=self.admin
+            )
+            assignment = Assignment.objects.create(volunteer=self.volunteer, activity=activity)
+            Attendance.objects.create(assignment=assignment, attended=True, hours=hours)
+
+    def test_monthly_and_weekly_buckets(self):
+        monthly = hours_report(period='month')
+        self.assertEqual(monthly['buckets'], ['2025-01', '2025-02'])
+        self.assertEqual(monthly['hours'], [4.0, 4.0])
+
+        weekly = hours_report(period='week', group_by='location')
+        self.assertEqual(weekly['buckets'], ['2025-01-06', '2025-02-03'])
+        series = {entry['key']: entry['hours'] for entry in weekly['series']}
+        self.assertEqual(series, {'Parque': [2.5, 4.0], 'Playa': [1.5, 0.0]})
+
+    def test_cache_invalidated_by_new_attendance(self):
+        self.assertEqual(hours_report()['hours'], [4.0, 4.0])
+        Attendance.objects.filter(hours=4).update(hours=1)
+        self.assertEqual(hours_report()['hours'], [4.0, 4.0])
+        Attendance.objects.get(hours=1).save()
+        self.assertEqual(hours_report()['hours'], [4.0, 1.0])
+
+    def test_cache_invalidated_when_assignment_moves(self):
+        other = User.objects.create_user(username='otro', password='volpass', role='volunteer')
+        series = {entry['key'] for entry in hours_report(group_by='volunteer')['series']}
+        self.assertEqual(series, {self.volunteer.pk})
+        assignment = Assignment.objects.get(attendance__hours=4)
+        assignment.volunteer = other
+        assignment.save()
+        series = {entry['key'] for entry in hours_report(group_by='volunteer')['series']}
+        self.assertEqual(series, {self.volunteer.pk, other.pk})
+
+    def test_endpoint_requires_admin(self):
+        self.client.login(username='vol', password='volpass')
+        self.assertEqual(self.client.get(reverse('hours_analytics')).status_code, 403)
+        self.client.login(username='admin', password='adminpass')
+        response = self.client.get(reverse('hours_analytics'), {'group': 'volunteer', 'start': '2025-02-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['series'][0]['hours'], [4.0])
+
+    def test_endpoint_rejects_impossible_dates(self):
+        self.client.login(username='admin', password='adminpass')
+        response = self.client.get(reverse('hours_analytics'), {'start': '2025-02-30'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Parámetros inválidos.'})
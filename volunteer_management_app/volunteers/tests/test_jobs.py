@@ -0,0 +1,110 @@
+from django.test import TestCase, TransactionTestCase, Client, RequestFactory
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core import mail
+from django.core.management import call_command
+from volunteers.models import Activity, Attendance, Assignment, CertificateFile, Job
+from volunteers import audit, jobs, views
+from django.utils import timezone
+import datetime
+import io
+
+User = get_user_model()
+
+@jobs.task('test_flaky')
+def flaky(fail=True):
+    if fail:
+        raise RuntimeError('boom')
+
+
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        # Enrollments committed through captureOnCommitCallbacks are audited.
+        audit.reset_buffer()
+        self.addCleanup(audit.reset_buffer)
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='volpass', role='volunteer', email='vol@example.com')
+        self.activity = Activity.objects.create(
+            title='Huerta', description='-', location='Escuela',
+            date=timezone.now() + datetime.timedelta(days=2),
+            required_volunteers=5, created_by=self.admin
+        )
+
+    def test_claim_is_exclusive(self):
+        job = jobs.enqueue('test_flaky', {'fail': False})
+        self.assertEqual(jobs.claim_job('w1').pk, job.pk)
+        self.assertIsNone(jobs.claim_job('w2'))
+
+    def test_failures_back_off_then_dead_letter(self):
+        job = jobs.enqueue('test_flaky', max_attempts=2)
+        self.assertEqual(jobs.run_pending_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('boom', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        jobs.run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'dead')
+
+        self.assertEqual(jobs.retry_job(job.pk), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('pending', 0))
+
+    def test_stale_jobs_requeued_until_last_attempt(self):
+        retried = jobs.enqueue('test_flaky', max_attempts=3)
+        poisoned = jobs.enqueue('test_flaky', max_attempts=3)
+        stale = timezone.now() - datetime.timedelta(hours=1)
+        Job.objects.filter(pk=retried.pk).update(status='running', attempts=2, locked_by='w1', locked_at=stale)
+        Job.objects.filter(pk=poisoned.pk).update(status='running', attempts=3, locked_by='w1', locked_at=stale)
+
+        with self.assertLogs('volunteers.jobs', 'ERROR'):
+            self.assertEqual(jobs.requeue_stale_jobs(), 2)
+        retried.refresh_from_db()
+        poisoned.refresh_from_db()
+        self.assertEqual((retried.status, retried.locked_by), ('pending', ''))
+        self.assertEqual((poisoned.status, poisoned.locked_by), ('dead', ''))
+        self.assertTrue(poisoned.last_error)
+
+    def test_retry_rejects_invalid_job_id(self):
+        self.client.login(username='admin', password='adminpass')
+        self.assertEqual(self.client.post(reverse('job_status'), {'retry': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.post(reverse('job_status'), {'retry': '999'}).status_code, 302)
+
+    def test_inscription_email_is_queued(self):
+        self.client.login(username='vol', password='volpass')
+        self.client.get(reverse('inscribe_activity', args=[self.activity.id]))
+        self.assertEqual(len(mail.outbox), 0)
+        jobs.run_pending_jobs()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Job.objects.get().status, 'done')
+
+    def test_certificates_prerendered_by_worker(self):
+        assignment = Assignment.objects.create(volunteer=self.volunteer, activity=self.activity)
+        Attendance.objects.create(assignment=assignment, attended=True, hours=3)
+        request = RequestFactory().get('/')
+        request.user = self.admin
+        views.admin_certificate_eligibility(request)
+        # Viewing the list has no side effects; the POST action queues the renders.
+        self.assertFalse(Job.objects.exists())
+        for _ in range(2):
+            request = RequestFactory().post('/')
+            request.user = self.admin
+            request.session = {}
+            request._messages = FallbackStorage(request)
+            self.assertEqual(views.admin_certificate_eligibility(request).status_code, 302)
+        call_command('prerender_certificates', stdout=io.StringIO())
+        self.assertEqual(Job.objects.filter(task='render_certificate').count(), 1)
+        jobs.run_pending_jobs()
+        self.assertEqual(CertificateFile.objects.get(volunteer=self.volunteer).total_hours, 3)
+
+
+class RunWorkerCommandTestCase(TransactionTestCase):
+    def test_burst_worker_drains_queue(self):
+        for _ in range(3):
+            jobs.enqueue('test_flaky', {'fail': False})
+        call_command('runworker', burst=True, concurrency=2, stdout=io.StringIO())
+        self.assertEqual(Job.objects.filter(status='done').count(), 3)
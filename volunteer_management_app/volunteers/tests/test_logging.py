@@ -0,0 +1,77 @@
+from django.test import SimpleTestCase
+from django.utils.log import AdminEmailHandler
+from volunteers.log_handlers import BackgroundQueueHandler
+import logging
+import os
+from unittest import mock
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class BackgroundQueueHandlerTestCase(SimpleTestCase):
+    def test_records_are_written_by_listener(self):
+        target = ListHandler()
+        handler = BackgroundQueueHandler([target])
+        logger = logging.getLogger('volunteers.tests.queue')
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            args = {'user': 'vol'}
+            logger.warning('Access denied user=%(user)s', args)
+            # The message is fixed when the call is made, not when it is written.
+            args['user'] = 'other'
+        finally:
+            handler.stop()
+            logger.removeHandler(handler)
+        self.assertEqual(target.messages, ['Access denied user=vol'])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = BackgroundQueueHandler([ListHandler()], queue_size=1)
+        handler.stop()
+        record = logging.LogRecord('x', logging.WARNING, __file__, 1, 'msg', None, None)
+        handler.handle(record)
+        handler.handle(record)
+        self.assertEqual(handler.dropped, 1)
+
+    def test_settings_route_root_logger_through_queue(self):
+        self.assertTrue(any(isinstance(h, BackgroundQueueHandler) for h in logging.getLogger().handlers))
+
+    def test_settings_keep_django_console_and_mail_admins_defaults(self):
+        handler = next(h for h in logging.getLogger('django').handlers if isinstance(h, BackgroundQueueHandler))
+        console, mail_admins = handler.targets
+        self.assertIsInstance(mail_admins, AdminEmailHandler)
+        record = logging.LogRecord('django.request', logging.ERROR, __file__, 1, 'boom', None, None)
+        # The test runner runs with DEBUG off: Django's console stays quiet.
+        self.assertFalse(console.filter(record))
+        self.assertTrue(mail_admins.filter(record))
+
+    def test_settings_keep_application_warnings_on_stderr(self):
+        handler = next(h for h in logging.getLogger().handlers if isinstance(h, BackgroundQueueHandler))
+        (console,) = handler.targets
+        self.assertEqual(console.level, logging.WARNING)
+        record = logging.LogRecord('volunteers.views', logging.WARNING, __file__, 1, 'careful', None, None)
+        self.assertTrue(console.filter(record))
+
+    def test_listener_starts_on_first_record_and_after_fork(self):
+        target = ListHandler()
+        handler = BackgroundQueueHandler([target])
+        self.addCleanup(handler.stop)
+        self.assertIsNone(handler.listener)
+        record = logging.LogRecord('x', logging.WARNING, __file__, 1, 'first', None, None)
+        handler.handle(record)
+        parent_listener = handler.listener
+        self.assertIsNotNone(parent_listener)
+        # A forked worker has a different pid and gets its own queue and thread.
+        with mock.patch('volunteers.log_handlers.os.getpid', return_value=os.getpid() + 1):
+            handler.handle(logging.LogRecord('x', logging.WARNING, __file__, 1, 'second', None, None))
+            self.assertIsNot(handler.listener, parent_listener)
+            handler.stop()
+        parent_listener.stop()
+        self.assertEqual(sorted(target.messages), ['first', 'second'])
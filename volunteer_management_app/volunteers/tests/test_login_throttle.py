@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.test import TestCase, Client, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from volunteers.throttle import LocalRateLimiter, reset_login_throttle, reset_throttle_metrics, throttle_metrics
+
+User = get_user_model()
+
+class LocalRateLimiterTestCase(SimpleTestCase):
+    def test_bucket_refills_over_time(self):
+        now = [0.0]
+        limiter = LocalRateLimiter(capacity=2, refill_seconds=10, clock=lambda: now[0])
+        self.assertTrue(limiter.allow('k'))
+        self.assertTrue(limiter.allow('k'))
+        self.assertFalse(limiter.allow('k'))
+        self.assertAlmostEqual(limiter.retry_after('k'), 10)
+        now[0] = 10.0
+        self.assertTrue(limiter.allow('k'))
+        self.assertTrue(limiter.allow('other'))
+
+    def test_key_flood_evicts_least_recently_used(self):
+        limiter = LocalRateLimiter(capacity=1, refill_seconds=60, max_keys=3, clock=lambda: 0.0)
+        self.assertTrue(limiter.allow('victim'))
+        for n in range(10):
+            # The targeted key keeps being hit between the random ones.
+            self.assertFalse(limiter.allow('victim'))
+            limiter.allow(f'random{n}')
+        self.assertFalse(limiter.allow('victim'))
+        self.assertEqual(len(limiter._buckets), 3)
+
+
+@override_settings(LOGIN_THROTTLE={'IP_RATE': (100, 1.0), 'USERNAME_RATE': (3, 60.0)})
+class LoginThrottleTestCase(TestCase):
+    def setUp(self):
+        reset_login_throttle()
+        reset_throttle_metrics()
+        self.client = Client()
+        User.objects.create_user(username='vol', password='volpass', role='volunteer')
+
+    def tearDown(self):
+        reset_login_throttle()
+
+    def test_rejects_before_authenticate(self):
+        for _ in range(3):
+            response = self.client.post(reverse('login'), {'username': 'VOL', 'password': 'wrong'})
+            self.assertEqual(response.status_code, 200)
+        with mock.patch('django.contrib.auth.forms.authenticate') as authenticate:
+            response = self.client.post(reverse('login'), {'username': 'vol', 'password': 'volpass'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
+        self.assertEqual(throttle_metrics(), {'allowed': 3, 'rejected_username': 1})
+
+    def test_other_usernames_unaffected(self):
+        User.objects.create_user(username='other', password='otherpass', role='volunteer')
+        for _ in range(4):
+            self.client.post(reverse('login'), {'username': 'vol', 'password': 'wrong'})
+        response = self.client.post(reverse('login'), {'username': 'other', 'password': 'otherpass'})
+        self.assertEqual(response.status_code, 302)
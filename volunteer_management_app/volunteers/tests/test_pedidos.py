@@ -0,0 +1,306 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from django.test import SimpleTestCase
+
+from Requerimientos import (
+    DiarioPedidos, ErrorPedido, MatrizPedidos, ServicioPedidos, aplicar_descuento, facturar_lote,
+    leer_diario, leer_totales, pedidos_del_diario, recuperar, registro_factura,
+)
+
+
+class ServicioPedidosTests(SimpleTestCase):
+    def setUp(self):
+        self.servicio = ServicioPedidos()
+        self.servicio.agregar_producto('cafe', 1.10)
+        self.servicio.agregar_producto('empanada', 2.35)
+
+    def test_running_total_matches_lines(self):
+        numero = self.servicio.abrir_pedido()
+        self.servicio.agregar(numero, 'cafe', 3)
+        self.servicio.agregar(numero, 'empanada', 2)
+        self.assertEqual(self.servicio.quitar(numero, 'cafe', 1), 2)
+        self.assertEqual(self.servicio.total(numero), 2 * 110 + 2 * 235)
+
+        factura = self.servicio.facturar(numero, tiene_carne=True)
+        self.assertEqual(factura['total'], sum(subtotal for _, _, subtotal in factura['lineas']))
+        self.assertEqual(factura['total_final'], 690 - 69)
+
+    def test_removing_everything_drops_the_line(self):
+        numero = self.servicio.abrir_pedido()
+        self.servicio.agregar(numero, 'cafe', 2)
+        self.assertEqual(self.servicio.quitar(numero, 'cafe', 5), 0)
+        self.assertEqual(self.servicio.total(numero), 0)
+        with self.assertRaises(ErrorPedido):
+            self.servicio.quitar(numero, 'cafe', 1)
+
+    def test_price_is_fixed_when_added(self):
+        numero = self.servicio.abrir_pedido()
+        self.servicio.agregar(numero, 'cafe', 1)
+        self.servicio.agregar_producto('cafe', 5)
+        self.servicio.agregar(numero, 'cafe', 1)
+        self.assertEqual(self.servicio.total(numero), 220)
+
+    def test_billed_order_is_closed(self):
+        numero = self.servicio.abrir_pedido()
+        self.servicio.agregar(numero, 'cafe', 1)
+        self.servicio.facturar(numero, tiene_carne=False)
+        with self.assertRaises(ErrorPedido):
+            self.servicio.facturar(numero, tiene_carne=False)
+        with self.assertRaises(ErrorPedido):
+            self.servicio.agregar(numero, 'cafe', 1)
+
+    def test_unknown_product_and_bad_quantity(self):
+        numero = self.servicio.abrir_pedido()
+        with self.assertRaises(ErrorPedido):
+            self.servicio.agregar(numero, 'te', 1)
+        with self.assertRaises(ErrorPedido):
+            self.servicio.agregar(numero, 'cafe', 0)
+
+    def test_discount_rounds_to_the_cent(self):
+        self.assertEqual(aplicar_descuento(995, True), 995 - 100)
+        self.assertEqual(aplicar_descuento(995, False), 995)
+
+    def test_concurrent_orders(self):
+        compartido = self.servicio.abrir_pedido()
+        facturas = []
+
+        def cajero():
+            for _ in range(200):
+                numero = self.servicio.abrir_pedido()
+                self.servicio.agregar(numero, 'empanada', 1)
+                self.servicio.agregar(compartido, 'cafe', 1)
+                facturas.append(self.servicio.facturar(numero, tiene_carne=False))
+
+        hilos = [threading.Thread(target=cajero) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(len({factura['numero'] for factura in facturas}), 1600)
+        self.assertEqual(self.servicio.total(compartido), 1600 * 110)
+
+
+class DiarioPedidosTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.ruta = os.path.join(self.tmp, 'pedidos.jsonl')
+        self.ruta_totales = os.path.join(self.tmp, 'totales.json')
+        self.servicio = ServicioPedidos()
+        self.servicio.agregar_producto('cafe', 1.10)
+
+    def facturar(self, cantidad=1, momento=None):
+        numero = self.servicio.abrir_pedido()
+        self.servicio.agregar(numero, 'cafe', cantidad)
+        return registro_factura(self.servicio.facturar(numero, tiene_carne=False), momento)
+
+    def test_appends_and_replays(self):
+        diario = DiarioPedidos(self.ruta)
+        for cantidad in (1, 2, 3):
+            diario.agregar(self.facturar(cantidad))
+        diario.cerrar()
+
+        self.assertEqual([r['numero'] for r in leer_diario(self.ruta)], [1, 2, 3])
+        nuevo = ServicioPedidos()
+        dias = recuperar(nuevo, self.ruta, self.ruta_totales)
+        self.assertEqual(nuevo.abrir_pedido(), 4)
+        (dia,) = dias.values()
+        self.assertEqual(dia['pedidos'], 3)
+        self.assertEqual(dia['productos']['cafe'], [6, 660])
+
+    def test_torn_tail_is_dropped(self):
+        diario = DiarioPedidos(self.ruta)
+        diario.agregar(self.facturar())
+        diario.cerrar()
+        with open(self.ruta, 'ab') as f:
+            f.write(b'{"numero": 2, "fec')
+
+        diario = DiarioPedidos(self.ruta)
+        diario.agregar(self.facturar())
+        diario.cerrar()
+        self.assertEqual([r['numero'] for r in leer_diario(self.ruta)], [1, 2])
+
+    def test_failed_write_leaves_no_torn_line(self):
+        class EscrituraCortada:
+            def __init__(self, archivo):
+                self.archivo = archivo
+
+            def tell(self):
+                return self.archivo.tell()
+
+            def write(self, datos):
+                self.archivo.write(datos[:len(datos) // 2])
+                self.archivo.flush()
+                raise OSError('disco lleno')
+
+            def close(self):
+                self.archivo.close()
+
+        diario = DiarioPedidos(self.ruta)
+        diario.agregar(self.facturar())
+        diario._archivo = EscrituraCortada(diario._archivo)
+        with self.assertRaises(OSError):
+            diario.agregar(self.facturar())
+        diario.agregar(self.facturar())
+        diario.cerrar()
+        self.assertEqual([r['numero'] for r in leer_diario(self.ruta)], [1, 2, 3])
+
+    def test_group_commit_shares_fsyncs(self):
+        diario = DiarioPedidos(self.ruta)
+
+        def caja():
+            for _ in range(50):
+                diario.agregar({'numero': 0, 'fecha': '2026-01-01'})
+
+        hilos = [threading.Thread(target=caja) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        diario.cerrar()
+        self.assertEqual(len(list(leer_diario(self.ruta))), 400)
+        self.assertLessEqual(diario.fsyncs, 400)
+
+    def test_compaction_rolls_past_days_into_totals(self):
+        ayer = datetime.datetime(2026, 10, 18, 12, 0)
+        hoy = datetime.datetime(2026, 10, 19, 9, 0)
+        diario = DiarioPedidos(self.ruta)
+        diario.agregar(self.facturar(1, ayer))
+        diario.agregar(self.facturar(2, ayer))
+        diario.agregar(self.facturar(1, hoy))
+
+        self.assertEqual(diario.compactar(self.ruta_totales, hoy=hoy.date()), ['2026-10-18'])
+        diario.agregar(self.facturar(5, hoy))
+        diario.cerrar()
+
+        totales = leer_totales(self.ruta_totales)
+        self.assertEqual(totales['ultimo_numero'], 2)
+        self.assertEqual(totales['dias']['2026-10-18']['total'], 330)
+        self.assertEqual([r['numero'] for r in leer_diario(self.ruta)], [3, 4])
+
+        # Interrupted after writing the totals: compacting again must not double count.
+        with open(self.ruta, 'r+b') as f:
+            vigentes = f.read()
+            f.seek(0)
+            f.write(json.dumps(registro_factura({
+                'numero': 2, 'lineas': [('cafe', 2, 220)], 'total': 220, 'tiene_carne': False, 'total_final': 220,
+            }, ayer)).encode() + b'\n' + vigentes)
+        diario = DiarioPedidos(self.ruta)
+        diario.compactar(self.ruta_totales, hoy=hoy.date())
+        diario.cerrar()
+        self.assertEqual(leer_totales(self.ruta_totales)['dias']['2026-10-18']['pedidos'], 2)
+
+        nuevo = ServicioPedidos()
+        recuperar(nuevo, self.ruta, self.ruta_totales)
+        self.assertEqual(nuevo.abrir_pedido(), 5)
+
+    def test_order_billed_after_midnight_is_compacted(self):
+        anteayer = datetime.datetime(2026, 10, 17, 23, 50)
+        ayer = datetime.datetime(2026, 10, 18, 0, 10)
+        hoy = datetime.datetime(2026, 10, 19, 9, 0)
+        tardio = self.servicio.abrir_pedido()
+        self.servicio.agregar(tardio, 'cafe', 3)
+        diario = DiarioPedidos(self.ruta)
+        diario.agregar(self.facturar(1, anteayer))
+        diario.compactar(self.ruta_totales, hoy=ayer.date())
+        # Opened before midnight, so its number is lower than the compacted order's.
+        diario.agregar(registro_factura(self.servicio.facturar(tardio, tiene_carne=False), ayer))
+        self.assertEqual(diario.compactar(self.ruta_totales, hoy=hoy.date()), ['2026-10-18'])
+        diario.cerrar()
+
+        totales = leer_totales(self.ruta_totales)
+        self.assertEqual(totales['dias']['2026-10-18']['total'], 330)
+        self.assertEqual(totales['ultimo_numero'], 2)
+
+    def test_late_record_for_a_compacted_day_is_counted(self):
+        ayer = datetime.datetime(2026, 10, 18, 23, 59)
+        hoy = datetime.datetime(2026, 10, 19, 0, 0)
+        diario = DiarioPedidos(self.ruta)
+        diario.agregar(self.facturar(1, ayer))
+        diario.compactar(self.ruta_totales, hoy=hoy.date())
+        # Billed a moment before midnight but written after the compaction.
+        diario.agregar(self.facturar(2, ayer))
+        self.assertEqual(diario.compactar(self.ruta_totales, hoy=hoy.date()), ['2026-10-18'])
+        diario.cerrar()
+
+        dia = leer_totales(self.ruta_totales)['dias']['2026-10-18']
+        self.assertEqual(dia['pedidos'], 2)
+        self.assertEqual(dia['total'], 330)
+        self.assertEqual(list(leer_diario(self.ruta)), [])
+
+
+class FacturarLoteTests(SimpleTestCase):
+    def test_matches_per_order_billing(self):
+        servicio = ServicioPedidos()
+        for nombre, precio in (('cafe', 1.10), ('empanada', 2.35), ('jugo', 0.95)):
+            servicio.agregar_producto(nombre, precio)
+        pedidos = [
+            ({'cafe': 3, 'empanada': 1}, True),
+            ({}, False),
+            ({'jugo': 7}, False),
+            ({'empanada': 2, 'jugo': 1, 'cafe': 1}, True),
+        ]
+        facturas = []
+        for items, tiene_carne in pedidos:
+            numero = servicio.abrir_pedido()
+            for producto, cantidad in items.items():
+                servicio.agregar(numero, producto, cantidad)
+            facturas.append(servicio.facturar(numero, tiene_carne))
+
+        lote = facturar_lote(pedidos, servicio.menu())
+        self.assertEqual(lote['totales'].tolist(), [f['total'] for f in facturas])
+        self.assertEqual(lote['totales_finales'].tolist(), [f['total_final'] for f in facturas])
+        self.assertEqual(lote['total_final'], sum(f['total_final'] for f in facturas))
+        self.assertEqual(lote['ingresos'], {'cafe': 440, 'empanada': 705, 'jugo': 760})
+
+    def test_service_fills_the_day_matrix(self):
+        lote = MatrizPedidos()
+        servicio = ServicioPedidos(lote=lote)
+        servicio.agregar_producto('cafe', 1.10)
+        servicio.agregar_producto('jugo', 0.95)
+        finales = []
+        for cantidad in range(1, 6):
+            numero = servicio.abrir_pedido()
+            servicio.agregar(numero, 'cafe', cantidad)
+            servicio.agregar(numero, 'jugo', 1)
+            finales.append(servicio.facturar(numero, tiene_carne=cantidad % 2 == 0)['total_final'])
+
+        self.assertEqual(len(lote), 5)
+        resultado = facturar_lote(lote, servicio.menu())
+        self.assertEqual(resultado['totales_finales'].tolist(), finales)
+        self.assertEqual(resultado['unidades'], {'cafe': 15, 'jugo': 5})
+
+    def test_lines_keep_the_price_they_were_billed_at(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        ruta = os.path.join(tmp, 'pedidos.jsonl')
+        lote = MatrizPedidos()
+        servicio = ServicioPedidos(lote=lote)
+        servicio.agregar_producto('cafe', 1.10)
+        diario = DiarioPedidos(ruta)
+        finales = []
+        for precio in (1.10, 1.50):
+            servicio.agregar_producto('cafe', precio)
+            numero = servicio.abrir_pedido()
+            servicio.agregar(numero, 'cafe', 2)
+            factura = servicio.facturar(numero, tiene_carne=True)
+            finales.append(factura['total_final'])
+            diario.agregar(registro_factura(factura))
+        diario.cerrar()
+        servicio.agregar_producto('cafe', 2.00)
+
+        for matriz in (lote, pedidos_del_diario(ruta)):
+            resultado = facturar_lote(matriz)
+            self.assertEqual(resultado['totales'].tolist(), [220, 300])
+            self.assertEqual(resultado['totales_finales'].tolist(), finales)
+            self.assertEqual(resultado['ingresos'], {'cafe': 520})
+
+    def test_unknown_product(self):
+        with self.assertRaises(ErrorPedido):
+            facturar_lote([({'te': 1}, False)], {'cafe': 110})
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+
+from volunteers import profiling
+
+User = get_user_model()
+
+
+def slow_view(request):
+    time.sleep(0.05)
+    return HttpResponse('ok')
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.admin = User.objects.create_user(username='coord', password='pass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='pass', role='volunteer')
+        self.factory = RequestFactory()
+
+    def middleware(self, **config):
+        config = {'ENABLED': True, 'DIR': self.directory, 'INTERVAL': 0.001, **config}
+        with override_settings(PROFILING=config):
+            return profiling.ProfilingMiddleware(self.view)
+
+    def view(self, request):
+        # Stands in for URL resolution, which happens inside get_response.
+        request.resolver_match = resolve('/reports/activities/')
+        return slow_view(request)
+
+    def request(self, user, **headers):
+        request = self.factory.get('/reports/activities/', **headers)
+        request.user = user
+        return request
+
+    def profiled_views(self):
+        return os.listdir(self.directory)
+
+    def test_disabled_by_default(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            profiling.ProfilingMiddleware(self.view)
+
+    def test_header_is_admin_only(self):
+        middleware = self.middleware()
+        middleware(self.request(self.volunteer, HTTP_X_PROFILE='1'))
+        middleware(self.request(self.admin))
+        self.assertEqual(self.profiled_views(), [])
+
+        response = middleware(self.request(self.admin, HTTP_X_PROFILE='1'))
+        self.assertEqual(response.content, b'ok')
+        self.assertEqual(self.profiled_views(), ['activity_report'])
+        files = sorted(os.listdir(os.path.join(self.directory, 'activity_report')))
+        self.assertEqual([name.rsplit('.', 1)[1] for name in files], ['collapsed', 'prof'])
+
+        stacks = profiling.read_collapsed(os.path.join(self.directory, 'activity_report', files[0]))
+        self.assertTrue(any('test_profiling:slow_view' in stack for stack in stacks))
+        # The middleware's own frames are not part of the stacks.
+        self.assertFalse(any('ProfilingMiddleware' in stack for stack in stacks))
+
+    def test_sample_rate(self):
+        self.middleware(SAMPLE_RATE=1.0)(self.request(self.volunteer))
+        self.assertEqual(self.profiled_views(), ['activity_report'])
+
+    def test_categorize(self):
+        stacks = Counter({
+            'volunteers.views.staff:dashboard;django.template.base:Template.render;django.db.models.query:QuerySet.__iter__': 3,
+            'volunteers.views.staff:dashboard;django.template.base:Template.render': 2,
+            'volunteers.certificates:render;reportlab.pdfgen.canvas:Canvas.save': 4,
+            'volunteers.views.staff:dashboard': 1,
+        })
+        self.assertEqual(profiling.categorize(stacks), {'ORM': 3, 'Plantillas': 2, 'ReportLab': 4, 'Otro': 1})
+
+    def test_summary_command(self):
+        middleware = self.middleware(SAMPLE_RATE=1.0)
+        middleware(self.request(self.admin))
+        middleware(self.request(self.admin))
+        flamegraph = os.path.join(self.directory, 'all.collapsed')
+        out = StringIO()
+        call_command('profile_summary', dir=self.directory, flamegraph=flamegraph, stdout=out)
+        self.assertIn('activity_report: 2 solicitudes', out.getvalue())
+        self.assertIn('slow_view', out.getvalue())
+        self.assertTrue(all(stack.startswith('activity_report;') for stack in profiling.read_collapsed(flamegraph)))
@@ -0,0 +1,112 @@
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from volunteers.models import Activity, ActivitySeries, ActivityStats, Assignment, SeriesSubscription, WaitlistEntry
+from volunteers import recurrence
+from django.utils import timezone
+import datetime
+
+User = get_user_model()
+
+class RecurrenceTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='volpass', role='volunteer')
+        self.start = (timezone.now() + datetime.timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+
+    def make_series(self, **kwargs):
+        values = dict(
+            title='Comedor', description='Servir almuerzos', location='Centro',
+            required_volunteers=5, created_by=self.admin, start=self.start, frequency='weekly',
+        )
+        values.update(kwargs)
+        return ActivitySeries.objects.create(**values)
+
+    def test_weekly_rule_with_weekdays_and_exceptions(self):
+        start = datetime.datetime(2025, 1, 6, 9, tzinfo=datetime.timezone.utc)  # Monday
+        series = self.make_series(start=start, weekdays='0,2', exceptions=['2025-01-08'])
+        dates = list(recurrence.iter_occurrences(series, start, start + datetime.timedelta(days=14)))
+        self.assertEqual([d.date().isoformat() for d in dates], ['2025-01-06', '2025-01-13', '2025-01-15'])
+
+    def test_monthly_rule_skips_missing_days(self):
+        start = datetime.datetime(2025, 1, 31, 9, tzinfo=datetime.timezone.utc)
+        series = self.make_series(start=start, frequency='monthly', until=datetime.date(2025, 5, 31))
+        dates = list(recurrence.iter_occurrences(series, start, start + datetime.timedelta(days=365)))
+        self.assertEqual([d.month for d in dates], [1, 3, 5])
+
+    def test_year_of_occurrences_with_subscribers_in_few_queries(self):
+        series = self.make_series(required_volunteers=50)
+        volunteers = User.objects.bulk_create([
+            User(username=f'v{i}', role='volunteer') for i in range(50)
+        ])
+        SeriesSubscription.objects.bulk_create([SeriesSubscription(series=series, volunteer=v) for v in volunteers])
+
+        with CaptureQueriesContext(connection) as queries:
+            created = recurrence.generate_occurrences(series, until=self.start + datetime.timedelta(days=365))
+        self.assertEqual(created, 53)
+        # 2650 assignment rows; SQLite caps each INSERT at 999 parameters, hence ~14 batches.
+        self.assertLess(len(queries), 30)
+        self.assertEqual(Assignment.objects.filter(activity__series=series).count(), 53 * 50)
+        self.assertEqual(ActivityStats.objects.filter(activity__series=series, assigned_count=50).count(), 53)
+
+        # Extending the horizon is idempotent for rows already generated.
+        recurrence.generate_occurrences(series, until=self.start + datetime.timedelta(days=365))
+        self.assertEqual(series.occurrences.count(), 53)
+
+    def test_full_occurrences_queue_subscribers(self):
+        series = self.make_series(required_volunteers=2)
+        volunteers = [User.objects.create_user(username=f'v{i}', role='volunteer') for i in range(3)]
+        for volunteer in volunteers:
+            SeriesSubscription.objects.create(series=series, volunteer=volunteer)
+        recurrence.generate_occurrences(series, until=self.start + datetime.timedelta(days=14))
+        occurrences = list(series.occurrences.all())
+        self.assertEqual(len(occurrences), 2)
+        for activity in occurrences:
+            self.assertEqual(Assignment.objects.filter(activity=activity).count(), 2)
+            self.assertEqual(list(activity.waitlist.values_list('volunteer__username', 'position')), [('v2', 1)])
+
+        # A later subscriber queues behind them instead of taking a seat.
+        *_, enrollment = recurrence.subscribe(series, self.volunteer)
+        self.assertEqual(enrollment.assigned, [])
+        self.assertEqual(len(enrollment.waitlisted), 2)
+        self.assertEqual(WaitlistEntry.objects.filter(volunteer=self.volunteer, position=2).count(), 2)
+
+        recurrence.unsubscribe(series, self.volunteer)
+        self.assertFalse(WaitlistEntry.objects.filter(volunteer=self.volunteer).exists())
+
+    def test_occurrences_that_clash_are_skipped(self):
+        series = self.make_series()
+        recurrence.generate_occurrences(series, until=self.start + datetime.timedelta(days=14))
+        first, second = series.occurrences.order_by('date')
+        other = Activity.objects.create(
+            title='Feria', description='-', location='Plaza', date=first.date - datetime.timedelta(hours=1),
+            end_date=first.date + datetime.timedelta(hours=1), required_volunteers=5, created_by=self.admin,
+        )
+        Assignment.objects.create(volunteer=self.volunteer, activity=other)
+
+        *_, enrollment = recurrence.subscribe(series, self.volunteer)
+        self.assertEqual(enrollment.conflicts, [(first.id, self.volunteer.id)])
+        self.assertEqual(enrollment.assigned, [(second.id, self.volunteer.id)])
+        self.assertFalse(Assignment.objects.filter(activity=first, volunteer=self.volunteer).exists())
+
+    def test_subscribe_and_unsubscribe_views(self):
+        series = self.make_series()
+        recurrence.generate_occurrences(series, until=self.start + datetime.timedelta(days=28))
+        self.client.login(username='vol', password='volpass')
+        self.client.get(reverse('subscribe_series', args=[series.id]))
+        self.assertEqual(Assignment.objects.filter(volunteer=self.volunteer, status='assigned').count(), 4)
+        self.client.get(reverse('unsubscribe_series', args=[series.id]))
+        self.assertEqual(Assignment.objects.filter(volunteer=self.volunteer, status='cancelled').count(), 4)
+
+    def test_create_series_view(self):
+        self.client.login(username='admin', password='adminpass')
+        response = self.client.post(reverse('create_series'), {
+            'title': 'Limpieza', 'description': 'Playa', 'location': 'Costa',
+            'start': self.start.strftime('%Y-%m-%d %H:%M:%S'), 'required_volunteers': 3,
+            'frequency': 'daily', 'interval': 7, 'exceptions': '',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Activity.objects.filter(title='Limpieza', series__isnull=False).exists())
@@ -0,0 +1,54 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from volunteers.models import Activity, Assignment, ReminderDelivery
+from volunteers.reminders import parse_window, send_due_reminders
+from django.utils import timezone
+import datetime
+import io
+
+User = get_user_model()
+
+class ReminderTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.volunteers = [
+            User.objects.create_user(username=f'vol{i}', password='pass', role='volunteer', email=f'vol{i}@example.com')
+            for i in range(3)
+        ]
+        self.now = timezone.now()
+
+    def make_activity(self, hours_ahead):
+        activity = Activity.objects.create(
+            title=f'En {hours_ahead}h', description='-', location='Parque',
+            date=self.now + datetime.timedelta(hours=hours_ahead),
+            required_volunteers=5, created_by=self.admin
+        )
+        for volunteer in self.volunteers:
+            Assignment.objects.create(volunteer=volunteer, activity=activity)
+        return activity
+
+    def test_windows_form_bands_and_are_idempotent(self):
+        self.make_activity(30)
+        self.make_activity(1)
+        self.make_activity(72)
+        Assignment.objects.filter(volunteer=self.volunteers[2], activity__title='En 30h').update(status='cancelled')
+
+        sent = send_due_reminders(['48h', '2h'], batch_size=2, now=self.now)
+        self.assertEqual(sent, 5)
+        self.assertEqual(ReminderDelivery.objects.filter(window='48h').count(), 2)
+        self.assertEqual(ReminderDelivery.objects.filter(window='2h').count(), 3)
+
+        # A restarted scheduler does not resend.
+        self.assertEqual(send_due_reminders(['48h', '2h'], now=self.now), 0)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_command_and_window_parsing(self):
+        self.make_activity(1)
+        out = io.StringIO()
+        call_command('send_activity_reminders', windows='2h', stdout=out)
+        self.assertIn('3 recordatorios', out.getvalue())
+        self.assertEqual(parse_window('30m'), datetime.timedelta(minutes=30))
+        with self.assertRaises(ValueError):
+            parse_window('2 weeks')
@@ -0,0 +1,90 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from volunteers import schedule
+from volunteers.forms import ActivityForm
+from volunteers.models import Activity, Assignment
+
+User = get_user_model()
+
+
+class ScheduleTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='coord', password='pass', role='admin')
+        self.volunteer = User.objects.create_user(username='vol', password='pass', role='volunteer')
+        self.start = (timezone.now() + datetime.timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+
+    def activity(self, title, offset_hours, hours=None):
+        date = self.start + datetime.timedelta(hours=offset_hours)
+        end_date = date + datetime.timedelta(hours=hours) if hours is not None else None
+        return Activity.objects.create(
+            title=title, description='-', location='Parque', date=date, end_date=end_date,
+            required_volunteers=5, created_by=self.admin,
+        )
+
+    def test_end_date_defaults_to_duration(self):
+        activity = self.activity('Sin fin', 0)
+        self.assertEqual(activity.end_date, activity.date + datetime.timedelta(hours=2))
+
+    def test_enrollment_rejects_overlap(self):
+        morning = self.activity('Mañana', 0, hours=3)
+        overlapping = self.activity('Cruce', 2, hours=2)
+        adjacent = self.activity('Después', 3, hours=1)
+        Assignment.objects.create(volunteer=self.volunteer, activity=morning)
+        self.client.login(username='vol', password='pass')
+
+        self.client.get(reverse('inscribe_activity', args=[overlapping.id]))
+        self.assertFalse(Assignment.objects.filter(activity=overlapping).exists())
+
+        # Back-to-back activities do not overlap.
+        self.client.get(reverse('inscribe_activity', args=[adjacent.id]))
+        self.assertTrue(Assignment.objects.filter(activity=adjacent, volunteer=self.volunteer).exists())
+
+        # A cancelled assignment frees the slot.
+        Assignment.objects.filter(activity=morning).update(status='cancelled')
+        self.client.get(reverse('inscribe_activity', args=[overlapping.id]))
+        self.assertFalse(Assignment.objects.filter(activity=overlapping).exists())
+        Assignment.objects.filter(activity=adjacent).update(status='cancelled')
+        self.client.get(reverse('inscribe_activity', args=[overlapping.id]))
+        self.assertTrue(Assignment.objects.filter(activity=overlapping).exists())
+
+    def test_find_conflicts_sweep(self):
+        other = User.objects.create_user(username='otro', password='pass', role='volunteer')
+        long_one = self.activity('Larga', 0, hours=10)
+        inside = self.activity('Dentro', 1, hours=1)
+        later = self.activity('Tarde', 5, hours=1)
+        after = self.activity('Después', 10, hours=1)
+        for activity in (long_one, inside, later, after):
+            Assignment.objects.create(volunteer=self.volunteer, activity=activity)
+        # Overlapping activities held by different volunteers are not conflicts.
+        Assignment.objects.create(volunteer=other, activity=inside)
+
+        with self.assertNumQueries(1):
+            pairs = {(a.activity.title, b.activity.title) for a, b in schedule.find_conflicts()}
+        self.assertEqual(pairs, {('Larga', 'Dentro'), ('Larga', 'Tarde')})
+        self.assertEqual(schedule.find_conflicts(since=self.start + datetime.timedelta(hours=20)), [])
+
+    def test_form_rejects_end_before_start(self):
+        form = ActivityForm(data={
+            'title': 'X', 'description': '-', 'location': 'Parque', 'required_volunteers': 1,
+            'date': '2030-01-01T10:00', 'end_date': '2030-01-01T09:00',
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('end_date', form.errors)
+
+    def test_conflict_report_is_admin_only(self):
+        first = self.activity('Uno', 0, hours=2)
+        second = self.activity('Dos', 1, hours=2)
+        Assignment.objects.create(volunteer=self.volunteer, activity=first)
+        Assignment.objects.create(volunteer=self.volunteer, activity=second)
+
+        self.client.login(username='vol', password='pass')
+        self.assertEqual(self.client.get(reverse('schedule_conflicts')).status_code, 403)
+        self.client.login(username='coord', password='pass')
+        response = self.client.get(reverse('schedule_conflicts'))
+        self.assertEqual(len(response.context['conflicts']), 1)
+        self.assertContains(response, 'Dos')
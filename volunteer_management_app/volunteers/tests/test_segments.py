@@ -0,0 +1,123 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from volunteers import audit, segments, views
+from volunteers.forms import NotificationForm
+from volunteers.models import Activity, Assignment, Attendance, AuditEvent, Notification
+
+User = get_user_model()
+
+
+class SegmentParserTests(TestCase):
+    def test_precedence(self):
+        self.assertEqual(
+            segments.parse('NOT upcoming OR interest:Educación and attended:30'),
+            ('or', ('not', ('term', 'upcoming', None)),
+             ('and', ('term', 'interest', 'educacion'), ('term', 'attended', 30))),
+        )
+        self.assertEqual(segments.parse('(all)'), ('term', 'all', None))
+
+    def test_errors(self):
+        for expression in ('', 'foo:1', 'attended:x', 'upcoming:1', 'interest:a b', '(all', 'all )', 'all AND', 'all all'):
+            with self.subTest(expression=expression), self.assertRaises(segments.SegmentError):
+                segments.parse(expression)
+
+
+class SegmentTests(TestCase):
+    def setUp(self):
+        segments.reset_index()
+        self.addCleanup(segments.reset_index)
+        # Recipients are audited; start each test with an empty buffer.
+        audit.reset_buffer()
+        self.addCleanup(audit.reset_buffer)
+        self.admin = User.objects.create_user(username='coord', password='pass', role='admin')
+        now = timezone.now()
+        self.past = Activity.objects.create(
+            title='Limpieza', description='-', location='Parque', date=now - datetime.timedelta(days=20),
+            required_volunteers=10, created_by=self.admin,
+        )
+        self.old = Activity.objects.create(
+            title='Antigua', description='-', location='Parque', date=now - datetime.timedelta(days=200),
+            required_volunteers=10, created_by=self.admin,
+        )
+        self.future = Activity.objects.create(
+            title='Siembra', description='-', location='Parque', date=now + datetime.timedelta(days=5),
+            required_volunteers=10, created_by=self.admin,
+        )
+        self.ana = self.volunteer('ana', 'Medio ambiente, educación')
+        self.beto = self.volunteer('beto', 'ambiente')
+        self.caro = self.volunteer('caro', 'Salud')
+        self.dani = self.volunteer('dani', 'AMBIENTE y reciclaje')
+        self.attend(self.ana, self.past)
+        self.attend(self.beto, self.past)
+        self.attend(self.dani, self.old)
+        Assignment.objects.create(volunteer=self.beto, activity=self.future)
+        Assignment.objects.create(volunteer=self.caro, activity=self.future, status='cancelled')
+
+    def volunteer(self, username, interests):
+        return User.objects.create_user(username=username, password='pass', role='volunteer',
+                                        email=f'{username}@example.com', areas_of_interest=interests)
+
+    def attend(self, volunteer, activity):
+        assignment = Assignment.objects.create(volunteer=volunteer, activity=activity)
+        Attendance.objects.create(assignment=assignment, attended=True, hours=2)
+
+    def ids(self, expression):
+        return segments.volunteer_ids(expression)
+
+    def test_terms(self):
+        self.assertEqual(self.ids('interest:ambiente'), [self.ana.pk, self.beto.pk, self.dani.pk])
+        self.assertEqual(self.ids('interest:EDUCACION'), [self.ana.pk])
+        self.assertEqual(self.ids('interest:deporte'), [])
+        self.assertEqual(self.ids('attended:90'), [self.ana.pk, self.beto.pk])
+        self.assertEqual(self.ids('attended:365'), [self.ana.pk, self.beto.pk, self.dani.pk])
+        self.assertEqual(self.ids('upcoming'), [self.beto.pk])
+        self.assertEqual(self.ids('activity:%d' % self.past.pk), [self.ana.pk, self.beto.pk])
+        self.assertEqual(len(self.ids('all')), 4)
+
+    def test_expression(self):
+        self.assertEqual(self.ids('interest:ambiente AND attended:90 AND NOT upcoming'), [self.ana.pk])
+        self.assertEqual(self.ids('NOT (interest:ambiente OR upcoming)'), [self.caro.pk])
+
+    def test_index_is_reused(self):
+        segments.get_index()
+        with self.assertNumQueries(0):
+            self.ids('interest:ambiente AND NOT attended:90')
+
+    def test_form_validates_segment(self):
+        form = NotificationForm(data={'activity': self.future.pk, 'message': 'Hola', 'segment': 'interest:'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('segment', form.errors)
+
+    def test_notification_to_segment(self):
+        request = RequestFactory().post('/', {
+            'activity': self.future.pk, 'message': 'Nueva jornada', 'segment': 'interest:ambiente AND NOT upcoming',
+        })
+        request.user = self.admin
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = views.send_notification(request)
+        self.assertEqual(response.status_code, 302)
+        notification = Notification.objects.get()
+        self.assertEqual(set(notification.recipients.values_list('pk', flat=True)), {self.ana.pk, self.dani.pk})
+        # Recipients go through the m2m signal, so each one is audited.
+        audit.flush()
+        self.assertEqual(AuditEvent.objects.filter(kind=AuditEvent.NOTIFIED).count(), 2)
+
+    def test_dashboard_notification_honours_segment(self):
+        request = RequestFactory().post('/', {
+            'activity': self.future.pk, 'message': 'Nueva jornada', 'segment': 'interest:ambiente AND NOT upcoming',
+        })
+        request.user = self.admin
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = views.admin_volunteer_dashboard(request)
+        self.assertEqual(response.status_code, 302)
+        notification = Notification.objects.get()
+        self.assertEqual(set(notification.recipients.values_list('pk', flat=True)), {self.ana.pk, self.dani.pk})
@@ -0,0 +1,21 @@
+from django.test import SimpleTestCase
+from pathlib import Path
+import subprocess
+import sys
+
+SCRIPT = Path(__file__).resolve().parents[2] / 'scripts' / 'check_import_time.py'
+
+
+class StartupImportsTestCase(SimpleTestCase):
+    def test_heavy_libraries_are_not_imported_at_startup(self):
+        # Boots a fresh interpreter: this process has already imported everything.
+        result = subprocess.run([sys.executable, str(SCRIPT), '--top', '0'], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertNotIn('FAIL', result.stdout)
+
+    def test_certificate_rendering_still_works(self):
+        from types import SimpleNamespace
+        from volunteers.certificates import render_certificate_pdf
+
+        volunteer = SimpleNamespace(username='vol', get_full_name=lambda: 'Ana Pérez')
+        self.assertTrue(render_certificate_pdf(volunteer, 5).startswith(b'%PDF'))
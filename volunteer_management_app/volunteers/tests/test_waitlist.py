@@ -0,0 +1,131 @@
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core import mail
+from volunteers import audit, jobs
+from volunteers.models import Activity, Assignment, Job, WaitlistEntry
+from volunteers.waitlist import join_waitlist
+from django.utils import timezone
+import datetime
+
+User = get_user_model()
+
+@override_settings(WAITLIST_ASYNC=False)
+class WaitlistTestCase(TestCase):
+    def setUp(self):
+        # Enrollments committed through captureOnCommitCallbacks are audited.
+        audit.reset_buffer()
+        self.addCleanup(audit.reset_buffer)
+        self.client = Client()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.first = User.objects.create_user(username='first', password='pass', role='volunteer', email='first@example.com')
+        self.second = User.objects.create_user(username='second', password='pass', role='volunteer', email='second@example.com')
+        self.third = User.objects.create_user(username='third', password='pass', role='volunteer', email='third@example.com')
+        self.activity = Activity.objects.create(
+            title='Banco de alimentos', description='-', location='Bodega',
+            date=timezone.now() + datetime.timedelta(days=2),
+            required_volunteers=1, created_by=self.admin
+        )
+
+    def test_full_activity_queues_in_order(self):
+        for user in (self.first, self.second, self.third):
+            self.client.login(username=user.username, password='pass')
+            self.client.get(reverse('inscribe_activity', args=[self.activity.id]))
+        self.assertEqual(Assignment.objects.filter(activity=self.activity).count(), 1)
+        queue = list(WaitlistEntry.objects.filter(activity=self.activity).values_list('volunteer__username', 'position'))
+        self.assertEqual(queue, [('second', 1), ('third', 2)])
+
+    def test_queue_keeps_freed_seat_from_newcomers(self):
+        assignment = Assignment.objects.create(volunteer=self.first, activity=self.activity)
+        join_waitlist(self.activity, self.second)
+        # Cancelled, but the promotion pass has not run yet.
+        Assignment.objects.filter(pk=assignment.pk).update(status='cancelled')
+
+        self.client.login(username='third', password='pass')
+        self.client.get(reverse('inscribe_activity', args=[self.activity.id]))
+        self.assertFalse(Assignment.objects.filter(volunteer=self.third).exists())
+        queue = list(WaitlistEntry.objects.filter(activity=self.activity).values_list('volunteer__username', flat=True))
+        self.assertEqual(queue, ['second', 'third'])
+
+    def test_cancellation_promotes_head_of_queue(self):
+        assignment = Assignment.objects.create(volunteer=self.first, activity=self.activity)
+        join_waitlist(self.activity, self.second)
+        join_waitlist(self.activity, self.third)
+
+        self.client.login(username='first', password='pass')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('cancel_assignment', args=[assignment.id]))
+
+        self.assertTrue(Assignment.objects.filter(volunteer=self.second, activity=self.activity, status='assigned').exists())
+        self.assertEqual(list(WaitlistEntry.objects.values_list('volunteer__username', flat=True)), ['third'])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['second@example.com'])
+
+    def test_promotion_skips_volunteers_booked_elsewhere(self):
+        assignment = Assignment.objects.create(volunteer=self.first, activity=self.activity)
+        join_waitlist(self.activity, self.second)
+        join_waitlist(self.activity, self.third)
+        overlapping = Activity.objects.create(
+            title='Feria', description='-', location='Plaza',
+            date=self.activity.date + datetime.timedelta(minutes=30),
+            required_volunteers=5, created_by=self.admin
+        )
+        Assignment.objects.create(volunteer=self.second, activity=overlapping)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.status = 'cancelled'
+            assignment.save()
+
+        self.assertFalse(Assignment.objects.filter(volunteer=self.second, activity=self.activity).exists())
+        self.assertTrue(Assignment.objects.filter(volunteer=self.third, activity=self.activity, status='assigned').exists())
+        self.assertFalse(WaitlistEntry.objects.exists())
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['second@example.com', 'third@example.com'])
+        self.assertIn('Feria', next(m.body for m in mail.outbox if m.to == ['second@example.com']))
+
+
+class PromotionJobTestCase(TestCase):
+    def setUp(self):
+        audit.reset_buffer()
+        self.addCleanup(audit.reset_buffer)
+        self.admin = User.objects.create_user(username='admin', password='adminpass', role='admin')
+        self.first = User.objects.create_user(username='first', password='pass', role='volunteer')
+        self.second = User.objects.create_user(username='second', password='pass', role='volunteer')
+        self.activity = Activity.objects.create(
+            title='Banco de alimentos', description='-', location='Bodega',
+            date=timezone.now() + datetime.timedelta(days=2),
+            required_volunteers=1, created_by=self.admin
+        )
+
+    def run_jobs(self):
+        while True:
+            job = jobs.claim_job('test')
+            if job is None:
+                return
+            jobs.run_job(job)
+
+    @override_settings(WAITLIST_ASYNC=True, WAITLIST_COALESCE_SECONDS=0)
+    def test_burst_is_one_durable_job(self):
+        assignment = Assignment.objects.create(volunteer=self.first, activity=self.activity)
+        join_waitlist(self.activity, self.second)
+        for _ in range(3):
+            assignment.status = 'assigned'
+            assignment.save()
+            assignment.status = 'cancelled'
+            assignment.save()
+        self.assertEqual(Job.objects.filter(task='promote_waitlist').count(), 1)
+
+        self.run_jobs()
+        self.assertTrue(Assignment.objects.filter(volunteer=self.second, status='assigned').exists())
+        self.assertFalse(WaitlistEntry.objects.exists())
+
+    @override_settings(WAITLIST_ASYNC=True, WAITLIST_COALESCE_SECONDS=0)
+    def test_joining_a_queue_with_free_seats_schedules_promotion(self):
+        # A queue left behind by a lost promotion pass, with the seat free.
+        WaitlistEntry.objects.create(activity=self.activity, volunteer=self.first, position=1)
+        join_waitlist(self.activity, self.second)
+        self.run_jobs()
+        self.assertEqual(
+            list(Assignment.objects.filter(activity=self.activity).values_list('volunteer__username', flat=True)),
+            ['first'],
+        )
+        self.assertEqual(list(WaitlistEntry.objects.values_list('volunteer__username', flat=True)), ['second'])
@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOGIN_THROTTLE = {
+    # 'local' keeps buckets in this process; 'cache' shares them through CACHE_ALIAS.
+    'BACKEND': 'local',
+    'CACHE_ALIAS': 'default',
+    # (burst capacity, seconds to refill one token)
+    'IP_RATE': (30, 2.0),
+    'USERNAME_RATE': (10, 30.0),
+    'MAX_LOCAL_KEYS': 100000,
+}
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def _record(event):
+    with _metrics_lock:
+        _metrics[event] += 1
+
+
+def throttle_metrics():
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+def reset_throttle_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _refill(tokens, last, now, capacity, refill_seconds):
+    return min(capacity, tokens + (now - last) / refill_seconds)
+
+
+class LocalRateLimiter:
+    """Token buckets held in a dict; correct within one worker process.
+
+    Beyond max_keys the least recently used buckets are evicted, so a flood of
+    new keys cannot reset the buckets of keys that are still being hit.
+    """
+
+    def __init__(self, capacity, refill_seconds, max_keys=100000, clock=time.monotonic):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = self.clock()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.capacity, now))
+            tokens = _refill(tokens, last, now, self.capacity, self.refill_seconds)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if key in self._buckets:
+                self._buckets.move_to_end(key)
+            elif len(self._buckets) >= self.max_keys:
+                self._prune()
+            self._buckets[key] = (tokens, now)
+            return allowed
+
+    def retry_after(self, key):
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.capacity, self.clock()))
+        return max(0.0, (1 - tokens) * self.refill_seconds)
+
+    def _prune(self):
+        while len(self._buckets) >= self.max_keys:
+            self._buckets.popitem(last=False)
+
+
+class CacheRateLimiter:
+    """Token buckets stored in a Django cache so all workers share them.
+
+    The read-modify-write is not atomic; under contention a few extra attempts
+    may slip through, which is acceptable for flood protection.
+    """
+
+    def __init__(self, capacity, refill_seconds, cache_alias='default', prefix='login-throttle', clock=time.time):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.cache = caches[cache_alias]
+        self.prefix = prefix
+        self.clock = clock
+
+    def _key(self, key):
+        return f'{self.prefix}:{key}'
+
+    def allow(self, key):
+        now = self.clock()
+        tokens, last = self.cache.get(self._key(key), (self.capacity, now))
+        tokens = _refill(tokens, last, now, self.capacity, self.refill_seconds)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.cache.set(self._key(key), (tokens, now), int(self.capacity * self.refill_seconds) + 1)
+        return allowed
+
+    def retry_after(self, key):
+        tokens, last = self.cache.get(self._key(key), (self.capacity, self.clock()))
+        return max(0.0, (1 - tokens) * self.refill_seconds)
+
+
+def _build_limiter(scope, config):
+    capacity, refill_seconds = config[f'{scope}_RATE']
+    if config['BACKEND'] == 'cache':
+        return CacheRateLimiter(capacity, refill_seconds, cache_alias=config['CACHE_ALIAS'],
+                                prefix=f'login-throttle:{scope.lower()}')
+    return LocalRateLimiter(capacity, refill_seconds, max_keys=config['MAX_LOCAL_KEYS'])
+
+
+class LoginThrottle:
+    def __init__(self, config=None):
+        config = {**DEFAULT_LOGIN_THROTTLE, **(config or {})}
+        self.by_ip = _build_limiter('IP', config)
+        self.by_username = _build_limiter('USERNAME', config)
+
+    def check(self, ip, username):
+        """Return 0 if the attempt may proceed, otherwise the seconds to wait."""
+        if not self.by_ip.allow(ip):
+            _record('rejected_ip')
+            # Debug only: a flood would otherwise turn into a log flood.
+            logger.debug('Login throttled for ip=%s', ip)
+            return self.by_ip.retry_after(ip)
+        if username and not self.by_username.allow(username):
+            _record('rejected_username')
+            logger.debug('Login throttled for username=%s ip=%s', username, ip)
+            return self.by_username.retry_after(username)
+        _record('allowed')
+        return 0
+
+
+_login_throttle = None
+_login_throttle_lock = threading.Lock()
+
+
+def get_login_throttle():
+    global _login_throttle
+    if _login_throttle is None:
+        with _login_throttle_lock:
+            if _login_throttle is None:
+                _login_throttle = LoginThrottle(getattr(settings, 'LOGIN_THROTTLE', None))
+    return _login_throttle
+
+
+def reset_login_throttle():
+    global _login_throttle
+    with _login_throttle_lock:
+        _login_throttle = None
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path('', views.home, name='home'),
@@ -9,12 +9,30 @@ urlpatterns = [
     path('dashboard/', views.dashboard, name='dashboard'),
     path('admin/volunteers/', views.admin_volunteer_dashboard, name='admin_volunteer_dashboard'),
     path('create_activity/', views.create_activity, name='create_activity'),
+    path('create_series/', views.create_series, name='create_series'),
+    path('series/<int:series_id>/subscribe/', views.subscribe_series, name='subscribe_series'),
+    path('series/<int:series_id>/unsubscribe/', views.unsubscribe_series, name='unsubscribe_series'),
     path('inscribe/<int:activity_id>/', views.inscribe_activity, name='inscribe_activity'),
+    path('assignments/<int:assignment_id>/cancel/', views.cancel_assignment, name='cancel_assignment'),
+    path('waitlist/<int:activity_id>/leave/', views.leave_waitlist, name='leave_waitlist'),
     path('record_attendance/<int:assignment_id>/', views.record_attendance, name='record_attendance'),
+    path('checkin/code/<int:assignment_id>/', views.checkin_code, name='checkin_code'),
+    path('checkin/kiosk/<int:activity_id>/', views.checkin_kiosk, name='checkin_kiosk'),
+    path('checkin/kiosk/<int:activity_id>/scan/', views.checkin_scan, name='checkin_scan'),
     path('activity-history/', views.volunteer_activity_history, name='volunteer_activity_history'),
     path('admin/volunteers/list/', views.admin_volunteer_list, name='admin_volunteer_list'),
     path('admin/volunteer/<int:volunteer_id>/', views.admin_volunteer_profile, name='admin_volunteer_profile'),
     path('admin/certificates/', views.admin_certificate_eligibility, name='admin_certificate_eligibility'),
     path('admin/certificate/<int:volunteer_id>/', views.generate_certificate, name='generate_certificate'),
     path('admin/send_notification/', views.send_notification, name='send_notification'),
+    path('reports/activities/', views.activity_report, name='activity_report'),
+    path('reports/hours/', views.hours_analytics, name='hours_analytics'),
+    path('reports/conflicts/', views.schedule_conflicts, name='schedule_conflicts'),
+    path('api/v1/activities/', api.activity_list, name='api_activity_list'),
+    path('api/v1/me/assignments/', api.my_assignments, name='api_my_assignments'),
+    path('api/v1/me/notifications/', api.my_notifications, name='api_my_notifications'),
+    path('api/v1/activities/<int:activity_id>/attendance/sync/', api.attendance_sync, name='api_attendance_sync'),
+    path('lookups/activities/', views.activity_lookup, name='activity_lookup'),
+    path('lookups/volunteers/', views.volunteer_lookup, name='volunteer_lookup'),
+    path('jobs/', views.job_status, name='job_status'),
 ]
@@ -0,0 +1,15 @@
+"""Views, split by area. Each module imports only what its views need, so heavy
+libraries (ReportLab, NumPy) are loaded on first use rather than at startup."""
+from .accounts import register, user_login, user_logout
+from .activities import (
+    cancel_assignment, create_activity, create_series, dashboard, home, inscribe_activity,
+    leave_waitlist, record_attendance, subscribe_series, unsubscribe_series,
+)
+from .certificates import admin_certificate_eligibility, generate_certificate
+from .checkin import checkin_code, checkin_kiosk, checkin_scan
+from .lookups import LOOKUP_PAGE_SIZE, activity_lookup, volunteer_lookup
+from .reports import ACTIVITY_REPORT_SORTS, activity_report, hours_analytics, schedule_conflicts
+from .staff import (
+    admin_volunteer_dashboard, admin_volunteer_list, admin_volunteer_profile, job_status,
+    send_notification, volunteer_activity_history,
+)
@@ -0,0 +1,54 @@
+import logging
+
+from django.contrib import messages
+from django.contrib.auth import login, logout
+from django.shortcuts import redirect, render
+
+from ..forms import CustomAuthenticationForm, CustomUserCreationForm
+from ..throttle import get_login_throttle
+
+logger = logging.getLogger(__name__)
+
+def register(request):
+    if request.method == 'POST':
+        form = CustomUserCreationForm(request.POST)
+        if form.is_valid():
+            user = form.save()
+            login(request, user)
+            messages.success(request, 'Registro exitoso.')
+            return redirect('dashboard')
+        else:
+            messages.error(request, 'Por favor corrija los errores en el formulario.')
+    else:
+        form = CustomUserCreationForm()
+    return render(request, 'volunteers/register.html', {'form': form})
+
+def user_login(request):
+    if request.method == 'POST':
+        # Throttle before the form runs authenticate() and its password hashing.
+        username = (request.POST.get('username') or '').strip().lower()
+        retry_after = get_login_throttle().check(request.META.get('REMOTE_ADDR', ''), username)
+        if retry_after:
+            messages.error(request, 'Demasiados intentos de inicio de sesión. Intente de nuevo más tarde.')
+            response = render(request, 'volunteers/login.html', {'form': CustomAuthenticationForm()}, status=429)
+            response['Retry-After'] = str(int(retry_after) + 1)
+            return response
+        form = CustomAuthenticationForm(request, data=request.POST)
+        if form.is_valid():
+            user = form.get_user()
+            if user is not None and user.is_active:
+                login(request, user)
+                return redirect('dashboard')
+            else:
+                messages.error(request, 'Cuenta inactiva o inválida.')
+                logger.warning('Inactive or invalid account login attempt username=%s', username)
+        else:
+            messages.error(request, 'Nombre de usuario o contraseña incorrectos.')
+            logger.warning('Login failed username=%s fields=%s', username, list(form.errors))
+    else:
+        form = CustomAuthenticationForm()
+    return render(request, 'volunteers/login.html', {'form': form})
+
+def user_logout(request):
+    logout(request)
+    return redirect('home')
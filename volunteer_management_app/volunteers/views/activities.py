@@ -0,0 +1,217 @@
+import logging
+from decimal import Decimal, InvalidOperation
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from .. import jobs, recurrence, schedule, waitlist
+from ..checkin import checkin_uuid
+from ..forms import ActivityForm, ActivitySeriesForm
+from ..models import Activity, ActivitySeries, Assignment, Attendance, WaitlistEntry
+
+logger = logging.getLogger(__name__)
+
+def home(request):
+    activities = Activity.objects.filter(date__gte=timezone.now()).order_by('date')
+    assigned_activity_ids = []
+    if request.user.is_authenticated:
+        assigned_activity_ids = list(request.user.assignments.values_list('activity_id', flat=True))
+    return render(request, 'volunteers/home.html', {'activities': activities, 'assigned_activity_ids': assigned_activity_ids})
+
+@login_required
+def dashboard(request):
+    user = request.user
+    assigned_activity_ids = list(user.assignments.values_list('activity_id', flat=True))
+    if user.role.lower() == 'admin':
+        activities = Activity.objects.filter(created_by=user)
+        assignments = Assignment.objects.filter(activity__created_by=user)
+    else:
+        assignments = Assignment.objects.filter(volunteer=user)
+        activities = Activity.objects.all()
+    waitlist_entries = WaitlistEntry.objects.filter(volunteer=user).select_related('activity')
+    return render(request, 'volunteers/dashboard.html', {
+        'activities': activities,
+        'assignments': assignments,
+        'assigned_activity_ids': assigned_activity_ids,
+        'waitlist_entries': waitlist_entries,
+    })
+
+@login_required
+def create_activity(request):
+    if request.user.role.lower() != 'admin':
+        return redirect('dashboard')
+    if request.method == 'POST':
+        form = ActivityForm(request.POST)
+        if form.is_valid():
+            activity = form.save(commit=False)
+            activity.created_by = request.user
+            try:
+                activity.save()
+                messages.success(request, 'Actividad creada exitosamente.')
+                return redirect('dashboard')
+            except Exception as e:
+                messages.error(request, 'Error al crear la actividad: ' + str(e))
+                logger.error('Error saving activity error=%s', e)
+        else:
+            messages.error(request, 'Por favor corrija los errores en el formulario.')
+    else:
+        form = ActivityForm()
+    return render(request, 'volunteers/create_activity.html', {'form': form})
+
+@login_required
+def create_series(request):
+    if request.user.role.lower() != 'admin':
+        return redirect('dashboard')
+    if request.method == 'POST':
+        form = ActivitySeriesForm(request.POST)
+        if form.is_valid():
+            series = form.save(commit=False)
+            series.created_by = request.user
+            series.save()
+            created = recurrence.generate_occurrences(series)
+            messages.success(request, f'Serie creada con {created} actividades programadas.')
+            return redirect('dashboard')
+        else:
+            messages.error(request, 'Por favor corrija los errores en el formulario.')
+    else:
+        form = ActivitySeriesForm()
+    return render(request, 'volunteers/create_series.html', {'form': form})
+
+@login_required
+def subscribe_series(request, series_id):
+    series = get_object_or_404(ActivitySeries, id=series_id)
+    if request.user.role.lower() != 'volunteer':
+        return redirect('dashboard')
+    subscription, created, enrollment = recurrence.subscribe(series, request.user)
+    if enrollment.conflicts:
+        messages.warning(
+            request,
+            f'{len(enrollment.conflicts)} fechas de {series.title} se cruzan con otras inscripciones '
+            'y no se incluyeron.',
+        )
+    if enrollment.waitlisted:
+        messages.warning(
+            request,
+            f'Inscrito en {len(enrollment.assigned)} fechas de {series.title}; '
+            f'{len(enrollment.waitlisted)} están llenas y quedaste en lista de espera.',
+        )
+    elif created and enrollment.conflicts:
+        messages.success(request, f'Inscrito en {len(enrollment.assigned)} fechas de {series.title}.')
+    elif created:
+        messages.success(request, f'Inscrito en todas las fechas de {series.title}.')
+    else:
+        messages.info(request, 'Ya inscrito en la serie.')
+    return redirect('dashboard')
+
+@login_required
+def unsubscribe_series(request, series_id):
+    series = get_object_or_404(ActivitySeries, id=series_id)
+    if request.user.role.lower() != 'volunteer':
+        return redirect('dashboard')
+    recurrence.unsubscribe(series, request.user)
+    messages.success(request, f'Has cancelado tu inscripción en {series.title}.')
+    return redirect('dashboard')
+
+@login_required
+def inscribe_activity(request, activity_id):
+    activity = get_object_or_404(Activity, id=activity_id)
+    if request.user.role.lower() != 'volunteer':
+        return redirect('dashboard')
+    try:
+        with transaction.atomic():
+            # Lock the activity so two last-seat enrollments cannot both succeed.
+            Activity.objects.select_for_update().filter(pk=activity.pk).first()
+            assignment = Assignment.objects.filter(volunteer=request.user, activity=activity).first()
+            created = False
+            enrolled = assignment is not None and assignment.status != 'cancelled'
+            clash = None
+            if not enrolled:
+                clash = schedule.overlapping_assignments(
+                    request.user, activity.date, schedule.activity_end(activity), exclude_activity_id=activity.id,
+                ).first()
+            if enrolled:
+                pass
+            elif clash is not None:
+                messages.error(request, f'Ya estás inscrito en {clash.activity.title}, que se cruza con este horario.')
+                return redirect('dashboard')
+            elif waitlist.is_full(activity):
+                entry, queued = waitlist.join_waitlist(activity, request.user)
+                messages.info(request, f'La actividad está llena. Estás en la lista de espera (turno {entry.position}).')
+                return redirect('dashboard')
+            elif assignment is not None:
+                assignment.status = 'assigned'
+                assignment.save(update_fields=['status', 'updated_at'])
+                created = True
+            else:
+                assignment = Assignment.objects.create(volunteer=request.user, activity=activity)
+                created = True
+        if created:
+            messages.success(request, 'Inscrito exitosamente.')
+            if request.user.email:
+                jobs.enqueue('send_email', {
+                    'subject': 'Confirmación de Inscripción',
+                    'message': f'Has sido inscrito en {activity.title}.',
+                    'recipient_list': [request.user.email],
+                })
+        else:
+            messages.info(request, 'Ya inscrito.')
+    except Exception as e:
+        messages.error(request, 'Error al inscribirse: ' + str(e))
+        logger.error('Error in inscribe_activity activity_id=%s error=%s', activity_id, e)
+    return redirect('dashboard')
+
+@login_required
+def cancel_assignment(request, assignment_id):
+    assignment = get_object_or_404(Assignment, id=assignment_id, volunteer=request.user)
+    if request.method == 'POST' and assignment.status != 'cancelled':
+        # The post_save handler schedules promotion of the next volunteer on the waitlist.
+        assignment.status = 'cancelled'
+        assignment.save(update_fields=['status', 'updated_at'])
+        messages.success(request, f'Cancelaste tu inscripción en {assignment.activity.title}.')
+    return redirect('dashboard')
+
+@login_required
+def leave_waitlist(request, activity_id):
+    if request.method == 'POST':
+        WaitlistEntry.objects.filter(activity_id=activity_id, volunteer=request.user).delete()
+        messages.success(request, 'Saliste de la lista de espera.')
+    return redirect('dashboard')
+
+@login_required
+def record_attendance(request, assignment_id):
+    assignment = get_object_or_404(Assignment, id=assignment_id)
+    if request.user.role.lower() != 'admin' or assignment.activity.created_by != request.user:
+        return redirect('dashboard')
+    if request.method == 'POST':
+        attendance = Attendance.objects.filter(assignment=assignment).first()
+        # A door scan marks attendance with no hours; the coordinator still records them.
+        scanned = (
+            attendance is not None and attendance.client_uuid == checkin_uuid(assignment.pk) and not attendance.hours
+        )
+        if attendance is not None and not scanned:
+            messages.info(request, 'Asistencia ya registrada.')
+            return redirect('dashboard')
+        attended = request.POST.get('attended') == 'on'
+        hours_input = request.POST.get('hours', '0')
+        try:
+            hours = Decimal(hours_input)
+            if hours < 0:
+                raise InvalidOperation("Horas no pueden ser negativas.")
+        except (InvalidOperation, ValueError) as e:
+            messages.error(request, 'Entrada inválida para horas: ' + str(e))
+            return render(request, 'volunteers/record_attendance.html', {'assignment': assignment})
+        try:
+            if attendance is None:
+                Attendance.objects.create(assignment=assignment, attended=attended, hours=hours)
+            else:
+                attendance.attended, attendance.hours = attended, hours
+                attendance.save(update_fields=['attended', 'hours', 'updated_at'])
+            messages.success(request, 'Asistencia registrada.')
+            return redirect('dashboard')
+        except Exception as e:
+            messages.error(request, 'Error al registrar asistencia: ' + str(e))
+            logger.error('Error in record_attendance assignment_id=%s error=%s', assignment_id, e)
+    return render(request, 'volunteers/record_attendance.html', {'assignment': assignment})
@@ -0,0 +1,62 @@
+import io
+import logging
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, HttpResponse, HttpResponseForbidden
+from django.shortcuts import redirect, render
+
+from ..certificates import (
+    MIN_CERTIFICATE_HOURS, eligible_volunteers, queue_stale_certificates, store_certificate, stored_certificate,
+)
+from ..ledger import volunteer_total_hours
+from ..models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+@login_required
+def admin_certificate_eligibility(request):
+    user_role = getattr(request.user, 'role', '').strip().lower()
+    if user_role != 'admin':
+        logger.warning('Access denied view=admin_certificate_eligibility user=%s role=%s', request.user.username, user_role)
+        return HttpResponseForbidden("No tienes permiso para ver esta página.")
+
+    volunteers_hours = eligible_volunteers()
+    if request.method == 'POST':
+        # Pre-render in the background so "Generar Certificado" serves stored PDFs.
+        queued = queue_stale_certificates(volunteers_hours)
+        messages.success(request, f'{queued} certificados en cola para generarse.')
+        return redirect('admin_certificate_eligibility')
+
+    context = {
+        'volunteers_hours': volunteers_hours,
+        'min_hours_required': MIN_CERTIFICATE_HOURS,
+    }
+    return render(request, 'volunteers/admin_certificate_eligibility.html', context)
+
+@login_required
+def generate_certificate(request, volunteer_id):
+    logger.debug('generate_certificate accessed user=%s role=%s volunteer_id=%s', request.user.username, getattr(request.user, 'role', None), volunteer_id)
+    if not request.user.role.lower() == 'admin':
+        logger.warning('Access denied view=generate_certificate user=%s role=%s', request.user.username, request.user.role)
+        return HttpResponseForbidden("No tienes permiso para generar certificados.")
+    try:
+        volunteer = CustomUser.objects.get(id=volunteer_id, role__iexact='volunteer')
+    except CustomUser.DoesNotExist:
+        logger.error('Volunteer not found view=generate_certificate volunteer_id=%s', volunteer_id)
+        return HttpResponse("Voluntario no encontrado.", status=404)
+
+    try:
+        total_hours = volunteer_total_hours(volunteer)
+    except Exception as e:
+        logger.error('Error calculating total hours volunteer_id=%s error=%s', volunteer_id, e)
+        return HttpResponse(f"Error al calcular horas: {str(e)}", status=500)
+
+    # Served from the copy pre-rendered by the worker when the hours still match;
+    # rendered inline (and stored) otherwise.
+    pdf = stored_certificate(volunteer, total_hours)
+    if pdf is None:
+        pdf = store_certificate(volunteer, total_hours)
+
+    buffer = io.BytesIO(pdf)
+    return FileResponse(buffer, as_attachment=False, filename=f"certificate_{volunteer.username}.pdf")
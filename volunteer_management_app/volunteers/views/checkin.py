@@ -0,0 +1,56 @@
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .. import checkin
+from ..models import Activity, Assignment
+
+
+def _qr_svg(data):
+    # qrcode is optional; without it the page shows the code for manual entry.
+    try:
+        import qrcode
+        import qrcode.image.svg
+    except ImportError:
+        return None
+    return qrcode.make(data, image_factory=qrcode.image.svg.SvgPathImage).to_string(encoding='unicode')
+
+@login_required
+def checkin_code(request, assignment_id):
+    assignment = get_object_or_404(Assignment.objects.select_related('activity'), id=assignment_id)
+    is_coordinator = request.user.role.lower() == 'admin' and assignment.activity.created_by_id == request.user.pk
+    if assignment.volunteer_id != request.user.pk and not is_coordinator:
+        return HttpResponseForbidden('No tienes permiso para ver esta página.')
+    token = checkin.checkin_token(assignment)
+    return render(request, 'volunteers/checkin_code.html', {
+        'assignment': assignment,
+        'token': token,
+        'qr_svg': _qr_svg(token),
+    })
+
+@login_required
+def checkin_kiosk(request, activity_id):
+    activity = get_object_or_404(Activity, id=activity_id)
+    if request.user.role.lower() != 'admin' or activity.created_by_id != request.user.pk:
+        return HttpResponseForbidden('No tienes permiso para ver esta página.')
+    return render(request, 'volunteers/checkin_kiosk.html', {
+        'activity': activity,
+        'kiosk_token': checkin.kiosk_token(activity.id, request.user.pk),
+    })
+
+# Authenticated by the signed kiosk token rather than the session, so a scan
+# touches neither the session nor any other table.
+@csrf_exempt
+@require_POST
+def checkin_scan(request, activity_id):
+    try:
+        checkin.read_kiosk_token(request.headers.get('X-Kiosk-Token'), activity_id)
+    except checkin.CheckinError as e:
+        return JsonResponse({'error': str(e)}, status=403)
+    try:
+        assignment_id, status = checkin.scan(request.POST.get('code', ''), activity_id)
+    except checkin.CheckinError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({'assignment_id': assignment_id, 'status': status}, status=202)
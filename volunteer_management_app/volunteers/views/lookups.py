@@ -0,0 +1,63 @@
+from django.contrib.auth.decorators import login_required
+from django.db.models import Value
+from django.db.models.functions import Concat, Lower
+from django.http import JsonResponse
+from django.utils import timezone
+
+from ..models import Activity, CustomUser
+
+LOOKUP_PAGE_SIZE = 20
+# Sorts after any character that can follow the prefix.
+_PREFIX_END = '\U0010ffff'
+
+def prefix_filter(queryset, field, term):
+    """Rows whose lowercased `field` starts with the lowercased `term`.
+
+    Written as a range on Lower(field), which the functional indexes on
+    Activity.title and CustomUser.username can search. A LIKE prefix cannot
+    use them: SQLite only optimises LIKE on NOCASE columns and PostgreSQL
+    needs a pattern_ops index. Both sides go through the database's LOWER so
+    they are folded the same way.
+    """
+    key = Lower(Value(term))
+    return queryset.alias(**{f'{field}_key': Lower(field)}).filter(**{
+        f'{field}_key__gte': key,
+        f'{field}_key__lt': Concat(key, Value(_PREFIX_END)),
+    })
+
+def _lookup_page(request, queryset, label):
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+    offset = (page - 1) * LOOKUP_PAGE_SIZE
+    # One extra row tells whether there is a next page without a COUNT(*).
+    rows = list(queryset[offset:offset + LOOKUP_PAGE_SIZE + 1])
+    return JsonResponse({
+        'results': [{'id': obj.pk, 'text': label(obj)} for obj in rows[:LOOKUP_PAGE_SIZE]],
+        'more': len(rows) > LOOKUP_PAGE_SIZE,
+    })
+
+@login_required
+def activity_lookup(request):
+    if not request.user.role.lower() == 'admin':
+        return JsonResponse({'error': 'No tienes permiso para ver esta página.'}, status=403)
+    activities = Activity.objects.only('id', 'title', 'date')
+    if request.GET.get('all') != '1':
+        activities = activities.filter(date__gte=timezone.now())
+    term = request.GET.get('q', '').strip()
+    if term:
+        activities = prefix_filter(activities, 'title', term)
+    activities = activities.order_by('date', 'id')
+    return _lookup_page(request, activities, lambda a: f"{a.title} ({timezone.localtime(a.date).strftime('%Y-%m-%d %H:%M')})")
+
+@login_required
+def volunteer_lookup(request):
+    if not request.user.role.lower() == 'admin':
+        return JsonResponse({'error': 'No tienes permiso para ver esta página.'}, status=403)
+    volunteers = CustomUser.objects.filter(role__iexact='volunteer').only('id', 'username', 'first_name', 'last_name')
+    term = request.GET.get('q', '').strip()
+    if term:
+        volunteers = prefix_filter(volunteers, 'username', term)
+    volunteers = volunteers.order_by('username')
+    return _lookup_page(request, volunteers, lambda v: v.get_full_name() or v.username)
@@ -0,0 +1,86 @@
+import datetime
+
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseForbidden, JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .. import schedule
+from ..analytics import hours_report
+from ..models import ActivityStats, ArchivedActivityStats
+from ..paginators import EstimatedCountPaginator
+
+ACTIVITY_REPORT_SORTS = {
+    'date': 'activity__date',
+    'fill_rate': 'fill_rate',
+    'confirmation_rate': 'confirmation_rate',
+    'attendance_rate': 'attendance_rate',
+}
+
+@login_required
+def activity_report(request):
+    if not request.user.role.lower() == 'admin':
+        return HttpResponseForbidden("No tienes permiso para ver esta página.")
+
+    sort = request.GET.get('sort', '-date')
+    field = ACTIVITY_REPORT_SORTS.get(sort.lstrip('-'))
+    if field is None:
+        sort, field = '-date', ACTIVITY_REPORT_SORTS['date']
+    descending = sort.startswith('-')
+    order = ('-' if descending else '') + field
+    # Archived activities keep a frozen copy of their stats in their own, equally indexed table.
+    archived = request.GET.get('archived') == '1'
+    model = ArchivedActivityStats if archived else ActivityStats
+    stats = model.objects.select_related('activity').order_by(order, ('-' if descending else '') + 'activity_id')
+    page = EstimatedCountPaginator(stats, 25).get_page(request.GET.get('page'))
+
+    context = {
+        'page_obj': page,
+        'sort': sort,
+        'archived': archived,
+    }
+    return render(request, 'volunteers/activity_report.html', context)
+
+def _parse_report_date(value):
+    parsed = parse_date(value) if value else None
+    if parsed is None:
+        return None
+    return timezone.make_aware(datetime.datetime.combine(parsed, datetime.time.min))
+
+@login_required
+def hours_analytics(request):
+    if not request.user.role.lower() == 'admin':
+        return JsonResponse({'error': 'No tienes permiso para ver esta página.'}, status=403)
+
+    period = request.GET.get('period', 'month')
+    group_by = request.GET.get('group') or None
+    time_field = request.GET.get('field', 'activity')
+    if period not in ('week', 'month') or group_by not in (None, 'location', 'volunteer') or time_field not in ('activity', 'recorded'):
+        return JsonResponse({'error': 'Parámetros inválidos.'}, status=400)
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 20)), 100))
+        # parse_date raises ValueError for well-formed but impossible dates (2025-02-30).
+        start = _parse_report_date(request.GET.get('start'))
+        end = _parse_report_date(request.GET.get('end'))
+    except ValueError:
+        return JsonResponse({'error': 'Parámetros inválidos.'}, status=400)
+
+    report = hours_report(
+        period=period,
+        group_by=group_by,
+        time_field=time_field,
+        start=start,
+        end=end,
+        limit=limit,
+    )
+    return JsonResponse(report)
+
+@login_required
+def schedule_conflicts(request):
+    if not request.user.role.lower() == 'admin':
+        return HttpResponseForbidden("No tienes permiso para ver esta página.")
+
+    since = None if request.GET.get('all') else timezone.now()
+    conflicts = schedule.find_conflicts(since=since)
+    return render(request, 'volunteers/schedule_conflicts.html', {'conflicts': conflicts, 'show_all': since is None})
@@ -0,0 +1,139 @@
+import logging
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db.models import Count
+from django.http import Http404, HttpResponseBadRequest, HttpResponseForbidden
+from django.shortcuts import redirect, render
+
+from .. import audit, jobs, segments
+from ..forms import NotificationForm, VolunteerPickerForm
+from ..ledger import annotate_hours, attendance_history
+from ..models import CustomUser, Job
+
+logger = logging.getLogger(__name__)
+
+def _save_notification(form):
+    """Save a valid NotificationForm, attach its recipients and queue the emails; returns the notice."""
+    notification = form.save()
+    segment = form.cleaned_data['segment']
+    if segment:
+        volunteer_ids = segments.volunteer_ids(segment)
+        segments.add_recipients(notification, volunteer_ids)
+        logger.info('Notification %s segment=%r recipients=%d', notification.pk, segment, len(volunteer_ids))
+        notice = f'Notificación registrada para {len(volunteer_ids)} voluntarios; los correos se enviarán en breve.'
+    else:
+        # Get volunteers assigned to the activity
+        volunteers = CustomUser.objects.filter(role='volunteer', assignments__activity=notification.activity).distinct()
+        notification.recipients.set(volunteers)
+        notice = 'Notificación registrada; los correos se enviarán en breve.'
+    # Emails are sent by `manage.py runworker`
+    jobs.enqueue('send_notification_emails', {'notification_id': notification.pk})
+    return notice
+
+@login_required
+def send_notification(request):
+    logger.debug('send_notification accessed user=%s role=%s method=%s', request.user.username, getattr(request.user, 'role', None), request.method)
+    if request.user.role.lower() != 'admin':
+        logger.warning('Access denied view=send_notification user=%s role=%s', request.user.username, request.user.role)
+        return HttpResponseForbidden("No tienes permiso para acceder a esta página.")
+    if request.method == 'POST':
+        form = NotificationForm(request.POST)
+        if form.is_valid():
+            messages.success(request, _save_notification(form))
+            return redirect('send_notification')
+        else:
+            logger.error('Form invalid view=send_notification user=%s fields=%s', request.user.username, list(form.errors))
+    else:
+        form = NotificationForm()
+    return render(request, 'volunteers/send_notification.html', {'form': form})
+
+@login_required
+@user_passes_test(lambda u: u.username.lower() == 'andres')
+def volunteer_activity_history(request):
+    # Attendance records of live and archived activities, with volunteer and activity details
+    attendance_records = attendance_history()
+
+    context = {
+        'attendance_records': attendance_records,
+    }
+    return render(request, 'volunteers/volunteer_activity_history.html', context)
+
+@login_required
+def admin_volunteer_list(request):
+    if not request.user.role.lower() == 'admin':
+        return HttpResponseForbidden("No tienes permiso para ver esta página.")
+    volunteers = CustomUser.objects.filter(role__iexact='volunteer')
+    return render(request, 'volunteers/admin_volunteer_list.html', {'volunteers': volunteers})
+
+@login_required
+def admin_volunteer_dashboard(request):
+    if not request.user.role.lower() == 'admin':
+        return HttpResponseForbidden("No tienes permiso para ver esta página.")
+
+    # Aggregate total hours per volunteer
+    volunteers_hours = annotate_hours(
+        CustomUser.objects.filter(role__iexact='volunteer')
+    ).order_by('-total_hours')
+
+    selected_volunteer_id = request.GET.get('volunteer_id')
+    selected_volunteer = None
+    if selected_volunteer_id:
+        try:
+            selected_volunteer = CustomUser.objects.get(id=selected_volunteer_id, role__iexact='volunteer')
+        except CustomUser.DoesNotExist:
+            selected_volunteer = None
+
+    if request.method == 'POST':
+        form = NotificationForm(request.POST)
+        if form.is_valid():
+            # Same form as send_notification, segment included.
+            messages.success(request, _save_notification(form))
+            return redirect('admin_volunteer_dashboard')
+    else:
+        form = NotificationForm()
+
+    context = {
+        'volunteers_hours': volunteers_hours,
+        'form': form,
+        'picker_form': VolunteerPickerForm(initial={'volunteer_id': selected_volunteer_id}),
+        'selected_volunteer': selected_volunteer,
+    }
+    return render(request, 'volunteers/admin_volunteer_dashboard.html', context)
+
+@login_required
+def admin_volunteer_profile(request, volunteer_id):
+    if not request.user.role.lower() == 'admin':
+        return HttpResponseForbidden("No tienes permiso para ver esta página.")
+    try:
+        volunteer = CustomUser.objects.get(id=volunteer_id, role__iexact='volunteer')
+    except CustomUser.DoesNotExist:
+        raise Http404("Voluntario no encontrado.")
+    context = {
+        'volunteer': volunteer,
+        'audit_events': audit.volunteer_events(volunteer.id)[:20],
+    }
+    return render(request, 'volunteers/admin_volunteer_profile.html', context)
+
+@login_required
+def job_status(request):
+    if not request.user.role.lower() == 'admin':
+        return HttpResponseForbidden("No tienes permiso para ver esta página.")
+    if request.method == 'POST' and request.POST.get('retry'):
+        try:
+            job_id = int(request.POST['retry'])
+        except ValueError:
+            return HttpResponseBadRequest('Trabajo inválido.')
+        if jobs.retry_job(job_id):
+            messages.success(request, 'Trabajo reprogramado.')
+        else:
+            messages.error(request, 'El trabajo no existe o no está detenido.')
+        return redirect('job_status')
+
+    counts = dict(Job.objects.values_list('status').annotate(total=Count('id')).order_by())
+    failing = Job.objects.filter(status__in=['pending', 'dead'], attempts__gt=0).order_by('-updated_at')[:50]
+    context = {
+        'counts': [(label, counts.get(status, 0)) for status, label in Job.STATUS_CHOICES],
+        'failing': failing,
+    }
+    return render(request, 'volunteers/job_status.html', context)
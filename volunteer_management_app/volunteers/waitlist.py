@@ -0,0 +1,220 @@
+import datetime
+import logging
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.mail import get_connection, send_mass_mail
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from . import audit, jobs, schedule
+from .models import Activity, Assignment, AuditEvent, Job, WaitlistEntry, default_activity_duration
+
+logger = logging.getLogger(__name__)
+
+
+def seats_taken(activity):
+    return Assignment.objects.filter(activity=activity).exclude(status='cancelled').count()
+
+
+def is_full(activity):
+    # A queue means freed seats belong to it, even while promotion is pending.
+    if WaitlistEntry.objects.filter(activity=activity).exists():
+        return True
+    return seats_taken(activity) >= activity.required_volunteers
+
+
+Enrollment = namedtuple('Enrollment', ['assigned', 'waitlisted', 'conflicts'])
+
+
+@transaction.atomic(savepoint=False)
+def enroll_many(activity_ids, volunteer_ids):
+    """Enroll volunteers in activities while seats last and queue the rest.
+
+    The bulk counterpart of inscribe_activity, used for series: an activity
+    that is full, or already has a queue, gets the remaining volunteers at the
+    end of its waitlist. Volunteers are served in the order given. Active
+    assignments and existing queue entries are left alone; cancelled
+    assignments are reactivated. Activities that overlap another of the
+    volunteer's assignments are skipped and reported in `conflicts`. Runs a
+    fixed number of queries plus insert batches and returns an Enrollment of
+    (activity_id, volunteer_id) lists.
+    Callers refresh ActivityStats, which bulk writes bypass; the enrollments
+    are audited here for the same reason.
+    """
+    duration = default_activity_duration()
+    activities = [
+        (activity_id, required, start, end or start + duration)
+        for activity_id, required, start, end in Activity.objects.select_for_update().filter(pk__in=activity_ids)
+        .order_by('date', 'id').values_list('id', 'required_volunteers', 'date', 'end_date')
+    ]
+    if not activities:
+        return Enrollment([], [], [])
+    ids = [activity[0] for activity in activities]
+    taken = dict(
+        Assignment.objects.filter(activity_id__in=ids).exclude(status='cancelled')
+        .order_by().values('activity_id').annotate(n=Count('id')).values_list('activity_id', 'n')
+    )
+    last_position = dict(
+        WaitlistEntry.objects.filter(activity_id__in=ids)
+        .order_by().values('activity_id').annotate(last=Max('position')).values_list('activity_id', 'last')
+    )
+    existing = {
+        (activity_id, volunteer_id): (pk, status)
+        for pk, activity_id, volunteer_id, status in Assignment.objects.filter(
+            activity_id__in=ids, volunteer_id__in=volunteer_ids,
+        ).values_list('pk', 'activity_id', 'volunteer_id', 'status')
+    }
+    queued = set()
+    if last_position:
+        queued = set(
+            WaitlistEntry.objects.filter(activity_id__in=last_position, volunteer_id__in=volunteer_ids)
+            .values_list('activity_id', 'volunteer_id')
+        )
+
+    timetable = schedule.load_timetable(
+        volunteer_ids, activities[0][2], max(end for _, _, _, end in activities),
+    )
+
+    result = Enrollment([], [], [])
+    new_assignments, reactivated, entries = [], [], []
+    for activity_id, required, start, end in activities:
+        free = required - taken.get(activity_id, 0)
+        for volunteer_id in volunteer_ids:
+            key = (activity_id, volunteer_id)
+            pk, status = existing.get(key, (None, None))
+            if (status is not None and status != 'cancelled') or key in queued:
+                continue
+            if timetable.clash(volunteer_id, start, end, exclude_activity_id=activity_id) is not None:
+                result.conflicts.append(key)
+                continue
+            if free > 0 and activity_id not in last_position:
+                free -= 1
+                timetable.add(volunteer_id, activity_id, start, end)
+                if pk is None:
+                    new_assignments.append(Assignment(activity_id=activity_id, volunteer_id=volunteer_id))
+                else:
+                    reactivated.append(Assignment(pk=pk, activity_id=activity_id, volunteer_id=volunteer_id))
+                result.assigned.append(key)
+            else:
+                last_position[activity_id] = last_position.get(activity_id, 0) + 1
+                entries.append(WaitlistEntry(
+                    activity_id=activity_id, volunteer_id=volunteer_id, position=last_position[activity_id],
+                ))
+                result.waitlisted.append(key)
+
+    Assignment.objects.bulk_create(new_assignments, batch_size=1000)
+    if reactivated:
+        Assignment.objects.filter(pk__in=[assignment.pk for assignment in reactivated]).update(
+            status='assigned', updated_at=timezone.now(),
+        )
+    WaitlistEntry.objects.bulk_create(entries, batch_size=1000)
+    for assignment in new_assignments + reactivated:
+        audit.record(
+            AuditEvent.ENROLLED,
+            volunteer_id=assignment.volunteer_id, activity_id=assignment.activity_id, object_id=assignment.pk,
+        )
+    return result
+
+
+@transaction.atomic
+def join_waitlist(activity, volunteer):
+    """Append the volunteer to the activity's FIFO queue; returns (entry, created)."""
+    # Lock the activity row so concurrent joins cannot take the same position.
+    Activity.objects.select_for_update().filter(pk=activity.pk).first()
+    entry = WaitlistEntry.objects.filter(activity=activity, volunteer=volunteer).first()
+    if entry is not None:
+        return entry, False
+    last = WaitlistEntry.objects.filter(activity=activity).aggregate(last=Max('position'))['last'] or 0
+    entry = WaitlistEntry.objects.create(activity=activity, volunteer=volunteer, position=last + 1)
+    # A queue with free seats means a promotion pass went missing; run another.
+    if seats_taken(activity) < activity.required_volunteers:
+        schedule_promotion(activity.pk)
+    return entry, True
+
+
+def _promote_activity(activity_id):
+    """Fill free seats of one activity from the head of its queue.
+
+    Entries whose volunteer is booked elsewhere at that time leave the queue
+    with `clash` set to the overlapping assignment. Returns (promoted, skipped).
+    """
+    with transaction.atomic():
+        activity = Activity.objects.select_for_update().filter(pk=activity_id).first()
+        if activity is None:
+            return [], []
+        free = activity.required_volunteers - seats_taken(activity)
+        if free <= 0:
+            return [], []
+        start, end = activity.date, schedule.activity_end(activity)
+        promoted, skipped = [], []
+        queue = WaitlistEntry.objects.filter(activity=activity).select_related('volunteer').order_by('position')
+        for entry in queue:
+            if len(promoted) == free:
+                break
+            entry.activity = activity
+            entry.clash = schedule.overlapping_assignments(
+                entry.volunteer, start, end, exclude_activity_id=activity.id,
+            ).first()
+            if entry.clash is not None:
+                skipped.append(entry)
+                continue
+            # Re-activates a previously cancelled assignment instead of colliding with it.
+            Assignment.objects.update_or_create(
+                volunteer=entry.volunteer, activity=activity,
+                defaults={'status': 'assigned'},
+            )
+            promoted.append(entry)
+        WaitlistEntry.objects.filter(pk__in=[entry.pk for entry in promoted + skipped]).delete()
+        return promoted, skipped
+
+
+def promote_waitlist(activity_ids):
+    """One promotion pass over the given activities, then one batch of emails."""
+    promoted, skipped = [], []
+    for activity_id in sorted(set(activity_ids)):
+        activity_promoted, activity_skipped = _promote_activity(activity_id)
+        promoted += activity_promoted
+        skipped += activity_skipped
+
+    datatuple = [
+        (
+            'Cupo disponible',
+            f'Se liberó un cupo y has sido inscrito en {entry.activity.title}.',
+            'noreply@example.com',
+            [entry.volunteer.email],
+        )
+        for entry in promoted if entry.volunteer.email
+    ] + [
+        (
+            'Cupo disponible',
+            f'Se liberó un cupo en {entry.activity.title}, pero se cruza con {entry.clash.activity.title}, '
+            'donde ya estás inscrito. Saliste de la lista de espera.',
+            'noreply@example.com',
+            [entry.volunteer.email],
+        )
+        for entry in skipped if entry.volunteer.email
+    ]
+    if datatuple:
+        try:
+            send_mass_mail(datatuple, fail_silently=False, connection=get_connection())
+        except Exception as e:
+            logger.error('Error sending waitlist promotion emails: %s', e)
+    return promoted
+
+
+def schedule_promotion(activity_id):
+    """Queue a promotion pass for the activity once the current transaction commits.
+
+    With WAITLIST_ASYNC the pass is a durable `promote_waitlist` job, delayed by
+    WAITLIST_COALESCE_SECONDS; a job still pending for the activity covers a
+    burst of cancellations. Without it the pass runs on commit, in process.
+    """
+    if getattr(settings, 'WAITLIST_ASYNC', True):
+        payload = {'activity_id': activity_id}
+        if not Job.objects.filter(task='promote_waitlist', status='pending', payload=payload).exists():
+            delay = datetime.timedelta(seconds=getattr(settings, 'WAITLIST_COALESCE_SECONDS', 0.5))
+            jobs.enqueue('promote_waitlist', payload, run_at=timezone.now() + delay)
+    else:
+        transaction.on_commit(lambda: promote_waitlist([activity_id]))
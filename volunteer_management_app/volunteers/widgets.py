@@ -0,0 +1,47 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """Select that renders only the chosen option and loads the rest on demand.
+
+    Options come from a JSON lookup endpoint (see ``views.activity_lookup``) that
+    answers ``?q=<prefix>&page=<n>`` with ``{"results": [{"id", "text"}], "more"}``,
+    so the page stays the same size however large the table grows.
+    """
+
+    class Media:
+        js = ('volunteers/autocomplete.js',)
+
+    def __init__(self, url_name, attrs=None, placeholder='Escriba para buscar…'):
+        super().__init__(attrs)
+        self.url_name = url_name
+        self.placeholder = placeholder
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs.update({
+            'data-autocomplete-url': reverse(self.url_name),
+            'data-placeholder': self.placeholder,
+        })
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        selected = {str(v) for v in value if v not in ('', None)}
+        options = []
+        if not self.is_required or not selected:
+            options.append(self.create_option(name, '', '---------', not selected, 0))
+        queryset = getattr(self.choices, 'queryset', None)
+        if selected and queryset is not None:
+            try:
+                # One primary-key lookup for the current value instead of the whole table.
+                chosen = list(queryset.filter(pk__in=selected))
+            except (ValueError, ValidationError):
+                chosen = []
+            for index, obj in enumerate(chosen, start=1):
+                option_value = self.choices.field.prepare_value(obj)
+                options.append(self.create_option(
+                    name, option_value, self.choices.field.label_from_instance(obj), True, index,
+                ))
+        return [(None, options, 0)]